@@ -0,0 +1,302 @@
+# === Lane 병렬 batch 실행 (SIMT mode, NumPy) ===
+# 같은 스크립트를 입력(전역 변수 초기값)만 바꿔 N번 실행하는 대신, 링크된 CodeObject 하나를 N개의 lane에서 한꺼번에 실행합니다.
+#   - 변수와 피연산자 스택의 각 칸은 lane별 값을 담은 NumPy int64 벡터입니다 (상수는 Python int 그대로 broadcast).
+#   - BINARY_ADD/SUB/MUL은 벡터 연산 한 번, superinstruction은 구성 명령어를 차례로 실행합니다.
+#   - lane마다 PC가 있고, 매 단계 살아 있는 lane 중 가장 작은 PC의 명령어를 그 PC에 있는 lane(active mask)만 실행합니다.
+#     JUMP_IF_FALSE에서 lane의 조건이 갈리면 (divergence) 각 lane이 자기 경로를 따라가고, 앞선 lane은 뒤처진 lane이
+#     같은 PC에 올 때까지 기다립니다. 모든 lane의 PC가 다시 같아지면 (reconvergence) mask 없이 실행합니다.
+#     while 루프는 루프를 빠져나간 lane이 루프 뒤에서 나머지 lane을 기다리는 형태가 됩니다.
+#   - 검증된 코드는 한 PC의 스택 깊이가 경로와 상관없이 같으므로 (verifier.py) 스택 칸 d는 모든 lane에서 같은 칸입니다.
+#     active mask 밖 lane의 값은 np.where로 보존합니다 (벡터는 바꾸지 않고 새로 만듦).
+#   - PRINT는 (mask, 값) 이벤트로 기록했다가 lane별 출력으로 풀어 줍니다 (BatchResult.output(lane)).
+#   - 대입 전 변수 읽기는 그 lane만 스칼라 VM과 같은 "VM Error ..." 출력으로 끝나고 나머지 lane은 계속 실행됩니다.
+#   - int64를 넘칠 수 있는 연산을 만난 lane은 멈추고, 끝난 뒤 스칼라 VM으로 다시 실행합니다 (Python int는 크기 제한이 없음).
+# 함수(DEF_FUNC/CALL_FUNCTION/TAIL_CALL/RETURN)가 있거나, 검증에 실패했거나, 입력/상수가 int64 정수가 아니면
+# 전체를 lane마다 스칼라 VirtualMachine.run으로 실행합니다 (run_scalar, BatchResult.fallback에 이유).
+# 각 lane의 출력은 같은 입력으로 VirtualMachine().run(code, inputs=...)을 실행한 출력과 같습니다.
+
+import contextlib
+import io
+
+import numpy as np
+
+from linker import CodeObject, FUSED_OPERANDS, link
+from opcodes import (OPNAMES, SUPERINSTRUCTIONS, LOAD_CONST, LOAD_NAME, STORE_NAME, LOAD_GLOBAL, STORE_GLOBAL,
+                     DUP_TOP, BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT, JUMP_IF_FALSE, JUMP, HALT)
+from verifier import StackVerifier, verify
+from vm import VirtualMachine
+
+BATCH_OPS = {LOAD_CONST, LOAD_NAME, STORE_NAME, LOAD_GLOBAL, STORE_GLOBAL, DUP_TOP,
+             BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT, JUMP_IF_FALSE, JUMP, HALT}
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+MUL_LIMIT = 2.0 ** 62  # float64로 계산한 곱의 절댓값이 이보다 크면 넘칠 수 있다고 봄 (반올림 오차 여유)
+
+class BatchResult:
+    def __init__(self, lanes, events=(), scalar_outputs=None, fallback=None):
+        self.lanes = lanes
+        self.events = events                       # ("print", mask, 값) / ("error", mask, 메시지), 실행 순서
+        self.scalar_outputs = scalar_outputs or {}  # 스칼라 VM으로 실행한 lane -> 출력 줄 리스트
+        self.fallback = fallback                   # 전체를 스칼라로 실행한 이유 (None이면 batch 실행)
+
+    def outputs(self):
+        """lane별 출력 줄 리스트 (스칼라 VM이 print하는 줄과 같음)"""
+        lines = [[] for _ in range(self.lanes)]
+        for kind, mask, value in self.events:
+            lanes = np.flatnonzero(mask).tolist()
+            if kind == "error":
+                for lane in lanes:
+                    lines[lane].append(value)
+            elif isinstance(value, np.ndarray):
+                for lane, v in zip(lanes, value[lanes].tolist()):
+                    lines[lane].append(f"OUTPUT: {v}")
+            else:
+                text = f"OUTPUT: {value}"
+                for lane in lanes:
+                    lines[lane].append(text)
+        for lane, output in self.scalar_outputs.items():
+            lines[lane] = output
+        return lines
+
+    def output(self, lane):
+        return self.outputs()[lane]
+
+class BatchVM:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.steps = 0            # 실행한 명령어 수 (lane 수와 상관없이 PC 하나 = 1)
+        self.divergent_steps = 0  # 일부 lane만 active였던 단계 수
+        self.diverged = 0         # JUMP_IF_FALSE에서 lane이 갈린 횟수
+        self.scalar_lanes = 0     # 스칼라 VM으로 (다시) 실행한 lane 수
+        self.fallback = None
+
+    def run(self, code_input, inputs, lanes=None):
+        """
+        inputs: {전역 변수 이름: lane별 값 시퀀스} (모두 같은 길이). 입력이 없으면 lanes로 lane 수를 정함.
+        BatchResult를 돌려줌 (출력은 print하지 않음)
+        """
+        self.reset()
+        code = code_input if isinstance(code_input, CodeObject) else link(code_input)
+        lanes = lane_count(inputs, lanes)
+        columns, reason = {}, None
+        for name, values in inputs.items():
+            try:
+                column = np.asarray(values)
+            except OverflowError:
+                column = None
+            if column is None or column.dtype.kind not in "iu" or column.shape != (lanes,) or \
+                    (column.dtype.kind == "u" and column.size and column.max() > INT64_MAX):
+                reason = f"input {name} is not a vector of int64 values"
+                break
+            columns[name] = column.astype(np.int64)
+        reason = reason or unsupported(code)
+        if reason:
+            self.fallback = reason
+            self.scalar_lanes = lanes
+            return BatchResult(lanes, scalar_outputs=dict(enumerate(run_scalar(code, inputs, lanes))),
+                               fallback=reason)
+        events, rerun = self.execute(code, lanes, columns)
+        scalar_outputs = {}
+        if rerun.any():
+            lane_ids = np.flatnonzero(rerun).tolist()
+            self.scalar_lanes = len(lane_ids)
+            for lane, output in zip(lane_ids, run_scalar(code, inputs, lanes, lane_ids)):
+                scalar_outputs[lane] = output
+        return BatchResult(lanes, events, scalar_outputs)
+
+    def execute(self, code, lanes, columns):
+        """main 코드를 lane 전체에서 실행. (이벤트 리스트, 스칼라로 다시 실행할 lane mask)"""
+        program = decode(code)
+        verifier = StackVerifier(code)
+        verifier.walk(0, 0)
+        depth_at = verifier.depth  # pc -> 실행 직전 스택 깊이 (모든 lane에서 같음)
+        names = code.names
+        values = [0] * len(names)   # names 인덱스 -> lane별 값 (int64 벡터 또는 Python int)
+        bound = [False] * len(names)  # names 인덱스 -> 대입된 lane (True: 살아 있는 모든 lane, False: 없음, 아니면 bool 벡터)
+        for index, name in enumerate(names):
+            if name in columns:
+                values[index], bound[index] = columns[name], True
+        slots = [0] * (code.max_stack.get(0, 0) + 1)
+        events = []
+        live = np.ones(lanes, dtype=bool)
+        n_live = lanes
+        rerun = np.zeros(lanes, dtype=bool)
+        pc, pcs = 0, None  # pcs: lane별 PC 벡터 (None이면 모든 lane이 pc에 있음)
+        while n_live:
+            if pcs is None:
+                active, full = live, True
+            else:
+                pc = int(pcs[live].min())
+                active = live & (pcs == pc)
+                full = int(np.count_nonzero(active)) == n_live
+                if full:
+                    pcs = None  # reconvergence
+                else:
+                    self.divergent_steps += 1
+            self.steps += 1
+            micro_ops = program[pc]
+            if micro_ops is None:  # HALT: 가장 큰 PC이므로 살아 있는 lane이 모두 도착한 상태
+                break
+            d = depth_at[pc]
+            next_pc, taken = pc + 1, None
+            for op, x in micro_ops:
+                if op == LOAD_CONST:
+                    slots[d] = x if full else np.where(active, x, slots[d])
+                    d += 1
+                elif op == LOAD_GLOBAL or op == LOAD_NAME:
+                    have = bound[x]
+                    if have is not True:
+                        missing = active if have is False else active & ~have
+                        if missing.any():
+                            events.append(("error", missing, f"VM Error in FRAME=0 PC={pc}, "
+                                                             f"INSTR={code.instruction(pc)}: Undefined variable: {names[x]}"))
+                            live = live & ~missing
+                            active = active & ~missing
+                            n_live = int(np.count_nonzero(live))
+                            if not active.any():
+                                break
+                    slots[d] = values[x] if full else np.where(active, values[x], slots[d])
+                    d += 1
+                elif op == STORE_GLOBAL or op == STORE_NAME:
+                    d -= 1
+                    if full:
+                        values[x], bound[x] = slots[d], True
+                    else:
+                        values[x] = np.where(active, slots[d], values[x])
+                        have = bound[x]
+                        bound[x] = True if have is True else active if have is False else have | active
+                elif op == DUP_TOP:
+                    slots[d] = slots[d - 1]
+                    d += 1
+                elif op == PRINT:
+                    d -= 1
+                    events.append(("print", active, slots[d]))
+                elif op == JUMP:
+                    next_pc = x
+                elif op == JUMP_IF_FALSE:
+                    d -= 1
+                    cond = slots[d]
+                    taken = (cond == 0) if isinstance(cond, np.ndarray) else (not cond)
+                    next_pc = x
+                else:
+                    d -= 1
+                    a, b = slots[d - 1], slots[d]
+                    result, over = binary(op, a, b)
+                    if over is not None:
+                        over = active & over if isinstance(over, np.ndarray) else active if over else None
+                    if over is not None and over.any():
+                        # int64를 넘칠 수 있는 lane은 여기서 멈추고 끝난 뒤 스칼라 VM으로 처음부터 다시 실행
+                        rerun |= over
+                        live = live & ~over
+                        active = active & ~over
+                        n_live = int(np.count_nonzero(live))
+                        if not active.any():
+                            break
+                    slots[d - 1] = result if full else np.where(active, result, slots[d - 1])
+            else:
+                # 명령어가 끝까지 실행됨: active lane의 PC를 옮김
+                if isinstance(taken, np.ndarray):
+                    jumped = int(np.count_nonzero(taken & active))
+                    if 0 < jumped < (n_live if full else int(np.count_nonzero(active))):
+                        # divergence: lane마다 다른 PC
+                        self.diverged += 1
+                        branch = np.where(taken, next_pc, pc + 1)
+                        if full:
+                            pcs = branch
+                        else:
+                            pcs[active] = branch[active]
+                        continue
+                    taken = jumped > 0
+                if taken is False:
+                    next_pc = pc + 1
+                if full:
+                    pc = next_pc
+                else:
+                    pcs[active] = next_pc
+        return events, rerun
+
+    def stats(self):
+        return {"steps": self.steps, "divergent_steps": self.divergent_steps, "diverged": self.diverged,
+                "scalar_lanes": self.scalar_lanes, "fallback": self.fallback}
+
+def binary(op, a, b):
+    """(결과, int64를 넘칠 수 있는 lane: bool 벡터 / bool / None)"""
+    if op == BINARY_ADD:
+        result = a + b
+    elif op == BINARY_SUB:
+        result = a - b
+    else:
+        result = a * b
+    if not isinstance(result, np.ndarray):
+        # 두 피연산자가 모두 상수 (Python int)
+        return result, not INT64_MIN <= result <= INT64_MAX
+    if op == BINARY_MUL:
+        return result, np.abs(np.multiply(a, b, dtype=np.float64)) > MUL_LIMIT
+    if op == BINARY_ADD:
+        return result, ((a ^ result) & (b ^ result)) < 0
+    return result, ((a ^ b) & (a ^ result)) < 0
+
+def decode(code):
+    """pc -> ((opcode, 피연산자), ...) 구성 명령어 튜플 (HALT는 None). 상수는 값, 이름은 names 인덱스, 점프는 대상 PC"""
+    program = []
+    for pc in range(len(code.ops)):
+        op, arg = code.ops[pc], code.args[pc]
+        if op == HALT:
+            program.append(None)
+        elif op in FUSED_OPERANDS:
+            fields = iter(code.fused[arg])
+            parts = []
+            for part in (OPNAMES.index(name) for name in SUPERINSTRUCTIONS[OPNAMES[op]]):
+                operand = next(fields) if part in FUSED_OPERANDS[op] else None
+                parts.append((part, code.consts[operand] if part == LOAD_CONST else operand))
+            program.append(tuple(parts))
+        else:
+            program.append(((op, code.consts[arg] if op == LOAD_CONST else arg),))
+    return program
+
+def unsupported(code):
+    """batch로 실행할 수 없는 이유, 실행할 수 있으면 None"""
+    if code.verified is None:
+        verify(code)
+    if not code.verified:
+        return f"verification failed: {code.verify_error}"
+    if code.functions:
+        return "program defines functions"
+    for pc in range(len(code)):
+        op = code.ops[pc]
+        parts = [OPNAMES.index(name) for name in SUPERINSTRUCTIONS.get(OPNAMES[op], (OPNAMES[op],))]
+        for part in parts:
+            if part not in BATCH_OPS:
+                return f"unsupported instruction {OPNAMES[part]} at PC={pc}"
+    for value in code.consts:
+        if type(value) is not int or not INT64_MIN <= value <= INT64_MAX:
+            return f"constant {value!r} is not an int64"
+    return None
+
+def lane_count(inputs, lanes=None):
+    sizes = {len(values) for values in inputs.values()}
+    if not sizes and lanes is None:
+        raise ValueError("lanes is required when there are no inputs")
+    if lanes is not None:
+        sizes.add(lanes)
+    if len(sizes) != 1:
+        raise ValueError(f"inputs and lanes disagree on the number of lanes: {sorted(sizes)}")
+    return sizes.pop()
+
+def run_scalar(code, inputs, lanes=None, lane_ids=None):
+    """lane마다 VirtualMachine().run(code, inputs=그 lane의 값)을 실행한 출력 줄 리스트 (batch와 비교하는 기준)"""
+    lanes = lane_count(inputs, lanes)
+    columns = {name: values.tolist() if isinstance(values, np.ndarray) else list(values)
+               for name, values in inputs.items()}
+    outputs = []
+    for lane in (lane_ids if lane_ids is not None else range(lanes)):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            VirtualMachine().run(code, inputs={name: values[lane] for name, values in columns.items()})
+        outputs.append(buffer.getvalue().splitlines())
+    return outputs
+
+def run(code, inputs, lanes=None):
+    """편의 함수: batch 실행 후 lane별 출력 줄 리스트"""
+    return BatchVM().run(code, inputs, lanes).outputs()
@@ -0,0 +1,917 @@
+# === 벤치마크 ===
+# 사용법: python benchmark.py [섹션 ...]   (섹션을 생략하면 전체 실행)
+# 각 섹션은 생성된 스크립트를 컴파일/실행하여 시간과 처리량을 출력합니다.
+# VM의 OUTPUT 출력은 측정 중 버려집니다.
+
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pvm_with_lark import (compile_source, compile_file, build_parser, build_ast, parse_to_ast,
+                           get_tree_parser, generate_code)
+from linker import link
+from tracing import InstructionCounter, OpcodePairProfiler, Tracer
+from vm import VirtualMachine
+
+# === 벤치마크용 스크립트 생성 ===
+
+def loop_program(n):
+    """while 루프와 산술 연산만 사용하는 스크립트"""
+    return f"""
+i = {n}
+s = 0
+while i {{
+    s = s + i * 2
+    i = i - 1
+}}
+print(s)
+"""
+
+def call_program(n):
+    """루프 안에서 작은 함수를 반복 호출하는 스크립트"""
+    return f"""
+def inc(x): {{
+    return x + 1
+}}
+
+i = {n}
+c = 0
+while i {{
+    c = inc(c)
+    i = i - 1
+}}
+print(c)
+"""
+
+def recursion_program(n):
+    """비교 연산이 없으므로 if의 참/거짓(0)으로 분기하는 재귀 fib"""
+    return f"""
+def fib(n): {{
+    if n {{
+        if n - 1 {{
+            return fib(n - 1) + fib(n - 2)
+        }} else {{
+            return 1
+        }}
+    }} else {{
+        return 0
+    }}
+}}
+
+print(fib({n}))
+"""
+
+def tail_recursion_program(n):
+    """누산기를 인자로 넘기는 꼬리 재귀 (return f(...))와 서로를 꼬리 호출하는 두 함수"""
+    return f"""
+def total(n, acc): {{
+    if n {{
+        return total(n - 1, acc + n)
+    }}
+    return acc
+}}
+def is_even(n): {{
+    if n {{
+        return is_odd(n - 1)
+    }}
+    return 1
+}}
+def is_odd(n): {{
+    if n {{
+        return is_even(n - 1)
+    }}
+    return 0
+}}
+print(total({n}, 0))
+print(is_even({n}))
+"""
+
+def deep_recursion_program(n, tail_only=False):
+    """Python 재귀 한도보다 깊은 재귀: 꼬리 재귀 down, (tail_only가 아니면) 꼬리 호출이 아닌 재귀 depth와 상호 꼬리 재귀"""
+    source = f"""
+def down(n, acc): {{
+    if n {{
+        return down(n - 1, acc + 1)
+    }}
+    return acc
+}}
+print(down({n}, 0))
+"""
+    if tail_only:
+        return source
+    return source + f"""
+def depth(n): {{
+    if n {{
+        return depth(n - 1) + 1
+    }}
+    return 0
+}}
+print(depth({n}))
+""" + tail_recursion_program(n)
+
+def batch_program():
+    """입력 변수 n, k로 돌아가는 스크립트: lane마다 반복 횟수와 if 가지가 다름 (batch 실행 측정용)"""
+    return """
+a = 1
+b = 0
+s = 0
+while n {
+    t = a + b
+    b = a
+    a = t
+    if k {
+        s = s + b * k
+    } else {
+        s = s - 1
+    }
+    n = n - 1
+}
+print(b)
+print(s)
+"""
+
+def large_program(n_funcs):
+    """파싱/컴파일 비용 측정용: 서로 다른 함수 n_funcs개와 그 호출로 이루어진 큰 스크립트"""
+    parts = []
+    for i in range(n_funcs):
+        parts.append(f"""
+def f{i}(x, y): {{
+    t = x * {i % 7 + 1} + y
+    if t - {i} {{
+        t = t - 1
+    }} else {{
+        t = t + (x - y) * 2
+    }}
+    return t
+}}
+""")
+    parts.append("acc = 0\n")
+    for i in range(n_funcs):
+        parts.append(f"acc = f{i}(acc, {i}) - acc * 0\n")
+    parts.append("print(acc)\n")
+    return "".join(parts)
+
+def deadcode_program(n):
+    """함수 안에 죽은 저장과 Return 뒤 코드가 있는 스크립트 (CFG 패스 측정용)"""
+    return f"""
+def clamp(x, limit): {{
+    result = 0
+    spare = x
+    if x - limit {{
+        result = x
+        return result
+        print(x)
+    }} else {{
+        result = limit
+    }}
+    return result
+}}
+i = {n}
+s = 0
+while i {{
+    s = clamp(i, 7) + s
+    i = i - 1
+}}
+print(s)
+"""
+
+def invariant_program(n):
+    """루프 안에서 바뀌지 않는 식과 루프 카운터 * 상수가 많은 스크립트 (루프 최적화 측정용)"""
+    return f"""
+width = 12
+height = 5
+def area(w, h): {{
+    i = {n}
+    total = 0
+    while i {{
+        total = total + w * h + i * 8 - (w + h) * 2
+        i = i - 1
+    }}
+    return total
+}}
+row = {n}
+acc = 0
+while row {{
+    acc = acc + row * 3 + width * height
+    row = row - 1
+}}
+print(acc)
+print(area(width, height))
+"""
+
+def constant_program(n):
+    """상수 식과 상수 조건이 많은 스크립트 (최적화 패스 측정용)"""
+    return f"""
+scale = 3 * 4
+offset = 10 - 10
+debug = 0
+def step(x): {{
+    k = 2 * 5
+    if debug {{
+        print(x)
+    }}
+    return x * 1 + k * (scale - 11) + 0
+}}
+i = {n}
+s = 0
+while i {{
+    s = step(s) + i * (2 * 3 - 5) + offset
+    if 1 {{
+        i = i - 1
+    }} else {{
+        print(999)
+    }}
+}}
+while 0 {{
+    print(s)
+}}
+print(s)
+print(s * 0 + 7)
+"""
+
+def unbound_program():
+    """x * 0의 x가 대입되지 않은 변수를 읽는 스크립트 (단순화 후에도 Undefined variable 오류가 나야 함)"""
+    return """
+def g1(a): {
+    return a + 1
+}
+x = 3
+if x {
+    y = x * 2
+}
+print(x * 0)
+print(y * 0 + g1(x) * 0)
+print(g1(8) * 0 * d)
+print(0)
+"""
+
+WORKLOADS = {
+    "loop": loop_program(20000),
+    "call": call_program(10000),
+    "fib": recursion_program(16),
+    "const": constant_program(5000),
+}
+
+# === 측정 도구 ===
+
+def silent_run(func, *args):
+    """stdout을 버리면서 func를 실행하고 (결과, 경과 시간, 캡처된 출력)을 돌려줌"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+    return result, elapsed, buffer.getvalue()
+
+def count_instructions(code):
+    """InstructionCounter 훅으로 실행된 명령어 수를 셈"""
+    counter = InstructionCounter()
+    silent_run(VirtualMachine(hooks=[counter]).run, code)
+    return counter.instructions
+
+def best_of(repeat, func, *args):
+    """repeat번 실행 중 가장 짧은 시간과 그때의 출력"""
+    best = None
+    output = ""
+    for _ in range(repeat):
+        _, elapsed, output = silent_run(func, *args)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, output
+
+# === 섹션: 디스패치 엔진 비교 ===
+
+def bench_dispatch(repeat=3):
+    print("=== dispatch: switch vs table engine ===")
+    for name, source in WORKLOADS.items():
+        code, _, _ = silent_run(compile_source, source)
+        n_instr = count_instructions(code)
+        results = {}
+        for engine in ("switch", "table"):
+            elapsed, output = best_of(repeat, VirtualMachine(engine=engine).run, code)
+            results[engine] = elapsed
+            user_output = [l for l in output.splitlines() if l.startswith("OUTPUT:")]
+            print(f"  {name:6s} {engine:7s} {n_instr:8d} instrs  {elapsed:8.4f}s  "
+                  f"{n_instr / elapsed:12.0f} instrs/s  {user_output}")
+        print(f"  {name:6s} speedup {results['switch'] / results['table']:.2f}x")
+
+# === 섹션: 트레이싱 비용 ===
+
+def bench_tracing(repeat=3):
+    print("=== tracing: production mode vs hooks attached (table engine) ===")
+    for name, source in WORKLOADS.items():
+        code, _, _ = silent_run(compile_source, source)
+        n_instr = count_instructions(code)
+        configs = [
+            ("production", []),
+            ("noop hook", [Tracer()]),
+            ("counter", [InstructionCounter()]),
+        ]
+        for label, hooks in configs:
+            elapsed, _ = best_of(repeat, VirtualMachine(hooks=hooks).run, code)
+            print(f"  {name:6s} {label:11s} {elapsed:8.4f}s  {n_instr / elapsed:12.0f} instrs/s")
+
+# === 섹션: 바이트코드 캐시 ===
+
+def damage_cache(path, case):
+    """캐시 파일 하나를 case 방식으로 망가뜨림 (check_cache_recovery용)"""
+    import bytecode_cache
+    with open(path, "rb") as f:
+        data = f.read()
+    header = bytecode_cache.HEADER
+    fields = list(header.unpack_from(data, 0))
+    if case == "truncated header":
+        data = data[:header.size // 2]
+    elif case == "garbage payload":
+        data = data[:header.size] + bytes(b ^ 0x5A for b in data[header.size:])
+    elif case == "empty file":
+        data = b""
+    elif case == "format version":
+        fields[1] += 1
+        data = header.pack(*fields) + data[header.size:]
+    elif case == "compiler version":
+        fields[2] += 1
+        data = header.pack(*fields) + data[header.size:]
+    with open(path, "wb") as f:
+        f.write(data)
+
+def check_cache_recovery(tmp):
+    """
+    오래된/손상된 .pvmc가 캐시 미스로 처리되어 다시 컴파일되고, 다시 쓰인 캐시가 그다음에 적중하는지 확인.
+    결과가 맞지 않으면 SystemExit.
+    """
+    import bytecode_cache
+    from pvm_with_lark import GRAMMAR_HASH
+    path = os.path.join(tmp, "recovery.pvm")
+    cases = ("edited source", "truncated header", "garbage payload", "empty file", "format version", "compiler version")
+    for case in cases:
+        source = call_program(10)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        compile_file(path)
+        if case == "edited source":
+            source = call_program(11)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+        else:
+            damage_cache(bytecode_cache.cache_path(path), case)
+        expected = vm_output(link(silent_run(compile_source, source)[0]))
+        code, hit = compile_file(path)
+        if hit or vm_output(code) != expected:
+            raise SystemExit(f"cache recovery failed ({case}): hit={hit}")
+        code, hit = compile_file(path)
+        cached = bytecode_cache.load(bytecode_cache.cache_path(path), bytecode_cache.source_hash(source), GRAMMAR_HASH)
+        if not hit or cached is None or vm_output(code) != expected:
+            raise SystemExit(f"rewritten cache not used after {case}: hit={hit}")
+    print(f"  recovery ok: {', '.join(cases)} -> recompiled, rewritten cache hit")
+
+def bench_cache(repeat=5):
+    print("=== cache: compile from source vs load .pvmc (mmap) ===")
+    sources = dict(WORKLOADS, large=large_program(200))
+    with tempfile.TemporaryDirectory() as tmp:
+        check_cache_recovery(tmp)
+        for name, source in sources.items():
+            path = os.path.join(tmp, f"{name}.pvm")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            compile_file(path)  # 캐시 생성 (파서 생성 비용도 여기서 지불)
+            cold, _ = best_of(repeat, compile_file, path, False)
+            warm, _ = best_of(repeat, compile_file, path, True)
+            print(f"  {name:6s} compile {cold * 1000:8.2f}ms  cached {warm * 1000:8.2f}ms  "
+                  f"speedup {cold / warm:.1f}x")
+
+# === 섹션: 파서 생성 (startup) ===
+
+def bench_startup(repeat=5):
+    print("=== startup: build LALR parser vs load cached parser tables ===")
+    build_parser(use_cache=True)  # 캐시 파일이 없으면 여기서 생성
+    cold, _ = best_of(repeat, build_parser, False)
+    warm, _ = best_of(repeat, build_parser, True)
+    print(f"  construct {cold * 1000:8.2f}ms  cached {warm * 1000:8.2f}ms  speedup {cold / warm:.1f}x")
+
+# === 섹션: 파싱 (Parse Tree + Transformer vs inline transformer) ===
+
+def peak_memory(func, *args):
+    """func 실행 중 tracemalloc이 잰 최대 메모리 사용량 (바이트)"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_parse(repeat=3):
+    print("=== parse: tree + ASTBuilder.transform vs inline ASTBuilder (single pass) ===")
+    two_pass = lambda source: build_ast(get_tree_parser().parse(source))
+    parse_to_ast("")  # 파서 생성 비용 제외
+    two_pass("")
+    for n_funcs in (100, 400, 1600):
+        source = large_program(n_funcs)
+        t_tree, _ = best_of(repeat, two_pass, source)
+        t_inline, _ = best_of(repeat, parse_to_ast, source)
+        m_tree = peak_memory(two_pass, source)
+        m_inline = peak_memory(parse_to_ast, source)
+        print(f"  {len(source) // 1024:5d}KB  tree {t_tree * 1000:8.1f}ms {m_tree / 2**20:7.2f}MB   "
+              f"inline {t_inline * 1000:8.1f}ms {m_inline / 2**20:7.2f}MB   "
+              f"time {t_tree / t_inline:.2f}x  memory {m_tree / m_inline:.2f}x")
+
+# === 섹션: AST 최적화 레벨별 비교 ===
+
+def vm_output(code):
+    """VM 실행 결과 (OUTPUT/VM Error 라인)"""
+    _, _, output = silent_run(VirtualMachine().run, code)
+    return output
+
+VM_ERROR_LOCATION = re.compile(r"^(VM Error[^\n]*?) in FRAME=\d+ PC=\d+, INSTR=.*?: ", re.M)
+
+def vm_result(code):
+    """vm_output에서 최적화 레벨마다 달라지는 오류 위치(FRAME/PC/INSTR)를 뺀 것 (출력과 오류 메시지만 비교)"""
+    return VM_ERROR_LOCATION.sub(r"\1: ", vm_output(code))
+
+def bench_optimize(repeat=3):
+    print("=== optimize: AST optimization levels (output must match -O 0) ===")
+    from pvm_with_lark import sample_code
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(50), unbound=unbound_program())
+    for name, source in corpus.items():
+        baseline = None
+        for level in (0, 1, 2):
+            report = {}
+            code, _, _ = silent_run(compile_source, source, level, report)
+            output = vm_result(code)
+            if baseline is None:
+                baseline = output
+            elif output != baseline:
+                raise SystemExit(f"output mismatch in {name} at -O {level}:\n{output}\n--- expected ---\n{baseline}")
+            n_static = sum(1 for instr in code if instr[0] != "LABEL")
+            n_dynamic = count_instructions(code)
+            elapsed, _ = best_of(repeat, VirtualMachine().run, code)
+            removed = report.get("peephole", {}).get("removed", 0)
+            print(f"  {name:6s} -O {level}  {n_static:6d} instrs  {n_dynamic:8d} executed  {elapsed:8.4f}s  "
+                  f"peephole removed {removed}")
+
+# === 섹션: 루프 최적화 ===
+
+def bench_loops(repeat=5):
+    print("=== loops: loop-invariant code motion + strength reduction at -O 2 (output must match -O 0) ===")
+    from code_gen import CodeGenerator
+    from pvm_with_lark import optimize_ast, optimize_code
+    corpus = dict(WORKLOADS, invariant=invariant_program(5000))
+    for name, source in corpus.items():
+        expected = vm_output(silent_run(compile_source, source, 0)[0])
+        results = {}
+        for loops in (False, True):
+            report = {}
+            codegen = CodeGenerator()
+            codegen.compile_program(optimize_ast(parse_to_ast(source), 2, report, loops=loops))
+            code = optimize_code(codegen.code, 2)
+            output = vm_output(code)
+            if output != expected:
+                raise SystemExit(f"output mismatch in {name} (loops={loops}):\n{output}\n--- expected ---\n{expected}")
+            elapsed, _ = best_of(repeat, VirtualMachine().run, code)
+            results[loops] = (count_instructions(code), elapsed, report.get("loops"))
+        (n_off, t_off, _), (n_on, t_on, stats) = results[False], results[True]
+        print(f"  {name:9s} hoisted {stats['hoisted']:2d} reduced {stats['reduced']:2d}  "
+              f"executed {n_off:7d} -> {n_on:7d}  {t_off:7.4f}s -> {t_on:7.4f}s  speedup {t_off / t_on:4.2f}x")
+
+# === 섹션: 작은 함수 인라이닝 ===
+
+def count_calls(code):
+    """InstructionCounter 훅으로 (실행된 명령어 수, 함수 호출 수)를 셈"""
+    counter = InstructionCounter()
+    silent_run(VirtualMachine(hooks=[counter]).run, code)
+    return counter.instructions, counter.calls
+
+def bench_inline(repeat=5):
+    print("=== inline: small-function inlining at -O 1 (executed calls, output must match) ===")
+    from code_gen import CodeGenerator
+    from pvm_with_lark import sample_code, optimize_ast, optimize_code
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(50))
+    for name, source in corpus.items():
+        results = {}
+        for inline in (False, True):
+            report = {}
+            codegen = CodeGenerator()
+            codegen.compile_program(optimize_ast(parse_to_ast(source), 1, report, inline=inline))
+            code = optimize_code(codegen.code, 1)
+            elapsed, output = best_of(repeat, VirtualMachine().run, code)
+            results[inline] = (count_calls(code), elapsed, output, report.get("inline"))
+        ((n_off, calls_off), t_off, expected, _), ((n_on, calls_on), t_on, output, stats) = results[False], results[True]
+        if output != expected:
+            raise SystemExit(f"output mismatch in {name} with inlining:\n{output}\n--- expected ---\n{expected}")
+        # 모듈 수준 인라인은 임시 변수를 만들지 않으므로 _inl 이름이 전역 변수가 되면 안 됨
+        leaked = [n for n in link(code).names if n.startswith("_inl")]
+        if leaked:
+            raise SystemExit(f"inliner temps leaked into globals in {name}: {leaked}")
+        print(f"  {name:6s} inlined {stats['inlined']:3d} sites (+{stats['growth']:4d} nodes)  "
+              f"calls {calls_off:6d} -> {calls_on:6d}  executed {n_off:7d} -> {n_on:7d}  "
+              f"{t_off:7.4f}s -> {t_on:7.4f}s  speedup {t_off / t_on:4.2f}x")
+
+# === 섹션: CFG 패스 ===
+
+def bench_cfg(repeat=5):
+    print("=== cfg: basic-block passes (unreachable blocks, dead stores, layout) at -O 1 ===")
+    from pvm_with_lark import sample_code, optimize_code
+    corpus = dict(WORKLOADS, deadcode=deadcode_program(5000), sample=sample_code, large=large_program(50))
+    for name, source in corpus.items():
+        generated, _, _ = silent_run(generate_code, source, 1)
+        report = {}
+        without = optimize_code(generated, 1, cfg=False)
+        code = optimize_code(generated, 1, report, cfg=True)
+        t_without, expected = best_of(repeat, VirtualMachine().run, without)
+        elapsed, output = best_of(repeat, VirtualMachine().run, code)
+        if output != expected:
+            raise SystemExit(f"output mismatch in {name} with CFG passes:\n{output}\n--- expected ---\n{expected}")
+        passes = ", ".join(f"{pass_name} {before}->{after}"
+                           for pass_name, (before, after) in report["cfg"]["counts"].items())
+        n_without = sum(1 for instr in without if instr[0] != "LABEL")
+        n_static = sum(1 for instr in code if instr[0] != "LABEL")
+        print(f"  {name:8s} {passes}")
+        print(f"  {'':8s} final {n_without:5d} -> {n_static:5d} instrs  executed {count_instructions(without):7d} -> "
+              f"{count_instructions(code):7d}  {t_without:7.4f}s -> {elapsed:7.4f}s")
+
+# === 섹션: 스택 깊이 검증 ===
+
+def bench_verify(repeat=5):
+    print("=== verify: checked handlers vs verified fast path (table engine, -O 1) ===")
+    from pvm_with_lark import sample_code
+    from verifier import verify
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(200))
+    for name, source in corpus.items():
+        tuples, _, _ = silent_run(compile_source, source, 1)
+        checked = link(tuples)
+        checked.verified = False  # 검증하지 않은 코드처럼 확인하는 handler로 실행
+        code = link(tuples)
+        ok, t_verify, _ = silent_run(verify, code)
+        if not ok:
+            raise SystemExit(f"{name} failed verification: {code.verify_error}")
+        t_checked, output = best_of(repeat, VirtualMachine().run, checked)
+        t_fast, fast_output = best_of(repeat, VirtualMachine().run, code)
+        if output != fast_output:
+            raise SystemExit(f"output mismatch in {name} on the verified path:\n{fast_output}\n--- checked ---\n{output}")
+        print(f"  {name:6s} verify {t_verify * 1000:7.2f}ms  max stack {max(code.max_stack.values())}  "
+              f"checked {t_checked:8.4f}s  verified {t_fast:8.4f}s  speedup {t_checked / t_fast:.2f}x")
+
+# === 섹션: superinstructions ===
+
+# 소스 문장 하나가 끝날 때 실행되는 opcode (대입, print, return, if/while 조건, def)
+STATEMENT_OPS = ("STORE_FAST", "STORE_GLOBAL", "STORE_NAME", "PRINT", "RETURN", "JUMP_IF_FALSE", "DEF_FUNC")
+
+def bench_superinstructions(repeat=5):
+    print("=== superinstructions: opcode pair/triple profile, dispatches per statement ===")
+    from pvm_with_lark import sample_code
+    corpus = dict(WORKLOADS, sample=sample_code)
+    profiler = OpcodePairProfiler()
+    for source in corpus.values():
+        code, _, _ = silent_run(compile_source, source, 1, None, False)
+        silent_run(VirtualMachine(hooks=[profiler]).run, code)
+    print("  top pairs:   " + ", ".join(f"{'+'.join(k)} {v}" for k, v in profiler.top_pairs(6)))
+    print("  top triples: " + ", ".join(f"{'+'.join(k)} {v}" for k, v in profiler.top_triples(6)))
+    for name, source in corpus.items():
+        plain, _, _ = silent_run(compile_source, source, 1, None, False)
+        fused, _, _ = silent_run(compile_source, source, 1, None, True)
+        if vm_output(plain) != vm_output(fused):
+            raise SystemExit(f"output mismatch in {name} with superinstructions")
+        counter = InstructionCounter()
+        silent_run(VirtualMachine(hooks=[counter]).run, plain)
+        statements = sum(counter.by_opcode.get(op, 0) for op in STATEMENT_OPS)
+        n_plain = counter.instructions
+        n_fused = count_instructions(fused)
+        t_plain, _ = best_of(repeat, VirtualMachine().run, plain)
+        t_fused, _ = best_of(repeat, VirtualMachine().run, fused)
+        print(f"  {name:6s} {statements:7d} stmts  dispatches/stmt {n_plain / statements:5.2f} -> "
+              f"{n_fused / statements:5.2f}  {t_plain:8.4f}s -> {t_fused:8.4f}s  speedup {t_plain / t_fused:.2f}x")
+
+# === 섹션: 클로저 엔진 vs 바이트코드 VM ===
+
+def bench_closure(repeat=5):
+    print("=== closure: AST -> Python closures vs bytecode VM (table engine) ===")
+    from closure_engine import ClosureEngine
+    from pvm_with_lark import sample_code
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(50))
+    for name, source in corpus.items():
+        ast = parse_to_ast(source)
+        engine = ClosureEngine()
+        program, t_compile, _ = silent_run(engine.compile_program, ast)
+        t_closure, closure_output = best_of(repeat, engine.run_compiled, program)
+        results = []
+        for level in (0, 1):
+            code, _, _ = silent_run(compile_source, source, level)
+            elapsed, output = best_of(repeat, VirtualMachine().run, code)
+            if output != closure_output:
+                raise SystemExit(f"output mismatch in {name} (closure vs VM -O {level}):\n"
+                                 f"{closure_output}\n--- VM ---\n{output}")
+            results.append(elapsed)
+        print(f"  {name:6s} closure {t_closure:8.4f}s (compile {t_compile * 1000:6.2f}ms)  "
+              f"VM -O 0 {results[0]:8.4f}s  VM -O 1 {results[1]:8.4f}s  "
+              f"speedup {results[0] / t_closure:.2f}x / {results[1] / t_closure:.2f}x")
+    # Python 재귀 한도보다 깊은 재귀: 꼬리 호출은 trampoline, 나머지는 RecursionError -> VM으로 다시 실행
+    for n in (5000, 50000):
+        for tail_only in (True, False):
+            source = deep_recursion_program(n, tail_only)
+            expected = vm_output(silent_run(compile_source, source)[0])
+            engine = ClosureEngine()
+            _, elapsed, output = silent_run(engine.run, parse_to_ast(source))
+            if output != expected or (tail_only and engine.fallbacks):
+                raise SystemExit(f"output mismatch in deep recursion {n} (closure vs VM, fallbacks {engine.fallbacks}):\n"
+                                 f"{output}\n--- VM ---\n{expected}")
+            print(f"  deep recursion n={n:6d} {'tail only' if tail_only else 'mixed':9s}  closure {elapsed:8.4f}s  "
+                  f"same output as VM (VM fallbacks {engine.fallbacks})")
+
+# === 섹션: 재귀 호출 경로 ===
+
+def bench_recursion(repeat=5):
+    print("=== recursion: recursive fib, call path (link-time callee, frame free-list) ===")
+    for n in (15, 18, 21):
+        code, _, _ = silent_run(compile_source, recursion_program(n), 1)
+        counter = InstructionCounter()
+        silent_run(VirtualMachine(hooks=[counter]).run, code)
+        t_switch, switch_output = best_of(repeat, VirtualMachine(engine="switch").run, code)
+        vm = VirtualMachine()
+        t_table, output = best_of(repeat, vm.run, code)
+        if output != switch_output:
+            raise SystemExit(f"output mismatch in fib({n}):\n{output}\n--- switch ---\n{switch_output}")
+        print(f"  fib({n:2d}) {counter.calls:7d} calls  switch {t_switch:8.4f}s  table {t_table:8.4f}s  "
+              f"{counter.calls / t_table:10.0f} calls/s  frames allocated {vm.frames_allocated}")
+
+# === 섹션: 꼬리 호출 ===
+
+def bench_tailcall(repeat=3):
+    print("=== tailcall: return f(...) as CALL_FUNCTION + RETURN vs TAIL_CALL (table engine, -O 0) ===")
+    from code_gen import CodeGenerator
+    for n in (1000, 10000, 100000):
+        ast = parse_to_ast(tail_recursion_program(n))
+        results = {}
+        for tail_calls in (False, True):
+            codegen = CodeGenerator(tail_calls=tail_calls)
+            codegen.compile_program(ast)
+            code = link(codegen.code)
+            vm = VirtualMachine()
+            elapsed, output = best_of(repeat, vm.run, code)
+            memory = peak_memory(silent_run, VirtualMachine().run, code)
+            results[tail_calls] = (elapsed, output, memory, vm.frames_allocated)
+        (t_off, expected, m_off, f_off), (t_on, output, m_on, f_on) = results[False], results[True]
+        if output != expected:
+            raise SystemExit(f"output mismatch in tail_recursion({n}):\n{output}\n--- expected ---\n{expected}")
+        print(f"  n={n:6d}  frames allocated {f_off:6d} -> {f_on}  peak memory {m_off / 1024:8.1f}KB -> "
+              f"{m_on / 1024:5.1f}KB  {t_off:7.4f}s -> {t_on:7.4f}s  speedup {t_off / t_on:4.2f}x")
+
+# === 섹션: 순수 함수 메모이제이션 ===
+
+def bench_memoize(repeat=3):
+    print("=== memoize: table engine vs per-function result cache for pure functions (-O 0) ===")
+    from memoize import Memoizer
+    corpus = dict(WORKLOADS, **{f"fib{n}": recursion_program(n) for n in (18, 21, 24)})
+    for name, source in corpus.items():
+        code, _, _ = silent_run(compile_source, source, 0)
+        t_plain, output = best_of(repeat, VirtualMachine().run, code)
+        memo = Memoizer()
+        t_memo, memo_output = best_of(repeat, VirtualMachine(memo=memo).run, code)
+        if output != memo_output:
+            raise SystemExit(f"output mismatch in {name} with memoization:\n{memo_output}\n--- expected ---\n{output}")
+        stats = memo.stats()
+        print(f"  {name:6s} plain {t_plain:8.4f}s  memoized {t_memo:8.4f}s  speedup {t_plain / t_memo:7.2f}x  "
+              f"pure {len(stats['functions'])}  hits {stats['hits']:6d} misses {stats['misses']:6d} "
+              f"evictions {stats['evictions']:5d} disabled {stats['disabled']}")
+
+# === 섹션: 레지스터 VM vs 스택 VM ===
+
+def bench_register(repeat=5):
+    print("=== register: three-address register VM vs stack VM (table engine), same AST ===")
+    import register_vm
+    from pvm_with_lark import sample_code, optimize_ast
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(50))
+    for name, source in corpus.items():
+        for level in (0, 1):
+            ast = optimize_ast(parse_to_ast(source), level)
+            register_code = register_vm.compile_program(ast)
+            n_reg, _, _ = silent_run(register_vm.RegisterVM().count_instructions, register_code)
+            t_reg, reg_output = best_of(repeat, register_vm.RegisterVM().run, register_code)
+            code, _, _ = silent_run(compile_source, source, level)
+            n_stack = count_instructions(code)
+            t_stack, output = best_of(repeat, VirtualMachine().run, code)
+            if [l for l in output.splitlines() if l.startswith("OUTPUT")] != \
+               [l for l in reg_output.splitlines() if l.startswith("OUTPUT")]:
+                raise SystemExit(f"output mismatch in {name} (register vs stack VM):\n{reg_output}\n--- stack ---\n{output}")
+            print(f"  {name:6s} -O {level}  stack {n_stack:8d} instrs {t_stack:8.4f}s   "
+                  f"register {n_reg:8d} instrs {t_reg:8.4f}s   instrs {n_stack / n_reg:4.2f}x  time {t_stack / t_reg:4.2f}x")
+
+# === 섹션: 트랜스파일러 vs 바이트코드 VM ===
+
+def bench_transpile(repeat=5):
+    print("=== transpile: bytecode -> CPython source (exec) vs bytecode VM (table engine) ===")
+    import transpiler
+    from pvm_with_lark import sample_code
+    corpus = dict(WORKLOADS, sample=sample_code, large=large_program(50))
+    for name, source in corpus.items():
+        code = generate_code(source)
+        vm_code, _, _ = silent_run(compile_source, source, 1)
+        t_vm, output = best_of(repeat, VirtualMachine().run, vm_code)
+        try:
+            (_, main), t_translate, _ = silent_run(transpiler.compile_program, code)
+        except transpiler.TranslationError as e:
+            transpiled, _, native_output = silent_run(transpiler.run, code)
+            if transpiled or output != native_output:
+                raise SystemExit(f"output mismatch in {name} (fallback vs VM):\n{native_output}\n--- VM ---\n{output}")
+            print(f"  {name:6s} not transpiled ({e}): runs on the VM")
+            continue
+        t_native, native_output = best_of(repeat, transpiler.run_compiled, main)
+        if output != native_output:
+            raise SystemExit(f"output mismatch in {name} (transpiled vs VM):\n{native_output}\n--- VM ---\n{output}")
+        print(f"  {name:6s} transpiled {t_native:8.4f}s (translate+compile {t_translate * 1000:6.2f}ms)  "
+              f"VM -O 1 {t_vm:8.4f}s  speedup {t_vm / t_native:.1f}x")
+    # Python 재귀 한도보다 깊은 재귀: 자기 꼬리 재귀는 while 루프로 변환, 다른 재귀는 VM으로 fallback
+    for n in (5000, 50000):
+        for tail_only in (True, False):
+            source = deep_recursion_program(n, tail_only)
+            expected = vm_output(silent_run(compile_source, source)[0])
+            for level in (0, 1, 2):
+                transpiled, _, output = silent_run(transpiler.run, generate_code(source, level))
+                if output != expected or transpiled != tail_only:
+                    raise SystemExit(f"output mismatch in deep recursion {n} at -O {level} (transpiled={transpiled}):\n"
+                                     f"{output}\n--- VM ---\n{expected}")
+        print(f"  deep recursion n={n:6d}  same output as VM (tail recursion transpiled, other recursion on the VM)")
+
+# === 섹션: 트레이싱 JIT ===
+
+def bench_jit(repeat=5):
+    print("=== jit: table engine vs table engine + tracing JIT (-O 1) ===")
+    from jit import TraceJIT
+    for name, source in WORKLOADS.items():
+        code, _, _ = silent_run(compile_source, source, 1)
+        t_plain, output = best_of(repeat, VirtualMachine().run, code)
+        jit = TraceJIT()
+        t_jit, jit_output = best_of(repeat, VirtualMachine(jit=jit).run, code)
+        if output != jit_output:
+            raise SystemExit(f"output mismatch in {name} with JIT:\n{jit_output}\n--- expected ---\n{output}")
+        stats = jit.stats()
+        print(f"  {name:6s} interp {t_plain:8.4f}s  jit {t_jit:8.4f}s  speedup {t_plain / t_jit:5.2f}x  "
+              f"traces {stats['traces']} aborted {stats['aborted']} hits {stats['hits']} misses {stats['misses']}")
+
+# === 섹션: quickening ===
+
+def bench_quicken(repeat=5):
+    print("=== quicken: table engine vs adaptive quickening (specialized at run time) ===")
+    for name, source in WORKLOADS.items():
+        for level in (0, 1):
+            code, _, _ = silent_run(compile_source, source, level)
+            # 프로세스의 첫 실행들은 느리므로 (검증, CPython 자체의 warm-up) 두 방식 모두 한 번씩 먼저 실행
+            best_of(repeat, VirtualMachine().run, code)
+            best_of(repeat, VirtualMachine(quicken=True).run, code)
+            t_plain, output = best_of(repeat, VirtualMachine().run, code)
+            vm = VirtualMachine(quicken=True)
+            t_quick, quick_output = best_of(repeat, vm.run, code)
+            if output != quick_output:
+                raise SystemExit(f"output mismatch in {name} with quickening:\n{quick_output}\n--- expected ---\n{output}")
+            stats = vm.quickening_stats()
+            sites = " ".join(f"{op}={n}" for op, n in sorted(stats["sites"].items()))
+            print(f"  {name:6s} -O {level}  plain {t_plain:8.4f}s  quickened {t_quick:8.4f}s  "
+                  f"speedup {t_plain / t_quick:5.2f}x  deopt {stats['deoptimized']}  {sites}")
+
+# === 섹션: lane 병렬 batch 실행 ===
+
+def bench_batch(repeat=3):
+    print("=== batch: one scalar VM run per input set vs lane-parallel NumPy batch (SIMT, -O 1) ===")
+    import numpy as np
+    from batch_vm import BatchVM, run_scalar
+    code, _, _ = silent_run(compile_source, batch_program(), 1)
+    for lanes in (10, 100, 1000, 10000):
+        rng = np.random.default_rng(lanes)
+        inputs = {"n": rng.integers(0, 40, lanes), "k": rng.integers(-2, 3, lanes)}
+        batch = BatchVM()
+        t_batch = best_of(repeat, lambda: batch.run(code, inputs).outputs())[0]
+        outputs = batch.run(code, inputs).outputs()
+        start = time.perf_counter()
+        expected = run_scalar(code, inputs)
+        t_scalar = time.perf_counter() - start
+        if outputs != expected:
+            raise SystemExit(f"output mismatch in batch run with {lanes} lanes")
+        stats = batch.stats()
+        print(f"  {lanes:6d} lanes  scalar {t_scalar:8.4f}s  batch {t_batch:8.4f}s  speedup {t_scalar / t_batch:6.2f}x  "
+              f"{lanes / t_batch:10.0f} runs/s  steps {stats['steps']} (divergent {stats['divergent_steps']})")
+
+# === 섹션: green thread 스케줄러 ===
+
+def bench_schedule(repeat=3):
+    print("=== schedule: green threads (Scheduler.run_steps slices) vs VirtualMachine.run to completion (-O 1) ===")
+    from scheduler import Scheduler
+    long_code = link(silent_run(compile_source, loop_program(20000), 1)[0])
+    t_plain, _ = best_of(repeat, VirtualMachine().run, long_code)
+    for quantum in (1, 10, 100, 1000):
+        def scheduled():
+            scheduler = Scheduler(quantum)
+            scheduler.spawn(long_code)
+            scheduler.run()
+            return scheduler
+        scheduler, _, _ = silent_run(scheduled)
+        t_sched, _ = best_of(repeat, scheduled)
+        print(f"  loop   quantum {quantum:5d}  run {t_plain:7.4f}s  scheduled {t_sched:7.4f}s ({t_sched / t_plain:4.2f}x)  "
+              f"switches {scheduler.switches:6d}  {t_sched / scheduler.switches * 1e6:6.2f}us/slice")
+    # 작은 스크립트 여러 개: 같은 CodeObject를 공유하는 Task n개
+    small_code = link(silent_run(compile_source, call_program(20), 1)[0])
+    for n in (100, 1000, 5000):
+        def sequential():
+            for _ in range(n):
+                VirtualMachine().run(small_code)
+        def scheduled():
+            scheduler = Scheduler(100)
+            for _ in range(n):
+                scheduler.spawn(small_code)
+            scheduler.run()
+            return scheduler
+        t_seq, _ = best_of(1, sequential)
+        t_sched, _ = best_of(1, scheduled)
+        tracemalloc.start()
+        scheduler = Scheduler(100)
+        for _ in range(n):
+            scheduler.spawn(small_code)
+        per_task = tracemalloc.get_traced_memory()[0] / n
+        tracemalloc.stop()
+        silent_run(scheduler.run)
+        print(f"  small  {n:5d} tasks  sequential {t_seq:7.4f}s  scheduled {t_sched:7.4f}s  "
+              f"switches {scheduler.switches:6d}  {per_task / 1024:5.1f}KB/task before running")
+    # preemption: 긴 루프 뒤에 spawn된 작은 스크립트들이 끝나는 시간
+    for policy in ("round_robin", "priority"):
+        scheduler = Scheduler(1000, policy)
+        scheduler.spawn(long_code, priority=0)
+        small = [scheduler.spawn(small_code, priority=1) for _ in range(100)]
+        start = time.perf_counter()
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            while not all(task.done for task in small):
+                scheduler.step()
+            t_small = time.perf_counter() - start
+            scheduler.run()
+        t_all = time.perf_counter() - start
+        print(f"  preempt {policy:11s} 100 small scripts behind a long loop finish after {t_small:7.4f}s "
+              f"(all done {t_all:7.4f}s; run to completion would wait {t_plain:7.4f}s)")
+
+# === 섹션: 스크립트 묶음 병렬 실행 (process pool) ===
+
+def bench_corpus(count=200):
+    print("=== corpus: compile + run scripts one by one in-process vs CorpusRunner process pool (-O 1) ===")
+    from corpus_runner import CorpusRunner
+    sources = list(WORKLOADS.values()) + [call_program(50 + i) if i % 2 else loop_program(200 + i)
+                                          for i in range(count - len(WORKLOADS))]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, source in enumerate(sources):
+            path = os.path.join(tmp, f"script{i:04d}.pvm")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            paths.append(path)
+        def sequential():
+            return [silent_run(VirtualMachine().run, compile_file(path, False, opt_level=1)[0])[2] for path in paths]
+        silent_run(compile_source, "print(1)")  # 파서 생성 비용은 빼고 잼
+        start = time.perf_counter()
+        expected = sequential()
+        t_seq = time.perf_counter() - start
+        print(f"  sequential  {len(paths)} scripts  {t_seq:8.4f}s  {len(paths) / t_seq:8.1f} scripts/s")
+        for workers in range(1, max(2, os.cpu_count() or 1) + 1):
+            runner = CorpusRunner(workers=workers, opt_level=1)
+            outputs = [result.output for result in runner.run(paths)]
+            if outputs != expected:
+                raise SystemExit(f"output mismatch in corpus run with {workers} workers")
+            stats = runner.stats()
+            print(f"  {workers:2d} workers  {len(paths)} scripts  {stats['elapsed']:8.4f}s  "
+                  f"{stats['throughput']:8.1f} scripts/s  speedup {t_seq / stats['elapsed']:5.2f}x vs sequential "
+                  f"(pool start + worker parser load included)")
+
+BENCHMARKS = {
+    "dispatch": bench_dispatch,
+    "tracing": bench_tracing,
+    "cache": bench_cache,
+    "startup": bench_startup,
+    "parse": bench_parse,
+    "optimize": bench_optimize,
+    "cfg": bench_cfg,
+    "loops": bench_loops,
+    "inline": bench_inline,
+    "verify": bench_verify,
+    "superinstructions": bench_superinstructions,
+    "recursion": bench_recursion,
+    "tailcall": bench_tailcall,
+    "memoize": bench_memoize,
+    "closure": bench_closure,
+    "register": bench_register,
+    "transpile": bench_transpile,
+    "jit": bench_jit,
+    "quicken": bench_quicken,
+    "batch": bench_batch,
+    "schedule": bench_schedule,
+    "corpus": bench_corpus,
+}
+
+def main(argv):
+    sections = argv or list(BENCHMARKS)
+    for section in sections:
+        if section not in BENCHMARKS:
+            raise SystemExit(f"Unknown benchmark: {section} (choose from {', '.join(BENCHMARKS)})")
+        BENCHMARKS[section]()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
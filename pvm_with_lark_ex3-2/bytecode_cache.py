@@ -0,0 +1,154 @@
+# === 바이트코드 캐시 (.pvmc) ===
+# __pycache__처럼 소스 파일 옆의 __pvmcache__ 디렉터리에 링크된 CodeObject를 저장합니다.
+# 캐시는 소스 해시, 문법(grammar.lark) 해시, 컴파일러 버전이 모두 같을 때만 사용됩니다.
+# 읽을 때는 mmap으로 파일을 매핑하므로 Lark/파서/코드 생성기를 전혀 import 하지 않습니다.
+#
+# 파일 형식 (모든 정수는 little-endian):
+#   header  : magic(4s) format_version(H) compiler_version(H)
+#             source_sha256(32s) grammar_sha256(32s) payload_size(I) payload_crc32(I)
+#   payload : ops_size(I) ops(bytes, array('B'))
+#             args_size(I) args(bytes, array('i'), little-endian)
+#             pools_size(I) pools(marshal: consts, names, functions, calls, fused, verified, max_stack, verify_error)
+#   verified/max_stack/verify_error는 verifier.verify()의 결과이므로 캐시에서 읽은 코드는 다시 검증하지 않습니다.
+
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from linker import COMPILER_VERSION, CodeObject, FunctionInfo
+from verifier import verify
+
+MAGIC = b"PVMC"
+FORMAT_VERSION = 3
+CACHE_DIR_NAME = "__pvmcache__"
+CACHE_SUFFIX = ".pvmc"
+
+HEADER = struct.Struct("<4sHH32s32sII")
+SIZE = struct.Struct("<I")
+
+class CacheError(Exception):
+    """캐시 파일이 손상되었거나 형식이 맞지 않음"""
+
+def source_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+def cache_path(source_path, cache_dir=None, opt_level=0):
+    """
+    소스 파일에 대응하는 캐시 파일 경로 (예: dir/__pvmcache__/prog.pvm-1.pvmc).
+    최적화 레벨이 0이 아니면 .pyc처럼 파일 이름에 태그를 붙입니다 (prog.pvm-1.opt-2.pvmc).
+    """
+    source_path = os.path.abspath(source_path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(source_path), CACHE_DIR_NAME)
+    base = os.path.basename(source_path)
+    opt_tag = f".opt-{opt_level}" if opt_level else ""
+    return os.path.join(cache_dir, f"{base}.pvm-{COMPILER_VERSION}{opt_tag}{CACHE_SUFFIX}")
+
+def _le_args(args):
+    """array('i')를 little-endian 바이트로"""
+    if sys.byteorder == "big":
+        args = array('i', args)
+        args.byteswap()
+    return args.tobytes()
+
+def dumps(code, src_hash, grammar_hash):
+    """CodeObject -> .pvmc 바이트"""
+    if code.verified is None:
+        verify(code)
+    functions = [(f.name, f.name_index, list(f.params), f.entry, list(f.varnames)) for f in code.functions]
+    pools = marshal.dumps((list(code.consts), list(code.names), functions, [list(c) for c in code.calls],
+                          [list(f) for f in code.fused], code.verified, dict(code.max_stack), code.verify_error))
+    ops = code.ops.tobytes()
+    args = _le_args(code.args)
+    payload = b"".join([SIZE.pack(len(ops)), ops, SIZE.pack(len(args)), args, SIZE.pack(len(pools)), pools])
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, COMPILER_VERSION, src_hash, grammar_hash,
+                         len(payload), zlib.crc32(payload))
+    return header + payload
+
+def loads(buffer, src_hash, grammar_hash):
+    """
+    .pvmc 바이트(또는 mmap) -> CodeObject.
+    키가 다르면 None (stale), 형식이 깨졌으면 CacheError.
+    """
+    if len(buffer) < HEADER.size:
+        raise CacheError("truncated header")
+    magic, fmt, compiler, cached_src, cached_grammar, size, crc = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise CacheError(f"bad magic {magic!r}")
+    if fmt != FORMAT_VERSION or compiler != COMPILER_VERSION:
+        return None
+    if cached_src != src_hash or cached_grammar != grammar_hash:
+        return None
+    payload = buffer[HEADER.size:HEADER.size + size]
+    if len(payload) != size or zlib.crc32(payload) != crc:
+        raise CacheError("payload size/checksum mismatch")
+    try:
+        offset = 0
+        sections = []
+        for _ in range(3):
+            (n,) = SIZE.unpack_from(payload, offset)
+            offset += SIZE.size
+            sections.append(payload[offset:offset + n])
+            offset += n
+        ops = array('B')
+        ops.frombytes(sections[0])
+        args = array('i')
+        args.frombytes(sections[1])
+        if sys.byteorder == "big":
+            args.byteswap()
+        consts, names, functions, calls, fused, verified, max_stack, verify_error = marshal.loads(sections[2])
+    except (struct.error, ValueError, EOFError, TypeError) as e:
+        raise CacheError(f"malformed payload: {e}") from None
+    if len(ops) != len(args):
+        raise CacheError("opcode/operand length mismatch")
+    functions = [FunctionInfo(name, index, params, entry, varnames)
+                 for name, index, params, entry, varnames in functions]
+    code = CodeObject(ops, args, consts, names, functions, [tuple(c) for c in calls], [tuple(f) for f in fused])
+    code.verified = verified
+    code.max_stack = max_stack
+    code.verify_error = verify_error
+    return code
+
+def load(path, src_hash, grammar_hash):
+    """mmap으로 캐시 파일을 읽음. 없거나 오래된 캐시는 None, 손상된 파일은 CacheError"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise CacheError("empty cache file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return loads(mm, src_hash, grammar_hash)
+
+def store(path, code, src_hash, grammar_hash):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (중간에 죽어도 반쯤 쓰인 캐시가 남지 않음)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(code, src_hash, grammar_hash))
+    os.replace(tmp, path)
+
+def load_or_compile(path, source, grammar_hash, compile_func):
+    """
+    캐시가 유효하면 CodeObject를 바로 돌려주고, 아니면 compile_func(source)로 컴파일 후 저장.
+    손상된 캐시는 다시 컴파일해서 덮어씁니다. 반환값: (CodeObject, 캐시 적중 여부)
+    """
+    src_hash = source_hash(source)
+    try:
+        code = load(path, src_hash, grammar_hash)
+    except (CacheError, OSError, ValueError):
+        code = None
+    if code is not None:
+        return code, True
+    code = compile_func(source)
+    try:
+        store(path, code, src_hash, grammar_hash)
+    except OSError:
+        pass  # 캐시 디렉터리에 쓸 수 없어도 실행은 계속
+    return code, False
@@ -0,0 +1,254 @@
+# === 제어 흐름 그래프 (CFG)와 블록 단위 최적화 ===
+# CodeGenerator의 레이블 튜플 바이트코드를 기본 블록(basic block)으로 나누고 레이블/점프로 CFG를 만듭니다.
+#   - 블록은 LABEL에서 시작하고 JUMP/JUMP_IF_FALSE/RETURN/TAIL_CALL/HALT 뒤에서 끝납니다.
+#   - 진입점은 메인 코드(첫 블록)와, 도달 가능한 DEF_FUNC가 가리키는 함수 바디 블록입니다.
+# 패스 (-O 1 이상, peephole 전에 실행):
+#   1. 도달 불가능한 블록 제거: Return 뒤 코드, 실행되지 않는 DEF_FUNC의 함수 바디 등
+#   2. 죽은 지역 변수 저장 제거: 함수마다 지역 슬롯 liveness를 계산해서, 이후 어느 경로에서도 읽히지 않는
+#      STORE_FAST를 찾습니다. 저장되는 값이 실패할 수 없는 로드(LOAD_CONST, 파라미터 LOAD_FAST)면
+#      로드와 함께 제거합니다. (다른 식은 오류/함수 호출이 있을 수 있고 값을 버리는 opcode가 없어서 남김)
+#      STORE_FAST x; LOAD_FAST x 뒤에서 x가 죽어 있으면 두 명령어를 모두 없애 값을 스택에 그대로 둡니다.
+#      메인 코드의 STORE_GLOBAL/LOAD_GLOBAL도 같은 방식으로 처리하되, 어느 함수 바디에서든 LOAD_GLOBAL로 읽히는
+#      이름은 호출 중에 읽힐 수 있으므로 제외합니다. (모듈 수준에서 인라인된 함수의 임시 변수 등)
+#   3. 블록 배치(linearization): 무조건 JUMP의 대상 블록에 fall-through로 들어오는 블록이 없으면
+#      그 블록을 JUMP 바로 뒤에 놓고 JUMP를 없앱니다. 함수 바디는 메인 코드 뒤로 모이고,
+#      메인 코드 끝 뒤에 다른 블록이 오면 메인 코드 끝에 HALT를 둡니다.
+
+TERMINATORS = ("JUMP", "JUMP_IF_FALSE", "RETURN", "TAIL_CALL", "HALT")
+
+class BasicBlock:
+    def __init__(self, index, labels, instrs):
+        self.index = index
+        self.labels = labels      # 블록 시작 위치의 레이블들
+        self.instrs = instrs      # LABEL을 제외한 명령어 튜플
+        self.jump = None          # 마지막 명령어의 점프 대상 블록 인덱스
+        self.fallthrough = None   # 다음 블록으로 그대로 진행하면 그 인덱스 (코드 끝이면 블록 수 = exit)
+
+    def successors(self):
+        return [i for i in (self.fallthrough, self.jump) if i is not None]
+
+    def __repr__(self): return f"BasicBlock({self.index}, {self.labels}, {len(self.instrs)} instrs)"
+
+class ControlFlowGraph:
+    def __init__(self, code):
+        self.blocks = []
+        self.label_block = {}  # 레이블 -> 블록 인덱스
+        labels, instrs = [], []
+        for instr in code:
+            if instr[0] == "LABEL":
+                if instrs:
+                    self.add_block(labels, instrs)
+                    labels, instrs = [], []
+                labels.append(instr[1])
+                continue
+            instrs.append(instr)
+            if instr[0] in TERMINATORS:
+                self.add_block(labels, instrs)
+                labels, instrs = [], []
+        if labels or instrs:
+            self.add_block(labels, instrs)
+        self.exit = len(self.blocks)
+        for block in self.blocks:
+            last = block.instrs[-1][0] if block.instrs else None
+            if last in ("JUMP", "JUMP_IF_FALSE"):
+                block.jump = self.label_block[block.instrs[-1][1]]
+            if last not in ("JUMP", "RETURN", "TAIL_CALL", "HALT"):
+                block.fallthrough = block.index + 1
+
+    def add_block(self, labels, instrs):
+        block = BasicBlock(len(self.blocks), labels, instrs)
+        for label in labels:
+            self.label_block[label] = block.index
+        self.blocks.append(block)
+
+    def function_defs(self, blocks=None):
+        """(DEF_FUNC 피연산자, 바디 진입 블록 인덱스) 목록"""
+        for block in self.blocks if blocks is None else blocks:
+            for instr in block.instrs:
+                if instr[0] == "DEF_FUNC":
+                    yield instr[1], self.label_block[instr[1][2]]
+
+    def region(self, entry):
+        """entry에서 점프/fall-through로 도달하는 블록 인덱스 (정렬). 함수 바디는 따로 (DEF_FUNC는 간선이 아님)"""
+        seen = set()
+        work = [entry]
+        while work:
+            i = work.pop()
+            if i in seen or i == self.exit:
+                continue
+            seen.add(i)
+            work.extend(self.blocks[i].successors())
+        return sorted(seen)
+
+    def reachable(self):
+        """메인 코드와, 도달 가능한 DEF_FUNC의 함수 바디에서 도달하는 블록 인덱스 집합"""
+        seen = set()
+        work = [0] if self.blocks else []
+        while work:
+            region = [i for i in self.region(work.pop()) if i not in seen]
+            seen.update(region)
+            work.extend(entry for _, entry in self.function_defs(self.blocks[i] for i in region))
+        return seen
+
+    def live_out(self, region, load="LOAD_FAST", store="STORE_FAST"):
+        """지역 슬롯(또는 load/store로 주어진 전역 이름) liveness: 블록 인덱스 -> 블록 끝에서 이후에 읽힐 수 있는 슬롯 집합"""
+        use, kill = {}, {}
+        for i in region:
+            use[i], kill[i] = set(), set()
+            for instr in self.blocks[i].instrs:
+                if instr[0] == load and instr[1] not in kill[i]:
+                    use[i].add(instr[1])
+                elif instr[0] == store:
+                    kill[i].add(instr[1])
+        live_in = {i: set() for i in region}
+        live_out = {i: set() for i in region}
+        changed = True
+        while changed:
+            changed = False
+            for i in reversed(region):
+                out = set()
+                for succ in self.blocks[i].successors():
+                    out |= live_in.get(succ, set())
+                new_in = use[i] | (out - kill[i])
+                if out != live_out[i] or new_in != live_in[i]:
+                    live_out[i], live_in[i] = out, new_in
+                    changed = True
+        return live_out
+
+    def to_code(self, order=None, dropped=()):
+        """블록들을 order 순서로 튜플 바이트코드로 되돌림. dropped: 뺄 (블록 인덱스, 명령어 위치)"""
+        code = []
+        for i in range(len(self.blocks)) if order is None else order:
+            block = self.blocks[i]
+            code.extend(("LABEL", label) for label in block.labels)
+            code.extend(instr for k, instr in enumerate(block.instrs) if (i, k) not in dropped)
+        return code
+
+class CFGOptimizer:
+    def __init__(self):
+        self.unreachable_blocks = 0  # 제거된 블록 수
+        self.dead_stores = 0         # 제거된 STORE_FAST/STORE_GLOBAL 수 (값을 만드는 로드와 함께)
+        self.jumps_removed = 0       # 블록 배치로 없앤 JUMP 수
+        self.halts_added = 0         # 메인 코드 끝에 넣은 HALT 수
+        self.counts = {}             # 패스 이름 -> (패스 전 명령어 수, 패스 후 명령어 수), 누적
+
+    def optimize(self, code):
+        for name, run in (("unreachable", self.remove_unreachable), ("dead_stores", self.remove_dead_stores),
+                          ("layout", self.linearize)):
+            before = count_instructions(code)
+            code = run(code)
+            old_before, old_after = self.counts.get(name, (0, 0))
+            self.counts[name] = (old_before + before, old_after + count_instructions(code))
+        return code
+
+    def remove_unreachable(self, code):
+        cfg = ControlFlowGraph(code)
+        reachable = cfg.reachable()
+        self.unreachable_blocks += len(cfg.blocks) - len(reachable)
+        return cfg.to_code(order=sorted(reachable))
+
+    def remove_dead_stores(self, code):
+        # 로드를 지우면 그 슬롯의 앞선 저장이 새로 죽을 수 있으므로 바뀌지 않을 때까지 반복
+        while True:
+            cfg = ControlFlowGraph(code)
+            dropped = set()
+            function_blocks = set()
+            for (name, params, label, varnames), entry in cfg.function_defs():
+                region = cfg.region(entry)
+                function_blocks.update(region)
+                self.find_dead_stores(cfg, region, "LOAD_FAST", "STORE_FAST", len(params), (), dropped)
+            # 메인 코드의 전역 변수: 어느 함수 바디도 읽지 않는 이름은 메인 코드 안에서만 읽히므로 지역 슬롯처럼 다룸
+            shared = {instr[1] for i in function_blocks for instr in cfg.blocks[i].instrs if instr[0] == "LOAD_GLOBAL"}
+            if cfg.blocks:
+                self.find_dead_stores(cfg, cfg.region(0), "LOAD_GLOBAL", "STORE_GLOBAL", 0, shared, dropped)
+            if not dropped:
+                return code
+            code = cfg.to_code(dropped=dropped)
+
+    def find_dead_stores(self, cfg, region, load, store, n_params, keep, dropped):
+        """region 안에서 죽은 store를 찾아 dropped에 (블록 인덱스, 명령어 위치)로 추가. keep의 이름은 항상 살아 있음"""
+        live_out = cfg.live_out(region, load, store)
+        for i in region:
+            live = set(live_out[i])
+            instrs = cfg.blocks[i].instrs
+            dead_after_load = None  # 바로 뒤 로드 다음에 죽어 있는 슬롯
+            for k in range(len(instrs) - 1, -1, -1):
+                op = instrs[k][0]
+                if op == store:
+                    slot = instrs[k][1]
+                    if slot in keep:
+                        pass
+                    elif slot not in live and k > 0 and cannot_fail(instrs[k - 1], n_params):
+                        dropped.update(((i, k - 1), (i, k)))
+                        self.dead_stores += 1
+                    elif slot == dead_after_load and (i, k + 1) not in dropped:
+                        dropped.update(((i, k), (i, k + 1)))
+                        self.dead_stores += 1
+                    live.discard(slot)
+                    dead_after_load = None
+                elif op == load:
+                    slot = instrs[k][1]
+                    dead_after_load = slot if slot not in live else None
+                    live.add(slot)
+                else:
+                    dead_after_load = None
+
+    def linearize(self, code):
+        cfg = ControlFlowGraph(code)
+        blocks = cfg.blocks
+        if not blocks:
+            return code
+        main = set(cfg.region(0))
+        exit_blocks = [block.index for block in blocks if block.fallthrough == cfg.exit]
+        if any(i not in main for i in exit_blocks):
+            return code  # 코드 끝으로 빠지는 함수 바디가 있으면 배치를 바꾸지 않음
+        entries = {0} | {entry for _, entry in cfg.function_defs()}
+        fallthrough_into = {block.fallthrough for block in blocks}
+        placed = set()
+        dropped = set()
+        chains = []
+        for block in blocks:
+            if block.index in placed:
+                continue
+            chain = []
+            while block is not None and block.index not in placed:
+                chain.append(block.index)
+                placed.add(block.index)
+                if block.fallthrough is not None:
+                    block = blocks[block.fallthrough] if block.fallthrough != cfg.exit else None
+                elif (block.jump is not None and block.instrs[-1][0] == "JUMP" and block.jump not in placed
+                      and block.jump not in fallthrough_into and block.jump not in entries):
+                    dropped.add((block.index, len(block.instrs) - 1))
+                    block = blocks[block.jump]
+                else:
+                    block = None
+            chains.append(chain)
+        # 메인 코드 진입 체인이 맨 앞, 코드 끝으로 빠지는 체인이 메인 코드의 마지막, 그 뒤에 함수 바디
+        exit_chain = next((chain for chain in chains if chain[-1] in exit_blocks), None)
+        ordered = [chains[0]] + [chain for chain in chains[1:] if chain[0] in main and chain is not exit_chain]
+        if exit_chain is not None and exit_chain is not chains[0]:
+            ordered.append(exit_chain)
+        ordered += [chain for chain in chains if chain[0] not in main]
+        new_code = []
+        for chain in ordered:
+            new_code.extend(cfg.to_code(order=chain, dropped=dropped))
+            if chain is exit_chain and chain is not ordered[-1]:
+                new_code.append(("HALT",))  # 뒤에 함수 바디가 오므로 코드 끝까지 진행하는 대신 HALT
+                self.halts_added += 1
+        self.jumps_removed += len(dropped)
+        return new_code
+
+    def stats(self):
+        return {"unreachable_blocks": self.unreachable_blocks, "dead_stores": self.dead_stores,
+                "jumps_removed": self.jumps_removed, "halts_added": self.halts_added, "counts": dict(self.counts)}
+
+def cannot_fail(instr, n_params):
+    """값을 스택에 올리기만 하고 오류가 날 수 없는 명령어 (상수, 항상 바인딩된 파라미터 슬롯)"""
+    return instr[0] == "LOAD_CONST" or (instr[0] == "LOAD_FAST" and instr[1] < n_params)
+
+def count_instructions(code):
+    return sum(1 for instr in code if instr[0] != "LABEL")
+
+def optimize(code):
+    """편의 함수: 튜플 바이트코드 -> CFG 패스가 적용된 튜플 바이트코드"""
+    return CFGOptimizer().optimize(code)
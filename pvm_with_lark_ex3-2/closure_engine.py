@@ -0,0 +1,253 @@
+# === 클로저 컴파일 엔진 (AST -> 중첩된 Python 클로저) ===
+# ex1의 Interpreter(Transformer)는 값을 구할 때마다 서브트리를 다시 transform 하고,
+# VirtualMachine은 명령어마다 디스패치 비용을 냅니다.
+# 이 엔진은 pvm_ast 노드를 한 번만 클로저로 바꾼 뒤 그 클로저를 바로 호출해서 실행합니다.
+#
+# 실행 모델 (VirtualMachine과 같은 관찰 결과):
+#   - 스코프 규칙은 code_gen.py와 같습니다. 모듈 변수는 self.globals 딕셔너리,
+#     함수의 파라미터/대입되는 이름은 프레임 리스트의 슬롯 (code_gen.function_locals 순서),
+#     그 외 이름은 전역에서 읽습니다.
+#   - 프레임은 [슬롯 0, ..., 슬롯 n-1, 반환값] 리스트입니다.
+#   - 문장 클로저는 return을 만나면 True를 돌려주고 반환값은 프레임 마지막 칸에 둡니다.
+#     (예외로 return을 구현하지 않으므로 일반 문장 경로에 try가 없음)
+#   - 최상위 def는 VM의 DEF_FUNC처럼 실행 전에 모두 등록됩니다.
+#   - 오류는 "VM Error: <메시지>"로 출력하고 실행을 멈춥니다 (메시지는 VM과 같음, PC 정보는 없음).
+#   - 함수 안의 return f(...)는 VM의 TAIL_CALL처럼 Python 호출을 쌓지 않습니다. callee 프레임을 만든 뒤
+#     TailCall을 반환값 칸에 두고 돌아가면, 호출한 쪽(call)이 루프에서 callee 바디를 실행합니다 (trampoline).
+#     그래서 꼬리 재귀/상호 꼬리 재귀는 깊이와 상관없이 Python 스택을 쓰지 않습니다.
+#   - 꼬리 호출이 아닌 재귀는 Python 재귀이므로 Python 재귀 한도를 넘을 수 있습니다. VM 프레임 스택에는 한도가 없으므로
+#     RecursionError가 나면 같은 프로그램을 VirtualMachine으로 다시 실행합니다. 프로그램은 입력이 없어 결정적이므로
+#     이미 출력한 줄 수만큼 VM 출력을 건너뛰면 전체 출력은 VM 실행과 같습니다.
+
+import sys
+
+from code_gen import CodeGenerator, function_locals
+from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
+from vm import UNBOUND, VirtualMachine
+
+class Function:
+    def __init__(self, name, params, frame_size, body):
+        self.name = name
+        self.params = params
+        self.frame_size = frame_size  # 지역 슬롯 수 + 반환값 칸
+        self.body = body              # body(frame) -> return을 만났으면 True
+    def __repr__(self): return f"Function({self.name}, {self.params})"
+
+class TailCall:
+    """return f(...)가 반환값 칸에 남기는 다음 호출 (호출한 쪽의 trampoline이 실행)"""
+    __slots__ = ("func", "frame")
+    def __init__(self, func, frame):
+        self.func = func
+        self.frame = frame
+
+class SkipLines:
+    """처음 n줄을 버리고 나머지를 stream에 쓰는 stdout (RecursionError fallback용)"""
+    def __init__(self, stream, n):
+        self.stream = stream
+        self.skip = n
+
+    def write(self, text):
+        size = len(text)
+        while self.skip and text:
+            newline = text.find("\n")
+            if newline < 0:
+                return size
+            self.skip -= 1
+            text = text[newline + 1:]
+        if text:
+            self.stream.write(text)
+        return size
+
+    def flush(self):
+        self.stream.flush()
+
+class ClosureEngine:
+    def __init__(self):
+        self.globals = {}    # 전역 변수
+        self.functions = {}  # 함수 이름 -> Function
+        self.stmts = None    # 마지막으로 컴파일한 AST (RecursionError fallback용)
+        self.printed = 0     # 이번 실행에서 출력한 줄 수
+        self.fallbacks = 0   # VirtualMachine으로 다시 실행한 횟수
+
+    def run(self, stmts):
+        """AST 문장 리스트를 클로저로 컴파일한 뒤 실행"""
+        self.run_compiled(self.compile_program(stmts))
+
+    def run_compiled(self, program):
+        """compile_program()의 결과 실행. 실행할 때마다 전역/함수 테이블을 새로 시작"""
+        self.globals.clear()
+        self.functions.clear()
+        self.printed = 0
+        try:
+            program()
+        except RecursionError:
+            # 꼬리 호출이 아닌 깊은 재귀: 한도가 없는 VM 프레임 스택으로 처음부터 다시 실행
+            self.fallbacks += 1
+            codegen = CodeGenerator()
+            codegen.compile_program(self.stmts)
+            saved = sys.stdout
+            sys.stdout = SkipLines(saved, self.printed)
+            try:
+                VirtualMachine().run(codegen.code)
+            finally:
+                sys.stdout = saved
+        except Exception as e:
+            print(f"VM Error: {e}")
+
+    # === 컴파일 ===
+
+    def compile_program(self, stmts):
+        self.stmts = stmts
+        # 최상위 def는 DEF_FUNC처럼 먼저 등록
+        defs = [self.compile_stmt(s, None) for s in stmts if isinstance(s, FuncDef)]
+        block = self.compile_block([s for s in stmts if not isinstance(s, FuncDef)], None)
+        module_frame = [None]  # 최상위 return 값을 받는 칸 (값은 버림)
+        def program():
+            for define in defs:
+                define(module_frame)
+            block(module_frame)
+        return program
+
+    def compile_block(self, stmts, slots):
+        """문장 리스트 -> block(frame). return을 만나면 True"""
+        compiled = tuple(self.compile_stmt(s, slots) for s in stmts)
+        if len(compiled) == 1:
+            return compiled[0]
+        def block(frame):
+            for stmt in compiled:
+                if stmt(frame):
+                    return True
+        return block
+
+    def compile_stmt(self, stmt, slots):
+        """slots: 함수 안이면 {지역 이름: 슬롯}, 모듈 수준이면 None"""
+        if isinstance(stmt, Assign):
+            value = self.compile_expr(stmt.expr, slots)
+            if slots is not None:
+                slot = slots[stmt.name]
+                def assign_fast(frame):
+                    frame[slot] = value(frame)
+                return assign_fast
+            g, name = self.globals, stmt.name
+            def assign_global(frame):
+                g[name] = value(frame)
+            return assign_global
+        if isinstance(stmt, Print):
+            value = self.compile_expr(stmt.expr, slots)
+            engine = self
+            def print_stmt(frame):
+                print(f"OUTPUT: {value(frame)}")
+                engine.printed += 1
+            return print_stmt
+        if isinstance(stmt, Return):
+            if slots is not None and isinstance(stmt.value, FuncCall):
+                # 꼬리 호출: callee 프레임을 만들어 TailCall로 돌려주고 실행은 호출한 쪽 trampoline이 함
+                tail_call = self.compile_call(stmt.value, slots, tail=True)
+                def tail_return(frame):
+                    frame[-1] = tail_call(frame)
+                    return True
+                return tail_return
+            value = self.compile_expr(stmt.value, slots)
+            def return_stmt(frame):
+                frame[-1] = value(frame)
+                return True
+            return return_stmt
+        if isinstance(stmt, If):
+            cond = self.compile_expr(stmt.cond, slots)
+            then_block = self.compile_block(stmt.then_block, slots)
+            else_block = self.compile_block(stmt.else_block or [], slots)
+            def if_stmt(frame):
+                if cond(frame):
+                    return then_block(frame)
+                return else_block(frame)
+            return if_stmt
+        if isinstance(stmt, While):
+            cond = self.compile_expr(stmt.cond, slots)
+            body = self.compile_block(stmt.body, slots)
+            def while_stmt(frame):
+                while cond(frame):
+                    if body(frame):
+                        return True
+            return while_stmt
+        if isinstance(stmt, FuncDef):
+            names = function_locals(stmt)
+            func = Function(stmt.name, stmt.params, len(names) + 1,
+                            self.compile_block(stmt.body, {name: i for i, name in enumerate(names)}))
+            functions = self.functions
+            def def_func(frame):
+                functions[func.name] = func
+            return def_func
+        raise NotImplementedError(f"Unknown statement: {stmt}")
+
+    def compile_expr(self, node, slots):
+        if isinstance(node, Number):
+            value = node.value
+            return lambda frame: value
+        if isinstance(node, Var):
+            name = node.name
+            if slots is not None and name in slots:
+                slot = slots[name]
+                def load_fast(frame):
+                    value = frame[slot]
+                    if value is UNBOUND:
+                        raise RuntimeError(f"Undefined variable: {name}")
+                    return value
+                return load_fast
+            g = self.globals
+            def load_global(frame):
+                try:
+                    return g[name]
+                except KeyError:
+                    raise RuntimeError(f"Undefined variable: {name}") from None
+            return load_global
+        if isinstance(node, BinOp):
+            return self.compile_binop(node, slots)
+        if isinstance(node, FuncCall):
+            return self.compile_call(node, slots)
+        raise NotImplementedError(f"Unknown expr: {node}")
+
+    def compile_binop(self, node, slots):
+        left = self.compile_expr(node.left, slots)
+        op = node.op
+        # 오른쪽이 상수이면 (i - 1, i * 2) 클로저 호출 하나를 줄임
+        if isinstance(node.right, Number):
+            c = node.right.value
+            if op == '+': return lambda frame: left(frame) + c
+            if op == '-': return lambda frame: left(frame) - c
+            if op == '*': return lambda frame: left(frame) * c
+        else:
+            right = self.compile_expr(node.right, slots)
+            if op == '+': return lambda frame: left(frame) + right(frame)
+            if op == '-': return lambda frame: left(frame) - right(frame)
+            if op == '*': return lambda frame: left(frame) * right(frame)
+        raise NotImplementedError(f"Unknown operator: {op}")
+
+    def compile_call(self, node, slots, tail=False):
+        """tail이면 callee를 실행하지 않고 TailCall을 돌려주는 클로저"""
+        args = tuple(self.compile_expr(a, slots) for a in node.args)
+        name, argc = node.name, len(node.args)
+        functions = self.functions
+        def call(frame):
+            # VM과 같은 순서: 인자를 먼저 계산한 뒤 함수를 찾음
+            new_frame = [a(frame) for a in args]
+            func = functions.get(name)
+            if func is None:
+                raise RuntimeError(f"Undefined function: {name}")
+            if len(func.params) != argc:
+                raise RuntimeError(f"Argument count mismatch in call to {name}. Expected {len(func.params)}, got {argc}")
+            # 나머지 지역 슬롯은 UNBOUND, 마지막 칸은 반환값 (return 없이 끝나면 None)
+            new_frame.extend([UNBOUND] * (func.frame_size - 1 - argc))
+            new_frame.append(None)
+            if tail:
+                return TailCall(func, new_frame)
+            func.body(new_frame)
+            result = new_frame[-1]
+            while type(result) is TailCall:
+                result.func.body(result.frame)
+                result = result.frame[-1]
+            return result
+        return call
+
+def run(stmts):
+    """편의 함수: AST 문장 리스트를 클로저 엔진으로 실행"""
+    ClosureEngine().run(stmts)
@@ -1,10 +1,24 @@
 from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
 
+# === 스코프 규칙 (Scoping rules) ===
+# - 최상위(모듈) 코드의 변수는 전역(global)이며 LOAD_GLOBAL/STORE_GLOBAL로 접근합니다.
+# - 함수 안에서는 파라미터와 바디(if/while 블록 포함)에서 대입되는 이름이 지역 변수입니다.
+#   지역 변수는 컴파일 시점에 슬롯 번호를 받고 LOAD_FAST/STORE_FAST로 접근합니다.
+# - 함수 안에서 대입되지 않는 이름은 전역으로 읽습니다 (LOAD_GLOBAL).
+#   호출한 쪽(caller) 프레임의 변수는 보이지 않습니다.
+# - 함수 안의 def는 실행될 때 DEF_FUNC로 등록만 하고 바디는 건너뜁니다 (closure_engine과 같은 의미).
+# - 모든 경로가 Return으로 끝나지 않는 함수 바디 끝에는 None을 반환하는 코드가 붙습니다.
+# - 함수 안의 return f(...)는 CALL_FUNCTION; RETURN 대신 TAIL_CALL 하나가 됩니다.
+#   VM은 호출한 함수의 프레임을 callee 프레임으로 다시 쓰므로 꼬리 재귀의 프레임 스택이 자라지 않습니다.
+
 class CodeGenerator:
-    def __init__(self):
+    def __init__(self, debug=False, tail_calls=True):
+        self.debug = debug  # True면 컴파일 과정의 바이트코드를 [DEBUG]로 출력
+        self.tail_calls = tail_calls  # False면 함수 안의 return f(...)도 CALL_FUNCTION; RETURN으로 컴파일
         self.code = []
         self.label_id = 0
         self.function_defs = {}  # name -> label
+        self.local_slots = None  # 함수 컴파일 중이면 {지역 변수 이름: 슬롯 번호}, 모듈 수준이면 None
 
     def emit(self, instr, arg=None):
         self.code.append((instr, arg) if arg is not None else (instr,))
@@ -17,11 +31,35 @@ class CodeGenerator:
     def set_label(self, label):
         self.code.append(("LABEL", label))
 
+    def compile_load(self, name):
+        if self.local_slots is not None and name in self.local_slots:
+            self.emit("LOAD_FAST", self.local_slots[name])
+        else:
+            self.emit("LOAD_GLOBAL", name)
+
+    def compile_store(self, name):
+        if self.local_slots is not None:
+            self.emit("STORE_FAST", self.local_slots[name])
+        else:
+            self.emit("STORE_GLOBAL", name)
+
+    def compile_function_body(self, func):
+        """함수 바디를 자신의 지역 슬롯 테이블로 컴파일"""
+        outer_slots = self.local_slots
+        self.local_slots = {name: i for i, name in enumerate(function_locals(func))}
+        for s in func.body:
+            self.compile_stmt(s)
+        # Return 없이 바디 끝에 도달할 수 있으면 None 반환
+        if not always_returns(func.body):
+            self.emit("LOAD_CONST", None)
+            self.emit("RETURN")
+        self.local_slots = outer_slots
+
     def compile_expr(self, node):
         if isinstance(node, Number):
             self.emit("LOAD_CONST", node.value)
         elif isinstance(node, Var):
-            self.emit("LOAD_NAME", node.name)
+            self.compile_load(node.name)
         elif isinstance(node, BinOp):
             self.compile_expr(node.left)
             self.compile_expr(node.right)
@@ -37,7 +75,7 @@ class CodeGenerator:
     def compile_stmt(self, stmt):
         if isinstance(stmt, Assign):
             self.compile_expr(stmt.expr)
-            self.emit("STORE_NAME", stmt.name)
+            self.compile_store(stmt.name)
         elif isinstance(stmt, Print):
             self.compile_expr(stmt.expr)
             self.emit("PRINT")
@@ -66,70 +104,82 @@ class CodeGenerator:
             self.set_label(end_label)
         elif isinstance(stmt, FuncDef):
             func_label = self.new_label()
+            end_label = self.new_label()
             self.function_defs[stmt.name] = (stmt.params, func_label)
-            self.emit("DEF_FUNC", (stmt.name, stmt.params, func_label))
+            self.emit("DEF_FUNC", (stmt.name, stmt.params, func_label, function_locals(stmt)))
+            self.emit("JUMP", end_label)  # 바디는 호출될 때만 실행
             self.set_label(func_label)
-            for s in stmt.body:
-                self.compile_stmt(s)
-            # 함수 바디에 Return이 없으면 None 반환
-            if not has_return(stmt.body):
-                self.emit("LOAD_CONST", None)
-                self.emit("RETURN")
+            self.compile_function_body(stmt)
+            self.set_label(end_label)
         elif isinstance(stmt, Return):
-            self.compile_expr(stmt.value)
+            value = stmt.value
+            if self.tail_calls and self.local_slots is not None and isinstance(value, FuncCall):
+                # 꼬리 위치의 호출: 인자를 계산한 뒤 현재 프레임을 callee에게 넘김
+                for arg in value.args:
+                    self.compile_expr(arg)
+                self.emit("TAIL_CALL", (value.name, len(value.args)))
+                return
+            self.compile_expr(value)
             self.emit("RETURN")
         else:
             raise NotImplementedError(f"Unknown statement: {stmt}")
 
     def compile_program(self, stmts):
-        func_labels = {}
+        func_labels = {}  # 문장 위치 -> 함수 바디 레이블 (같은 이름을 다시 정의해도 바디마다 레이블이 따로)
         # 1. 함수 정의를 먼저 DEF_FUNC로만 등록
-        for stmt in stmts:
+        for i, stmt in enumerate(stmts):
             if isinstance(stmt, FuncDef):
                 func_label = self.new_label()
                 self.function_defs[stmt.name] = (stmt.params, func_label)
-                self.emit("DEF_FUNC", (stmt.name, stmt.params, func_label))
-                func_labels[stmt.name] = func_label
+                self.emit("DEF_FUNC", (stmt.name, stmt.params, func_label, function_locals(stmt)))
+                func_labels[i] = func_label
         # 2. 함수 바디와 나머지 코드 컴파일
-        for stmt in stmts:
+        for i, stmt in enumerate(stmts):
             if isinstance(stmt, FuncDef):
-                func_label = func_labels[stmt.name]
+                func_label = func_labels[i]
                 end_label = self.new_label()
+                func_start = len(self.code)
                 self.emit("JUMP", end_label)  # 메인 흐름에서 함수 바디 건너뛰기
                 self.set_label(func_label)
-                for s in stmt.body:
-                    self.compile_stmt(s)
-                # 함수 바디에 Return이 없으면 None 반환
-                if not has_return(stmt.body):
-                    self.emit("LOAD_CONST", None)
-                    self.emit("RETURN")
+                self.compile_function_body(stmt)
                 self.set_label(end_label)
-                # 함수 바디 컴파일 후 바이트코드 출력
-                print(f"[DEBUG] After compiling function '{stmt.name}':")
-                for i, instr in enumerate(self.code):
-                    print(f"  {i}: {instr}")
+                # 함수 바디 컴파일 후 이번에 추가된 바이트코드만 출력
+                if self.debug:
+                    print(f"[DEBUG] After compiling function '{stmt.name}':")
+                    for i in range(func_start, len(self.code)):
+                        print(f"  {i}: {self.code[i]}")
             else:
                 self.compile_stmt(stmt)
-        # 전체 바이트코드 및 함수 레이블 정보 출력
-        print("[DEBUG] Final bytecode:")
-        for i, instr in enumerate(self.code):
-            print(f"  {i}: {instr}")
-        print("[DEBUG] Function labels:", func_labels)
+        # 전체 바이트코드 및 함수 레이블 정보 출력 (한 번만)
+        if self.debug:
+            print("[DEBUG] Final bytecode:")
+            for i, instr in enumerate(self.code):
+                print(f"  {i}: {instr}")
+            print("[DEBUG] Function labels:", {stmts[i].name: label for i, label in func_labels.items()})
 
-def has_return(stmts):
-    """stmt 리스트(중첩 포함)에 Return이 하나라도 있으면 True"""
-    if isinstance(stmts, Return):
-        return True
-    if isinstance(stmts, list):
-        return any(has_return(s) for s in stmts)
-    # If, While 등 블록문 처리
-    if hasattr(stmts, 'body'):
-        if has_return(stmts.body):
-            return True
-    if hasattr(stmts, 'then_block'):
-        if has_return(stmts.then_block):
+def function_locals(func):
+    """함수의 지역 변수 이름 리스트: 파라미터가 먼저, 그 다음 바디에서 대입되는 이름 (등장 순서)"""
+    names = list(func.params)
+    def collect(stmts):
+        for s in stmts:
+            if isinstance(s, Assign):
+                if s.name not in names:
+                    names.append(s.name)
+            elif isinstance(s, If):
+                collect(s.then_block)
+                if s.else_block:
+                    collect(s.else_block)
+            elif isinstance(s, While):
+                collect(s.body)
+            # 중첩 FuncDef의 바디는 자신의 스코프이므로 제외
+    collect(func.body)
+    return names
+
+def always_returns(stmts):
+    """stmt 리스트의 모든 실행 경로가 Return으로 끝나면 True (if/else는 두 가지 모두, while 바디는 안 돌 수 있으므로 제외)"""
+    for s in stmts:
+        if isinstance(s, Return):
             return True
-    if hasattr(stmts, 'else_block'):
-        if has_return(stmts.else_block):
+        if isinstance(s, If) and s.else_block and always_returns(s.then_block) and always_returns(s.else_block):
             return True
     return False
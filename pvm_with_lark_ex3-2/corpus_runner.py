@@ -0,0 +1,197 @@
+# === 스크립트 묶음(corpus) 병렬 실행 (ProcessPoolExecutor) ===
+# 수만 개의 스크립트를 파서 -> ASTBuilder -> CodeGenerator -> (최적화, 링크) -> VirtualMachine 파이프라인으로 실행합니다.
+#   - worker 프로세스는 시작할 때 (initializer) 파서를 한 번 만들고 모든 스크립트에 재사용합니다 (get_parser).
+#     compile_file을 쓰므로 .pvmc 바이트코드 캐시도 그대로 사용할 수 있습니다 (use_cache).
+#   - 스크립트 하나의 결과는 ScriptResult (상태, 출력, 오류, worker 시간, pid)이며 run()이 generator로 흘려보냅니다.
+#     ordered=True면 입력 순서대로, False면 끝나는 순서대로.
+#   - 한 번에 제출해 둔 스크립트는 window개로 제한하므로 스크립트 목록이 길어도 future가 쌓이지 않습니다.
+#     ordered=True에서는 앞 스크립트가 끝날 때까지 그 뒤에서 먼저 끝난 결과를 보관하므로,
+#     느린 스크립트 하나가 실행되는 동안 끝난 결과는 모두 메모리에 남습니다 (보관 개수는 제한되지 않음).
+# 실패 격리:
+#   - 컴파일 오류(문법 오류 등)와 worker 안의 Python 예외(RecursionError 포함)는 그 스크립트의 "error" 결과가 됩니다.
+#   - VM 실행 오류는 VM이 출력한 "VM Error ..." 줄과 함께 "vm_error", max_instructions를 넘으면 "limit".
+#     max_instructions의 기본값은 MAX_INSTRUCTIONS이므로 끝나지 않는 while 루프가 있어도 corpus 실행은 끝납니다.
+#     (0 또는 None이면 제한 없음)
+#   - worker 프로세스가 죽으면 (BrokenProcessPool) 그때 실행 중이던 스크립트를 하나씩 새 worker에서 다시 실행해
+#     다시 죽는 스크립트만 "crashed"가 되고, 나머지 스크립트는 새 pool에서 계속 실행됩니다.
+# scaling()은 worker 1..N개로 같은 corpus를 실행해 처리량(scripts/s)과 1 worker 대비 배율을 잽니다.
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+STATUSES = ("ok", "vm_error", "limit", "error", "crashed")
+MAX_INSTRUCTIONS = 10_000_000  # 스크립트 하나가 실행할 수 있는 명령어 수 기본값
+
+class ScriptResult:
+    def __init__(self, index, path, status, output="", error=None, elapsed=0.0, pid=None):
+        self.index = index      # 입력 목록에서의 위치
+        self.path = path
+        self.status = status    # STATUSES 중 하나
+        self.output = output    # 스크립트의 stdout (OUTPUT 줄, VM Error 줄)
+        self.error = error      # "error"/"crashed"의 이유
+        self.elapsed = elapsed  # worker 안에서 컴파일 + 실행에 걸린 시간 (초)
+        self.pid = pid          # 실행한 worker 프로세스
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def lines(self):
+        return self.output.splitlines()
+
+    def __repr__(self): return f"ScriptResult({self.index}, {self.path!r}, {self.status})"
+
+# === worker 프로세스 ===
+
+_worker_options = {}
+
+def init_worker(options):
+    """ProcessPoolExecutor initializer: 실행 옵션을 저장하고 파서를 한 번 만듦"""
+    _worker_options.update(options)
+    from pvm_with_lark import get_parser
+    get_parser()
+
+def run_script(index, path):
+    """worker에서 스크립트 하나를 컴파일/실행. 예외는 모두 결과로 바꿈 (다른 스크립트에 영향 없음)"""
+    from pvm_with_lark import compile_file
+    from vm import VirtualMachine
+    options = _worker_options
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            code, _ = compile_file(path, use_cache=options.get("use_cache", False), cache_dir=options.get("cache_dir"),
+                                   opt_level=options.get("opt_level", 0))
+            vm = VirtualMachine()
+            limit = options.get("max_instructions")
+            if not limit:
+                vm.run(code)
+            else:
+                vm.start(code)
+                vm.run_steps(limit)
+        status = "vm_error" if vm.error is not None else "limit" if vm.frames else "ok"
+        error = f"stopped after {limit} instructions" if status == "limit" else None
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+    return ScriptResult(index, path, status, buffer.getvalue(), error, time.perf_counter() - start, os.getpid())
+
+# === 실행 ===
+
+class CorpusRunner:
+    def __init__(self, workers=None, opt_level=0, use_cache=False, cache_dir=None, max_instructions=MAX_INSTRUCTIONS,
+                 window=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.options = {"opt_level": opt_level, "use_cache": use_cache, "cache_dir": cache_dir,
+                        "max_instructions": max_instructions}
+        self.window = window or self.workers * 4  # 동시에 제출해 둔 스크립트 수
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.pool_restarts = 0
+        self.elapsed = 0.0
+
+    def new_pool(self, workers=None):
+        return ProcessPoolExecutor(max_workers=workers or self.workers, initializer=init_worker,
+                                   initargs=(self.options,))
+
+    def run(self, paths, ordered=True):
+        """스크립트 경로들을 실행하며 ScriptResult를 하나씩 돌려주는 generator"""
+        start = time.perf_counter()
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.pool_restarts = 0
+        results = self.run_unordered(paths)
+        try:
+            if not ordered:
+                for result in results:
+                    self.counts[result.status] += 1
+                    yield result
+                return
+            waiting, next_index = {}, 0
+            for result in results:
+                waiting[result.index] = result
+                while next_index in waiting:
+                    result = waiting.pop(next_index)
+                    self.counts[result.status] += 1
+                    yield result
+                    next_index += 1
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def run_unordered(self, paths):
+        jobs = iter(enumerate(paths))
+        in_flight = {}  # future -> (index, path)
+        pool = self.new_pool()
+        try:
+            while True:
+                for job in jobs:
+                    in_flight[pool.submit(run_script, *job)] = job
+                    if len(in_flight) >= self.window:
+                        break
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = []
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        broken.append(job)
+                if broken:
+                    # pool 전체가 멈췄으므로 아직 결과가 없는 스크립트를 모두 하나씩 다시 실행하고 새 pool로 계속
+                    for future, job in in_flight.items():
+                        try:
+                            yield future.result()
+                        except BrokenProcessPool:
+                            broken.append(job)
+                    in_flight.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    for job in sorted(broken):
+                        yield self.run_isolated(job)
+                    self.pool_restarts += 1
+                    pool = self.new_pool()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def run_isolated(self, job):
+        """worker 하나짜리 pool에서 스크립트 하나만 실행 (그래도 worker가 죽으면 그 스크립트의 crashed 결과)"""
+        with self.new_pool(1) as pool:
+            try:
+                return pool.submit(run_script, *job).result()
+            except BrokenProcessPool:
+                return ScriptResult(job[0], job[1], "crashed", error="worker process died while running this script")
+
+    def stats(self):
+        total = sum(self.counts.values())
+        return dict(self.counts, scripts=total, workers=self.workers, elapsed=self.elapsed,
+                    throughput=total / self.elapsed if self.elapsed else 0.0, pool_restarts=self.pool_restarts)
+
+def scaling(paths, max_workers=None, **options):
+    """worker 1..max_workers개로 paths 전체를 실행한 [(workers, 걸린 시간, scripts/s, 1 worker 대비 배율)]"""
+    max_workers = max_workers or os.cpu_count() or 1
+    rows = []
+    for workers in range(1, max_workers + 1):
+        runner = CorpusRunner(workers=workers, **options)
+        for _ in runner.run(paths, ordered=False):
+            pass
+        stats = runner.stats()
+        rows.append((workers, stats["elapsed"], stats["throughput"], stats["throughput"] / rows[0][2] if rows else 1.0))
+    return rows
+
+def collect_scripts(paths):
+    """파일은 그대로, 디렉터리는 그 아래의 *.pvm (이름순)"""
+    scripts = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != "__pvmcache__")
+                scripts.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(".pvm"))
+        else:
+            scripts.append(path)
+    return scripts
+
+def run(paths, workers=None, opt_level=0):
+    """편의 함수: 스크립트들을 병렬로 실행한 ScriptResult 리스트 (입력 순서)"""
+    return list(CorpusRunner(workers=workers, opt_level=opt_level).run(paths))
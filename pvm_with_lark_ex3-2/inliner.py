@@ -0,0 +1,307 @@
+# === 작은 함수 인라이닝 (AST, -O 1) ===
+# optimizer.Optimizer 전에 실행되어, 작은 함수의 FuncCall을 그 함수 바디로 바꿉니다.
+#   c = add(a, b)  ->  _inl0_x = a
+#                      _inl1_y = b
+#                      _inl2_result = _inl0_x + _inl1_y
+#                      print(_inl2_result)
+#                      c = _inl2_result          (Return 식이 호출 자리의 값)
+# 인라인 대상 함수:
+#   - 최상위 def이고 프로그램 전체에서 그 이름의 def가 하나뿐 (최상위 DEF_FUNC는 메인 코드보다 먼저 등록되므로
+#     어느 호출 지점에서나 같은 함수가 불림)
+#   - 바디가 Assign/Print 문장들 뒤에 Return 하나로 끝나는 직선 코드이고, 지역 변수를 대입 전에 읽지 않음
+#   - 노드 수가 max_size 이하이고, 호출 그래프에서 자기 자신에게 돌아오지 않음 (재귀/상호 재귀 제외)
+# 호출 지점 조건: 인자 수가 파라미터 수와 같고 (다르면 원래처럼 실행 중 오류), 호출하는 함수의 지역 변수가
+# 인라인되는 바디가 읽는 전역 변수 이름을 가리지 않아야 합니다. while 조건 안의 호출은 매 반복 다시 계산되므로 제외합니다.
+# 평가 순서 보존: 인라인된 바디는 그 문장 앞으로 나가므로, 식에서 그 호출보다 먼저 계산되는 부분식은
+# 임시 변수에 먼저 담습니다 (예: print(x + add(1, 2))에서 x가 정의되지 않았으면 add의 print보다 오류가 먼저).
+# 파라미터와 지역 변수는 호출 지점마다 프로그램에 없는 새 이름을 받고, 함수 안에서는 호출한 함수의 지역 변수가 됩니다.
+# 모듈 수준에서는 새 이름이 전역 변수(전역 슬롯)가 되어 남으므로 임시 변수를 만들지 않고, 바디가 Return 하나이며
+# 인자가 상수/변수이고 바디가 다른 이름이나 호출보다 인자 변수를 먼저, 인자 순서대로 읽을 때만 인자를 바디 식에 바로 넣습니다.
+#   c = inc(c)  ->  c = c + 1      (Undefined variable 오류의 순서도 호출할 때와 같음, 아니면 호출을 그대로 둠)
+# 전체 증가량(인라인된 노드 수 합)이 budget을 넘으면 더 인라인하지 않습니다.
+
+from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
+from code_gen import function_locals
+from optimizer import collect_names, expr_names
+
+INLINE_MAX_SIZE = 24  # 인라인할 함수의 최대 AST 노드 수
+INLINE_BUDGET = 2000  # 프로그램 전체에서 인라인으로 늘어날 수 있는 노드 수
+
+class Inliner:
+    def __init__(self, max_size=INLINE_MAX_SIZE, budget=INLINE_BUDGET):
+        self.max_size = max_size
+        self.budget = budget
+        self.inlined = 0      # 인라인된 호출 지점 수
+        self.by_name = {}     # 함수 이름 -> 인라인된 호출 지점 수
+        self.growth = 0       # 인라인으로 늘어난 노드 수
+        self.skipped = 0      # 대상 함수지만 budget/이름 충돌로 남긴 호출 지점 수
+        self.candidates = {}  # 인라인할 수 있는 함수 이름 -> FuncDef
+        self.used = set()     # 프로그램에 나오는 이름 + 만든 임시 이름
+        self.temps = set()    # 만든 임시 이름 (읽어도 실패하지 않고 다른 코드가 바꾸지 않음)
+        self.temp_id = 0
+
+    def optimize_program(self, stmts):
+        self.used = set()
+        collect_names(stmts, self.used)
+        self.candidates = self.find_candidates(stmts)
+        if not self.candidates:
+            return stmts
+        return self.inline_block(stmts, None)
+
+    # === 대상 함수 ===
+
+    def find_candidates(self, stmts):
+        defs = {}
+        collect_defs(stmts, defs)
+        graph = {name: set().union(*(called_names(f.body) for f in funcs)) for name, funcs in defs.items()}
+        candidates = {}
+        for stmt in stmts:
+            if (isinstance(stmt, FuncDef) and len(defs[stmt.name]) == 1 and is_straight_line(stmt)
+                    and node_count(stmt.body) <= self.max_size and not reaches(graph, stmt.name, stmt.name)):
+                candidates[stmt.name] = stmt
+        return candidates
+
+    # === 문장 / 식 ===
+
+    def inline_block(self, stmts, scope_locals):
+        """scope_locals: 함수 안이면 그 함수의 지역 변수 이름 집합, 모듈 수준이면 None"""
+        result = []
+        for stmt in stmts:
+            result.extend(self.inline_stmt(stmt, scope_locals))
+        return result
+
+    def inline_stmt(self, stmt, scope_locals):
+        pre = []  # 이 문장 앞에 나갈 인라인된 문장들
+        if isinstance(stmt, Assign):
+            stmt = Assign(stmt.name, self.inline_expr(stmt.expr, pre, scope_locals))
+        elif isinstance(stmt, Print):
+            stmt = Print(self.inline_expr(stmt.expr, pre, scope_locals))
+        elif isinstance(stmt, Return):
+            stmt = Return(self.inline_expr(stmt.value, pre, scope_locals))
+        elif isinstance(stmt, If):
+            stmt = If(self.inline_expr(stmt.cond, pre, scope_locals), self.inline_block(stmt.then_block, scope_locals),
+                      self.inline_block(stmt.else_block, scope_locals) if stmt.else_block else None)
+        elif isinstance(stmt, While):
+            stmt = While(stmt.cond, self.inline_block(stmt.body, scope_locals))
+        elif isinstance(stmt, FuncDef):
+            stmt = FuncDef(stmt.name, stmt.params, self.inline_block(stmt.body, set(function_locals(stmt))))
+        return pre + [stmt]
+
+    def inline_expr(self, node, pre, scope_locals):
+        if isinstance(node, BinOp):
+            operands = self.inline_operands([node.left, node.right], pre, scope_locals)
+            return BinOp(operands[0], node.op, operands[1])
+        if isinstance(node, FuncCall):
+            args = self.inline_operands(node.args, pre, scope_locals)
+            value = self.inline_call(node.name, args, pre, scope_locals)
+            return value if value is not None else FuncCall(node.name, args)
+        return node
+
+    def inline_operands(self, nodes, pre, scope_locals):
+        """왼쪽부터 인라인. 뒤 피연산자가 문장을 앞으로 냈으면 그 전에 계산되어야 하는 앞 피연산자를 임시 변수에 담음"""
+        result = []
+        for node in nodes:
+            mark = len(pre)
+            value = self.inline_expr(node, pre, scope_locals)
+            if len(pre) > mark:
+                captured = []
+                for i, earlier in enumerate(result):
+                    if not isinstance(earlier, Number) and not (isinstance(earlier, Var) and earlier.name in self.temps):
+                        temp = self.new_temp("_inl", "tmp")
+                        captured.append(Assign(temp, earlier))
+                        result[i] = Var(temp)
+                pre[mark:mark] = captured
+            result.append(value)
+        return result
+
+    def inline_call(self, name, args, pre, scope_locals):
+        """인라인했으면 호출 자리에 들어갈 식, 아니면 None"""
+        func = self.candidates.get(name)
+        if func is None or len(args) != len(func.params):
+            return None
+        local_names = function_locals(func)
+        size = node_count(func.body)
+        global_reads = body_names(func.body) - set(local_names)
+        if scope_locals is None:
+            inlinable = can_substitute(func, args)
+        else:
+            inlinable = not global_reads & scope_locals
+        if self.growth + size > self.budget or not inlinable:
+            self.skipped += 1
+            return None
+        self.growth += size
+        self.inlined += 1
+        self.by_name[name] = self.by_name.get(name, 0) + 1
+        if scope_locals is None:
+            value = substitute_expr(func.body[-1].value, dict(zip(func.params, args)))
+            return self.inline_expr(value, pre, scope_locals)
+        rename = {local: self.new_temp("_inl", local) for local in local_names}
+        for param, arg in zip(func.params, args):
+            pre.append(Assign(rename[param], arg))
+        for s in func.body[:-1]:
+            # 바디 안의 호출도 인라인 (대상 함수는 재귀하지 않으므로 끝남)
+            pre.extend(self.inline_stmt(rename_stmt(s, rename), scope_locals))
+        return self.inline_expr(rename_expr(func.body[-1].value, rename), pre, scope_locals)
+
+    def new_temp(self, prefix, name):
+        while True:
+            temp = f"{prefix}{self.temp_id}_{name}"
+            self.temp_id += 1
+            if temp not in self.used:
+                self.used.add(temp)
+                self.temps.add(temp)
+                return temp
+
+    def stats(self):
+        return {"inlined": self.inlined, "by_name": dict(self.by_name), "growth": self.growth,
+                "skipped": self.skipped, "candidates": sorted(self.candidates)}
+
+def collect_defs(stmts, defs):
+    """이름 -> 그 이름의 FuncDef 목록 (중첩 def 포함)"""
+    for s in stmts:
+        if isinstance(s, FuncDef):
+            defs.setdefault(s.name, []).append(s)
+            collect_defs(s.body, defs)
+        elif isinstance(s, If):
+            collect_defs(s.then_block, defs)
+            collect_defs(s.else_block or [], defs)
+        elif isinstance(s, While):
+            collect_defs(s.body, defs)
+
+def called_names(stmts):
+    """문장 리스트(중첩 def 바디 제외)에서 호출하는 함수 이름"""
+    names = set()
+    def visit(node):
+        if isinstance(node, FuncCall):
+            names.add(node.name)
+            for a in node.args:
+                visit(a)
+        elif isinstance(node, BinOp):
+            visit(node.left)
+            visit(node.right)
+    for s in stmts:
+        if isinstance(s, (Assign, Print)):
+            visit(s.expr)
+        elif isinstance(s, Return):
+            visit(s.value)
+        elif isinstance(s, If):
+            visit(s.cond)
+            names |= called_names(s.then_block) | called_names(s.else_block or [])
+        elif isinstance(s, While):
+            visit(s.cond)
+            names |= called_names(s.body)
+    return names
+
+def reaches(graph, start, target):
+    """호출 그래프에서 start가 호출하는 함수를 따라가 target에 닿으면 True"""
+    seen = set()
+    work = list(graph.get(start, ()))
+    while work:
+        name = work.pop()
+        if name == target:
+            return True
+        if name not in seen:
+            seen.add(name)
+            work.extend(graph.get(name, ()))
+    return False
+
+def is_straight_line(func):
+    """Assign/Print 뒤에 Return 하나로 끝나고, 지역 변수를 대입 전에 읽지 않는 바디"""
+    body = func.body
+    if not body or not isinstance(body[-1], Return):
+        return False
+    if not all(isinstance(s, (Assign, Print)) for s in body[:-1]):
+        return False
+    local_names = set(function_locals(func))
+    defined = set(func.params)
+    for s in body:
+        reads = expr_names(s.value if isinstance(s, Return) else s.expr) & local_names
+        if not reads <= defined:
+            return False
+        if isinstance(s, Assign):
+            defined.add(s.name)
+    return True
+
+def body_names(stmts):
+    """직선 바디에서 읽는 이름"""
+    names = set()
+    for s in stmts:
+        names |= expr_names(s.value if isinstance(s, Return) else s.expr)
+    return names
+
+def can_substitute(func, args):
+    """
+    모듈 수준 호출을 임시 변수 없이 인자를 바디 식에 넣어 바꿀 수 있으면 True.
+    바디가 Return 하나이고 인자가 Number/Var이며, 바디 식을 계산 순서로 따라갈 때 다른 이름을 읽거나 호출하기 전에
+    Var 인자를 모두 인자 순서대로 읽어야 함 (호출할 때처럼 정의되지 않은 인자의 오류가 먼저 남)
+    """
+    if len(func.body) != 1 or not all(isinstance(a, (Number, Var)) for a in args):
+        return False
+    values = dict(zip(func.params, args))
+    expected = list(dict.fromkeys(a.name for a in args if isinstance(a, Var)))
+    read = []
+    for leaf in evaluation_order(func.body[0].value):
+        value = values.get(leaf.name) if isinstance(leaf, Var) else None
+        if value is None:
+            break
+        if isinstance(value, Var) and value.name not in read:
+            read.append(value.name)
+    return read == expected
+
+def evaluation_order(node):
+    """식에서 Var를 읽고 FuncCall을 호출하는 순서 (호출은 인자 다음)"""
+    if isinstance(node, Var):
+        return [node]
+    if isinstance(node, BinOp):
+        return evaluation_order(node.left) + evaluation_order(node.right)
+    if isinstance(node, FuncCall):
+        return [leaf for a in node.args for leaf in evaluation_order(a)] + [node]
+    return []
+
+def node_count(node):
+    """AST 노드 수 (인라인 크기 기준)"""
+    if isinstance(node, list):
+        return sum(node_count(s) for s in node)
+    if isinstance(node, BinOp):
+        return 1 + node_count(node.left) + node_count(node.right)
+    if isinstance(node, FuncCall):
+        return 1 + sum(node_count(a) for a in node.args)
+    if isinstance(node, (Assign, Print)):
+        return 1 + node_count(node.expr)
+    if isinstance(node, Return):
+        return 1 + node_count(node.value)
+    if isinstance(node, If):
+        return 1 + node_count(node.cond) + node_count(node.then_block) + node_count(node.else_block or [])
+    if isinstance(node, While):
+        return 1 + node_count(node.cond) + node_count(node.body)
+    if isinstance(node, FuncDef):
+        return 1 + node_count(node.body)
+    return 1
+
+def rename_expr(node, rename):
+    if isinstance(node, Var):
+        return Var(rename.get(node.name, node.name))
+    if isinstance(node, BinOp):
+        return BinOp(rename_expr(node.left, rename), node.op, rename_expr(node.right, rename))
+    if isinstance(node, FuncCall):
+        return FuncCall(node.name, [rename_expr(a, rename) for a in node.args])
+    return node
+
+def substitute_expr(node, values):
+    """파라미터 이름 Var를 인자 식으로 바꾼 식"""
+    if isinstance(node, Var):
+        return values.get(node.name, node)
+    if isinstance(node, BinOp):
+        return BinOp(substitute_expr(node.left, values), node.op, substitute_expr(node.right, values))
+    if isinstance(node, FuncCall):
+        return FuncCall(node.name, [substitute_expr(a, values) for a in node.args])
+    return node
+
+def rename_stmt(stmt, rename):
+    if isinstance(stmt, Assign):
+        return Assign(rename.get(stmt.name, stmt.name), rename_expr(stmt.expr, rename))
+    return Print(rename_expr(stmt.expr, rename))
+
+def inline(stmts):
+    """편의 함수: AST 문장 리스트 -> 작은 함수 호출이 인라인된 AST 문장 리스트"""
+    return Inliner().optimize_program(stmts)
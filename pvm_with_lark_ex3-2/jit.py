@@ -0,0 +1,272 @@
+# === 트레이싱 JIT (hot while 루프) ===
+# while 루프는 CodeGenerator에서 루프 머리(start_label)로 돌아가는 backward JUMP로 끝납니다.
+#   1. table 엔진의 JUMP handler가 backward JUMP 횟수를 루프 머리 PC별로 셉니다.
+#   2. threshold에 도달하면 handler 테이블을 기록용 테이블로 바꿔서 한 바퀴의 실행 경로(트레이스)를 기록합니다.
+#      이때 변수에서 읽은 값의 타입과 JUMP_IF_FALSE의 방향도 함께 기록합니다.
+#   3. 트레이스를 int로 특화된 Python 함수로 컴파일합니다 (while True: 한 바퀴 ...).
+#      - 변수에서 읽은 값마다 타입 가드 (type(v) is int), 분기마다 기록된 방향 가드
+#      - 가드가 실패하면 그 명령어의 PC와 그때의 피연산자 스택을 frame에 되돌려 놓고 인터프리터로 돌아감
+#   4. 이후 backward JUMP가 그 루프 머리로 가면 인터프리터 대신 컴파일된 함수를 호출합니다.
+#
+# 트레이스에 CALL_FUNCTION/TAIL_CALL/RETURN/DEF_FUNC/LOAD_NAME/STORE_NAME이 있거나, 다른 루프로의 backward JUMP가 있거나,
+# int가 아닌 값이 관찰되면 기록을 중단하고 그 루프는 다시 시도하지 않습니다 (blacklist).
+# 훅이 붙은 실행(run_table_traced)에서는 JIT을 사용하지 않습니다 (트레이서는 모든 명령어를 봐야 함).
+
+from linker import FUSED_OPERANDS
+from opcodes import (OPNAMES, SUPERINSTRUCTIONS, QUICKENED, LOAD_CONST, LOAD_FAST, STORE_FAST, LOAD_GLOBAL, STORE_GLOBAL,
+                     DUP_TOP, BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT, JUMP_IF_FALSE, JUMP)
+
+TRACEABLE = (LOAD_CONST, LOAD_FAST, STORE_FAST, LOAD_GLOBAL, STORE_GLOBAL, DUP_TOP,
+             BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT, JUMP_IF_FALSE, JUMP)
+BINARY_SYMBOLS = {BINARY_ADD: "+", BINARY_SUB: "-", BINARY_MUL: "*"}
+# quickening으로 특화된 opcode -> 원래 opcode (트레이스에는 원래 의미로 기록)
+QUICKENED_BASE = {OPNAMES.index(name): OPNAMES.index(base) for name, base in QUICKENED.items()}
+
+class TraceAbort(Exception):
+    """이 루프는 트레이스로 만들 수 없음"""
+
+class Trace:
+    def __init__(self, head, back_pc, source, func):
+        self.head = head        # 루프 머리 PC (backward JUMP 대상)
+        self.back_pc = back_pc  # 트레이스를 닫는 backward JUMP의 PC
+        self.source = source    # 생성된 Python 소스 (디버깅용)
+        self.func = func        # func(vm, frame) -> (실행한 바퀴 수, 가드 실패 여부)
+        self.entries = 0        # 트레이스 진입 횟수
+        self.iterations = 0     # 트레이스 안에서 끝까지 실행된 바퀴 수 (hit)
+        self.loop_exits = 0     # 루프 조건이 거짓이 되어 정상적으로 빠져나간 횟수
+        self.guard_misses = 0   # 타입/분기 가드 실패로 인터프리터로 돌아간 횟수 (miss)
+
+    def enter(self, vm, frame):
+        self.entries += 1
+        n, miss = self.func(vm, frame)
+        self.iterations += n
+        if miss:
+            self.guard_misses += 1
+        else:
+            self.loop_exits += 1
+
+class TraceJIT:
+    def __init__(self, threshold=50, max_length=500):
+        self.threshold = threshold    # 루프 머리로의 backward JUMP가 이만큼 실행되면 기록 시작
+        self.max_length = max_length  # 트레이스 최대 명령어 수
+        self.reset()
+
+    def reset(self):
+        self.traces = {}      # 루프 머리 PC -> Trace
+        self.counters = {}    # 루프 머리 PC -> backward JUMP 횟수
+        self.blacklist = set()
+        self.aborted = 0      # 기록을 중단한 루프 수
+        self.recording = None
+
+    def stats(self):
+        traces = self.traces.values()
+        return {
+            "traces": len(self.traces),
+            "aborted": self.aborted,
+            "entries": sum(t.entries for t in traces),
+            "hits": sum(t.iterations for t in traces),
+            "loop_exits": sum(t.loop_exits for t in traces),
+            "misses": sum(t.guard_misses for t in traces),
+        }
+
+    # === VM 연결 ===
+
+    def attach(self, vm, handlers=None):
+        """
+        handlers(기본값 vm.handlers, quickening이면 적응형 테이블) 복사본에서
+        JUMP를 카운팅 handler로 바꿔서 돌려줌 (run_table이 이 테이블로 실행)
+        """
+        self.reset()
+        self.vm = vm
+        self.code = vm.code
+        table = list(handlers if handlers is not None else vm.handlers)
+        jump = table[JUMP]
+        traces, counters, blacklist = self.traces, self.counters, self.blacklist
+
+        def jit_jump(frame, arg):
+            backward = arg < frame.pc
+            jump(frame, arg)
+            if not backward:
+                return
+            trace = traces.get(arg)
+            if trace is not None:
+                trace.enter(vm, frame)
+            elif arg not in blacklist:
+                count = counters.get(arg, 0) + 1
+                counters[arg] = count
+                if count >= self.threshold and self.recording is None:
+                    self.start_recording(frame, arg)
+
+        table[JUMP] = jit_jump
+        self.table = table
+        self.plain_table = list(table)
+        return table
+
+    # === 기록 ===
+
+    def start_recording(self, frame, head):
+        self.recording = (frame, head, [])
+        table = self.table
+        for op, handler in enumerate(self.plain_table):
+            table[op] = self.recording_handler(op, handler)
+
+    def stop_recording(self):
+        self.recording = None
+        self.table[:] = self.plain_table
+
+    def recording_handler(self, op, handler):
+        def record(frame, arg):
+            if self.recording is not None:
+                try:
+                    self.record(frame, op, arg)
+                except TraceAbort:
+                    head = self.recording[1]
+                    self.stop_recording()
+                    self.blacklist.add(head)
+                    self.aborted += 1
+            handler(frame, arg)
+        return record
+
+    def record(self, frame, op, arg):
+        rec_frame, head, trace = self.recording
+        pc = frame.pc - 1
+        if frame is not rec_frame:
+            raise TraceAbort("frame changed")
+        components = self.decode(op, arg)
+        for part, _ in components:
+            if part not in TRACEABLE:
+                raise TraceAbort(f"{OPNAMES[part]} in loop")
+        observed = self.observe(frame, components)
+        trace.append((pc, components, observed))
+        if len(trace) > self.max_length:
+            raise TraceAbort("trace too long")
+        if op == JUMP and arg < frame.pc:
+            if arg != head:
+                raise TraceAbort("inner loop")
+            self.stop_recording()
+            self.traces[head] = self.compile(head, pc, trace)
+
+    def decode(self, op, arg):
+        """명령어 -> [(구성 opcode, 정수 피연산자 또는 None)] (superinstruction은 풀고, 특화된 opcode는 원래대로)"""
+        op = QUICKENED_BASE.get(op, op)
+        if op not in FUSED_OPERANDS:
+            return [(op, arg)]
+        fields = iter(self.code.fused[arg])
+        components = []
+        for name in SUPERINSTRUCTIONS[OPNAMES[op]]:
+            part = OPNAMES.index(name)
+            components.append((part, next(fields) if part in FUSED_OPERANDS[op] else None))
+        return components
+
+    def observe(self, frame, components):
+        """
+        실행 직전 관찰: 변수에서 읽는 값들의 타입과 JUMP_IF_FALSE가 점프하는지.
+        int가 아닌 값(None, UNBOUND 등)은 특화하지 않으므로 기록을 중단합니다.
+        """
+        observed = []
+        pending = []  # 이 명령어 안에서 앞 구성 명령어가 push한 값
+        for part, operand in components:
+            if part in (LOAD_FAST, LOAD_GLOBAL):
+                value = frame.locals[operand] if part == LOAD_FAST else self.vm.global_slots[operand]
+                if type(value) is not int:
+                    raise TraceAbort(f"non-int value {value!r}")
+                pending.append(value)
+            elif part == LOAD_CONST:
+                value = self.code.consts[operand]
+                if type(value) is not int:
+                    raise TraceAbort(f"non-int constant {value!r}")
+                pending.append(value)
+            elif part == JUMP_IF_FALSE:
+                cond = pending[-1] if pending else frame.stack[-1]
+                observed.append(not cond)  # True면 점프함
+            elif part in BINARY_SYMBOLS:
+                pending[-2:] = [None]  # 값은 필요 없음 (JUMP_IF_FALSE는 BINARY 뒤에 합쳐지지 않음)
+        return observed
+
+    # === 컴파일 ===
+
+    def compile(self, head, back_pc, trace):
+        compiler = TraceCompiler(self.code, head, back_pc)
+        source = compiler.compile(trace)
+        namespace = {}
+        exec(compile(source, f"<trace {head}>", "exec"), namespace)
+        return Trace(head, back_pc, source, namespace[f"trace_{head}"])
+
+class TraceCompiler:
+    """기록된 트레이스 -> Python 함수 소스"""
+    def __init__(self, code, head, back_pc):
+        self.code = code
+        self.head = head
+        self.back_pc = back_pc
+        self.lines = []
+        self.temp_id = 0
+
+    def new_temp(self):
+        name = f"t{self.temp_id}"
+        self.temp_id += 1
+        return name
+
+    def emit(self, line):
+        self.lines.append("        " + line)
+
+    def emit_exit(self, pc, stack, miss):
+        """가드 실패 시: 피연산자 스택과 PC를 인터프리터 상태로 되돌리고 반환"""
+        self.emit(f"    frame.pc = {pc}")
+        if stack:
+            self.emit(f"    frame.stack += ({', '.join(stack)},)")
+        self.emit(f"    return n, {miss}")
+
+    def compile(self, trace):
+        stack = []     # 심볼릭 피연산자 스택 (임시 변수 이름 또는 리터럴)
+        known = set()  # 이번 바퀴에서 int임이 확인된 변수 (('L', slot) / ('G', index))
+        for pc, components, observed in trace:
+            entry_stack = list(stack)  # 타입 가드 실패 시 이 명령어를 처음부터 다시 실행
+            jumps = iter(observed)
+            for part, operand in components:
+                if part == LOAD_CONST:
+                    stack.append(repr(self.code.consts[operand]))
+                elif part in (LOAD_FAST, LOAD_GLOBAL):
+                    key = ("L" if part == LOAD_FAST else "G", operand)
+                    temp = self.new_temp()
+                    self.emit(f"{temp} = {key[0]}[{operand}]")
+                    if key not in known:
+                        self.emit(f"if type({temp}) is not int:")
+                        self.emit_exit(pc, entry_stack, True)
+                        known.add(key)
+                    stack.append(temp)
+                elif part in (STORE_FAST, STORE_GLOBAL):
+                    target = "L" if part == STORE_FAST else "G"
+                    self.emit(f"{target}[{operand}] = {stack.pop()}")
+                    known.add((target, operand))  # 트레이스 안의 값은 모두 int
+                elif part == DUP_TOP:
+                    stack.append(stack[-1])
+                elif part in BINARY_SYMBOLS:
+                    b = stack.pop()
+                    a = stack.pop()
+                    temp = self.new_temp()
+                    self.emit(f"{temp} = {a} {BINARY_SYMBOLS[part]} {b}")
+                    stack.append(temp)
+                elif part == PRINT:
+                    self.emit(f"print(f\"OUTPUT: {{{stack.pop()}}}\")")
+                elif part == JUMP_IF_FALSE:
+                    cond = stack.pop()
+                    if next(jumps):
+                        # 기록 때는 점프함: 참이면 fall-through로 이탈
+                        self.emit(f"if {cond}:")
+                        self.emit_exit(pc + 1, stack, not self.leaves_loop(pc + 1))
+                    else:
+                        self.emit(f"if not {cond}:")
+                        self.emit_exit(operand, stack, not self.leaves_loop(operand))
+                elif part == JUMP:
+                    pass  # 트레이스는 이미 점프 후의 경로를 따라감
+        self.emit("n += 1")
+        header = [f"def trace_{self.head}(vm, frame):",
+                  "    L = frame.locals",
+                  "    G = vm.global_slots",
+                  "    n = 0",
+                  "    while True:"]
+        return "\n".join(header + self.lines) + "\n"
+
+    def leaves_loop(self, target):
+        """target이 루프 바깥이면 True (정상적인 루프 종료)"""
+        return not self.head <= target <= self.back_pc
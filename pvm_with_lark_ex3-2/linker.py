@@ -0,0 +1,221 @@
+# === 링커 (Linker) ===
+# CodeGenerator의 (레이블 포함) 튜플 바이트코드를 최종 CodeObject로 변환합니다.
+# - opcode는 array('B'), 피연산자는 array('i')에 정수로 저장합니다.
+# - 상수/이름은 pvm_with_lark_ex1/byterun.py의 numbers/names 테이블처럼 풀(pool)의 인덱스로 바꿉니다.
+# - 레이블은 링크 시점에 절대 PC로 바뀌므로 VM 루프에서 문자열 작업이 없습니다.
+#
+# 피연산자 의미 (opcode별):
+#   LOAD_CONST                        -> consts 인덱스
+#   LOAD_NAME/STORE_NAME/LOAD_GLOBAL/STORE_GLOBAL -> names 인덱스
+#   LOAD_FAST/STORE_FAST              -> 지역 슬롯 번호
+#   JUMP/JUMP_IF_FALSE                -> 절대 점프 PC
+#   DEF_FUNC                          -> functions 인덱스 (FunctionInfo)
+#   CALL_FUNCTION/TAIL_CALL           -> calls 인덱스 ((함수 이름의 names 인덱스, 인자 수, callee))
+#                                        callee: 그 이름의 DEF_FUNC가 코드 전체에 하나뿐이고 인자 수가 맞으면 그 functions 인덱스, 아니면 -1
+#   superinstruction                  -> fused 인덱스 (구성 명령어별 피연산자를 위 규칙대로 바꾼 정수 튜플)
+#   그 외                             -> 0 (사용하지 않음)
+
+from array import array
+
+from opcodes import (OPCODES, OPNAMES, SUPERINSTRUCTIONS, LOAD_CONST, LOAD_NAME, STORE_NAME, LOAD_FAST,
+                     STORE_FAST, LOAD_GLOBAL, STORE_GLOBAL, JUMP_IF_FALSE, JUMP, DEF_FUNC, CALL_FUNCTION, HALT,
+                     TAIL_CALL)
+
+# 코드 생성/링크 결과나 opcode 번호가 바뀌면 올립니다 (바이트코드 캐시 무효화, bytecode_cache.py)
+COMPILER_VERSION = 8
+
+NAME_OPS = (LOAD_NAME, STORE_NAME, LOAD_GLOBAL, STORE_GLOBAL)
+SLOT_OPS = (LOAD_FAST, STORE_FAST)
+JUMP_OPS = (JUMP, JUMP_IF_FALSE)
+CALL_OPS = (CALL_FUNCTION, TAIL_CALL)
+
+# superinstruction opcode -> 피연산자가 있는 구성 명령어 opcode들 (fused 튜플의 필드 순서)
+FUSED_OPERANDS = {
+    OPCODES[name]: tuple(OPCODES[part] for part in parts
+                         if OPCODES[part] == LOAD_CONST or OPCODES[part] in NAME_OPS + SLOT_OPS + JUMP_OPS)
+    for name, parts in SUPERINSTRUCTIONS.items()
+}
+
+class FunctionInfo:
+    def __init__(self, name, name_index, params, entry, varnames):
+        self.name = name              # 함수 이름
+        self.name_index = name_index  # names 풀에서의 인덱스 (런타임 함수 테이블 키)
+        self.params = params          # 파라미터 이름 리스트
+        self.entry = entry            # 함수 바디 시작 PC
+        self.varnames = varnames      # 지역 슬롯 이름 (파라미터가 앞쪽)
+    def __repr__(self): return f"FunctionInfo({self.name}, {self.params}, entry={self.entry}, locals={self.varnames})"
+
+class CodeObject:
+    def __init__(self, ops, args, consts, names, functions, calls, fused=()):
+        self.ops = ops              # array('B'): opcode 번호, 마지막은 HALT sentinel
+        self.args = args            # array('i'): 정수 피연산자
+        self.consts = consts        # LOAD_CONST 상수 풀
+        self.names = names          # 전역 변수/함수 이름 풀
+        self.functions = functions  # DEF_FUNC 테이블 (FunctionInfo 리스트)
+        self.calls = calls          # CALL_FUNCTION/TAIL_CALL 호출 지점 테이블 ((name_index, argc, callee) 리스트)
+        self.fused = fused          # superinstruction 피연산자 테이블 (정수 튜플 리스트)
+        self.verified = None        # verifier.verify() 결과 (None: 아직 검증 안 함)
+        self.max_stack = {}         # 검증된 코드의 진입 PC(메인 0, 함수 entry) -> 최대 스택 깊이
+        self.verify_error = None    # 검증 실패 이유
+
+    def __len__(self):
+        """HALT sentinel을 제외한 명령어 수"""
+        return len(self.ops) - 1
+
+    def instruction(self, pc):
+        """pc 위치의 명령어를 사람이 읽을 수 있는 (op, arg) 튜플로 복원 (오류 메시지/트레이싱용)"""
+        op = self.ops[pc]
+        arg = self.args[pc]
+        name = OPNAMES[op]
+        if op == LOAD_CONST:
+            value = self.consts[arg]
+            return (name, value) if value is not None else (name,)
+        if op in NAME_OPS:
+            return (name, self.names[arg])
+        if op == DEF_FUNC:
+            f = self.functions[arg]
+            return (name, (f.name, f.params, f.entry, f.varnames))
+        if op in CALL_OPS:
+            name_index, argc, _ = self.calls[arg]
+            return (name, (self.names[name_index], argc))
+        if op in JUMP_OPS or op in SLOT_OPS:
+            return (name, arg)
+        if op in FUSED_OPERANDS:
+            return (name, tuple(self.consts[field] if part == LOAD_CONST else
+                                self.names[field] if part in NAME_OPS else field
+                                for part, field in zip(FUSED_OPERANDS[op], self.fused[arg])))
+        return (name,)
+
+    def jump_target(self, pc):
+        """pc의 명령어가 점프(또는 점프로 끝나는 superinstruction)면 대상 PC, 아니면 None"""
+        op = self.ops[pc]
+        if op in JUMP_OPS:
+            return self.args[pc]
+        parts = FUSED_OPERANDS.get(op)
+        if parts and parts[-1] in JUMP_OPS:
+            return self.fused[self.args[pc]][-1]
+        return None
+
+    def to_tuples(self):
+        """레이블 형식의 튜플 바이트코드로 되돌림 (switch 엔진 등 튜플 기반 도구용)"""
+        targets = {self.jump_target(pc) for pc in range(len(self))}
+        targets.discard(None)
+        targets.update(f.entry for f in self.functions)
+        code = []
+        for pc in range(len(self) + 1):
+            if pc in targets:
+                code.append(("LABEL", f"@{pc}"))
+            if pc == len(self):
+                break
+            instr = self.instruction(pc)
+            op = self.ops[pc]
+            if op in JUMP_OPS:
+                instr = (instr[0], f"@{instr[1]}")
+            elif self.jump_target(pc) is not None:
+                instr = (instr[0], instr[1][:-1] + (f"@{instr[1][-1]}",))
+            elif op == DEF_FUNC:
+                name, params, entry, varnames = instr[1]
+                instr = (instr[0], (name, params, f"@{entry}", varnames))
+            code.append(instr)
+        return code
+
+    def disassemble(self):
+        """PC와 함께 명령어 목록 출력용 문자열 리스트"""
+        lines = []
+        for pc in range(len(self)):
+            op, *rest = self.instruction(pc)
+            operand = f"{self.args[pc]:>4} ({rest[0]!r})" if rest else ""
+            lines.append(f"{pc:4d} {op:15s} {operand}")
+        return lines
+
+def link(code_with_labels):
+    """레이블 포함 튜플 바이트코드 -> CodeObject"""
+    labels = {}
+    body = []
+    for instr in code_with_labels:
+        if instr[0] == "LABEL":
+            labels[instr[1]] = len(body)
+        else:
+            body.append(instr)
+
+    consts, const_index = [], {}
+    names, name_index = [], {}
+    functions = []
+    calls, call_index = [], {}
+    fused, fused_index = [], {}
+
+    def intern_name(name):
+        if name not in name_index:
+            name_index[name] = len(names)
+            names.append(name)
+        return name_index[name]
+
+    def label_pc(label):
+        if label not in labels:
+            raise RuntimeError(f"Undefined label: {label}")
+        return labels[label]
+
+    def encode(op, arg):
+        """상수/이름/슬롯/점프 피연산자 -> 정수"""
+        if op == LOAD_CONST:
+            key = (type(arg), arg)  # 1과 True 같은 값이 섞이지 않도록 타입까지 키로 사용
+            if key not in const_index:
+                const_index[key] = len(consts)
+                consts.append(arg)
+            return const_index[key]
+        if op in NAME_OPS:
+            return intern_name(arg)
+        if op in JUMP_OPS:
+            return label_pc(arg)
+        return arg  # SLOT_OPS
+
+    ops = array('B')
+    args = array('i')
+    for instr in body:
+        opname = instr[0]
+        if opname not in OPCODES:
+            raise RuntimeError(f"Unknown opcode: {opname}")
+        op = OPCODES[opname]
+        arg = instr[1] if len(instr) > 1 else None
+        if op == LOAD_CONST or op in NAME_OPS or op in JUMP_OPS or op in SLOT_OPS:
+            operand = encode(op, arg)
+        elif op in FUSED_OPERANDS:
+            key = tuple(encode(part, field) for part, field in zip(FUSED_OPERANDS[op], arg))
+            if key not in fused_index:
+                fused_index[key] = len(fused)
+                fused.append(key)
+            operand = fused_index[key]
+        elif op == DEF_FUNC:
+            name, params, label, varnames = arg
+            functions.append(FunctionInfo(name, intern_name(name), params, label_pc(label), varnames))
+            operand = len(functions) - 1
+        elif op in CALL_OPS:
+            name, argc = arg
+            key = (intern_name(name), argc)
+            if key not in call_index:
+                call_index[key] = len(calls)
+                calls.append(key)
+            operand = call_index[key]
+        else:
+            operand = 0
+        ops.append(op)
+        args.append(operand)
+    ops.append(HALT)
+    args.append(0)
+    return CodeObject(ops, args, consts, names, functions, resolve_calls(calls, functions), fused)
+
+def resolve_calls(calls, functions):
+    """
+    호출 지점을 링크 시점에 callee로 연결: (name_index, argc) -> (name_index, argc, functions 인덱스 또는 -1)
+    DEF_FUNC는 실행 중에 등록되므로 VM은 여전히 그 이름이 정의됐는지 확인하지만,
+    정의된 함수가 링크 때 고른 callee와 같으면 인자 수 확인과 지역 슬롯 계산을 건너뜁니다.
+    """
+    by_name = {}
+    for index, func in enumerate(functions):
+        by_name.setdefault(func.name_index, []).append(index)
+    resolved = []
+    for name_index, argc in calls:
+        candidates = by_name.get(name_index, ())
+        callee = candidates[0] if len(candidates) == 1 and len(functions[candidates[0]].params) == argc else -1
+        resolved.append((name_index, argc, callee))
+    return resolved
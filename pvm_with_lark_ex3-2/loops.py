@@ -0,0 +1,162 @@
+# === while 루프 최적화 (AST, -O 2) ===
+# optimizer.Optimizer 다음에 실행되며 While 노드마다 (바깥 루프부터) 두 가지를 합니다.
+#   1. 유도 변수 곱셈 -> 덧셈 (strength reduction)
+#      루프 바디 최상위에서 딱 한 번 i = i + c / i = i - c (c는 상수)로 바뀌는 이름 i가 유도 변수입니다.
+#      루프 안의 i * k / k * i (k는 상수)는 임시 변수 t로 바꾸고, 루프 앞(preheader)에 t = i * k,
+#      i를 바꾸는 문장 바로 뒤에 t = t + c*k (또는 -)를 둡니다. t는 루프 안 어디서나 i * k와 같습니다.
+#   2. 불변 식 끌어올리기 (loop-invariant code motion)
+#      함수 호출이 없고, 사용하는 변수가 루프 안에서 대입되지 않는 BinOp(가장 큰 부분식)를
+#      preheader의 임시 변수 대입으로 옮깁니다. 같은 식은 임시 변수 하나를 같이 씁니다.
+# 안전 조건:
+#   - 옮기는 식의 변수는 루프 앞에서 반드시 대입된 이름(또는 함수 파라미터)이어야 합니다.
+#     (루프가 한 번도 돌지 않거나 그 식이 있는 가지가 실행되지 않아도 Undefined variable 오류가 새로 생기지 않음)
+#   - 레벨 2의 대수적 단순화처럼 피연산자가 정수라고 가정합니다 (정수 덧셈/곱셈은 실패하지 않음).
+#   - 함수는 전역 변수에 대입할 수 없으므로 (code_gen.py 스코프 규칙) 루프 안의 호출이 불변 식을 바꾸지 못합니다.
+# 임시 변수 이름은 프로그램에 나오지 않는 이름(_loop_inv0, _loop_iv0, ...)이고, 함수 안에서는 지역 변수가 됩니다.
+
+from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
+from optimizer import count_assignments, has_call, expr_names, add_definitions, collect_names
+
+STEP_OPS = ('+', '-')
+
+class LoopOptimizer:
+    def __init__(self):
+        self.hoisted = 0   # preheader로 옮긴 불변 식 수 (같은 식은 한 번)
+        self.reduced = 0   # 덧셈으로 바뀐 유도 변수 곱셈 수 (식 종류별 한 번)
+        self.loops = 0     # 바뀐 while 루프 수
+        self.used = set()  # 프로그램에 나오는 이름 (임시 변수 이름 충돌 방지)
+        self.temp_id = 0
+
+    def optimize_program(self, stmts):
+        self.used = set()
+        collect_names(stmts, self.used)
+        return self.optimize_block(stmts, set())
+
+    def optimize_block(self, stmts, defined):
+        """defined: 이 위치까지 반드시 대입된 이름 (문장을 지나며 갱신)"""
+        result = []
+        for stmt in stmts:
+            new_stmts = self.optimize_stmt(stmt, defined)
+            result.extend(new_stmts)
+            for new_stmt in new_stmts:
+                add_definitions(new_stmt, defined)
+        return result
+
+    def optimize_stmt(self, stmt, defined):
+        if isinstance(stmt, If):
+            then_block = self.optimize_block(stmt.then_block, set(defined))
+            else_block = self.optimize_block(stmt.else_block, set(defined)) if stmt.else_block else None
+            return [If(stmt.cond, then_block, else_block)]
+        if isinstance(stmt, While):
+            # 바깥 루프부터: 바깥 루프에서도 불변인 식은 가장 바깥 preheader로 한 번에 옮겨짐
+            new_stmts = self.optimize_loop(stmt, defined)
+            body_defined = set(defined)
+            for s in new_stmts[:-1]:
+                add_definitions(s, body_defined)
+            loop = new_stmts[-1]
+            new_stmts[-1] = While(loop.cond, self.optimize_block(loop.body, body_defined))
+            return new_stmts
+        if isinstance(stmt, FuncDef):
+            # 함수 바디는 자신의 스코프: 파라미터만 반드시 정의됨
+            return [FuncDef(stmt.name, stmt.params, self.optimize_block(stmt.body, set(stmt.params)))]
+        return [stmt]
+
+    def optimize_loop(self, loop, defined):
+        """While 하나 -> preheader 문장들 + 바뀐 While"""
+        preheader = []
+        cond, body = loop.cond, loop.body
+        counts = {}
+        count_assignments(body, counts)
+
+        # 1. 유도 변수 곱셈 -> 덧셈
+        steps = {}  # 유도 변수 -> (바디 최상위 위치, 연산자, 상수)
+        for index, s in enumerate(body):
+            if (isinstance(s, Assign) and counts.get(s.name) == 1 and s.name in defined
+                    and isinstance(s.expr, BinOp) and s.expr.op in STEP_OPS
+                    and isinstance(s.expr.left, Var) and s.expr.left.name == s.name
+                    and isinstance(s.expr.right, Number)):
+                steps[s.name] = (index, s.expr.op, s.expr.right.value)
+        temps = {}  # (유도 변수, 곱하는 상수) -> 임시 변수
+        def reduce(node):
+            if isinstance(node, BinOp):
+                left, right = reduce(node.left), reduce(node.right)
+                if node.op == '*':
+                    var, const = (left, right) if isinstance(left, Var) else (right, left)
+                    if isinstance(var, Var) and isinstance(const, Number) and var.name in steps:
+                        key = (var.name, const.value)
+                        if key not in temps:
+                            temps[key] = self.new_temp("_loop_iv")
+                            self.reduced += 1
+                        return Var(temps[key])
+                return BinOp(left, node.op, right)
+            if isinstance(node, FuncCall):
+                return FuncCall(node.name, [reduce(a) for a in node.args])
+            return node
+        cond, body = reduce(cond), map_exprs(body, reduce)
+        if temps:
+            updates = {}
+            for (name, factor), temp in temps.items():
+                index, op, step = steps[name]
+                preheader.append(Assign(temp, BinOp(Var(name), '*', Number(factor))))
+                updates.setdefault(index, []).append(Assign(temp, BinOp(Var(temp), op, Number(step * factor))))
+            body = [new_stmt for index, s in enumerate(body) for new_stmt in [s] + updates.get(index, [])]
+            counts = {}
+            count_assignments(body, counts)
+
+        # 2. 불변 식 끌어올리기
+        hoisted = {}  # 식의 repr -> 임시 변수
+        def invariant(node):
+            return (isinstance(node, (Var, Number, BinOp)) and not has_call(node)
+                    and all(name in defined and name not in counts for name in expr_names(node)))
+        def hoist(node):
+            if isinstance(node, BinOp):
+                if invariant(node) and expr_names(node):
+                    key = repr(node)
+                    if key not in hoisted:
+                        hoisted[key] = self.new_temp("_loop_inv")
+                        preheader.append(Assign(hoisted[key], node))
+                        self.hoisted += 1
+                    return Var(hoisted[key])
+                return BinOp(hoist(node.left), node.op, hoist(node.right))
+            if isinstance(node, FuncCall):
+                return FuncCall(node.name, [hoist(a) for a in node.args])
+            return node
+        cond, body = hoist(cond), map_exprs(body, hoist)
+
+        if not preheader:
+            return [loop]
+        self.loops += 1
+        return preheader + [While(cond, body)]
+
+    def new_temp(self, prefix):
+        while True:
+            name = f"{prefix}{self.temp_id}"
+            self.temp_id += 1
+            if name not in self.used:
+                self.used.add(name)
+                return name
+
+    def stats(self):
+        return {"loops": self.loops, "hoisted": self.hoisted, "reduced": self.reduced}
+
+def map_exprs(stmts, func):
+    """문장 리스트의 모든 식에 func를 적용한 새 리스트 (중첩 FuncDef 바디는 다른 스코프이므로 그대로)"""
+    result = []
+    for s in stmts:
+        if isinstance(s, Assign):
+            s = Assign(s.name, func(s.expr))
+        elif isinstance(s, Print):
+            s = Print(func(s.expr))
+        elif isinstance(s, Return):
+            s = Return(func(s.value))
+        elif isinstance(s, If):
+            s = If(func(s.cond), map_exprs(s.then_block, func),
+                   map_exprs(s.else_block, func) if s.else_block else None)
+        elif isinstance(s, While):
+            s = While(func(s.cond), map_exprs(s.body, func))
+        result.append(s)
+    return result
+
+def optimize(stmts):
+    """편의 함수: AST 문장 리스트 -> 루프 최적화된 AST 문장 리스트"""
+    return LoopOptimizer().optimize_program(stmts)
@@ -0,0 +1,211 @@
+# === 순수 함수 자동 메모이제이션 (table 엔진, VirtualMachine(memo=Memoizer())) ===
+# 1. 순수성 분석 (pure_functions): 링크된 CodeObject의 함수 바디(FunctionInfo.entry에서 제어 흐름으로 도달하는 명령어)마다
+#      - PRINT가 없고 (superinstruction은 구성 명령어 기준)
+#      - 파라미터/지역 변수만 읽고 쓰며 (LOAD_FAST/STORE_FAST, 전역/이름 접근 없음)
+#      - DEF_FUNC를 실행하지 않고 (함수 등록도 전역 상태를 바꿈)
+#      - 링크 때 callee가 정해진 순수 함수만 호출하면 (CALL_FUNCTION/TAIL_CALL, linker.resolve_calls)
+#    순수 함수입니다. 서로 호출하는 함수들은 모두 순수하다고 가정하고 조건을 어기는 함수를 빼 나갑니다 (fixpoint).
+#    순수 함수의 반환값은 인자에만 달려 있으므로 같은 인자의 호출은 저장된 결과로 바꿀 수 있습니다.
+# 2. 함수별 결과 캐시 (MemoCache): 인자 튜플 -> 반환값, 최대 max_size개 (넘치면 가장 오래 쓰지 않은 항목을 버림, LRU)
+#      - CALL_FUNCTION/CALL_FUNCTION_CACHED/TAIL_CALL: callee가 순수 함수면 캐시를 먼저 찾고, 있으면 프레임 없이 결과를 push
+#      - 없으면 원래대로 호출하고 (callee 프레임 -> 캐시와 키)를 기억했다가 그 프레임의 RETURN 값을 저장
+#      - 실행 중 오류가 난 호출은 저장되지 않으므로 오류 메시지는 메모이제이션이 없을 때와 같습니다.
+#      - TAIL_CALL로 프레임을 넘겨받은 함수의 반환값은 처음 호출된 함수의 키로만 저장됩니다 (꼬리 재귀도 항목 하나).
+# 3. 수익성 검사: 캐시마다 조회 MEMO_PROBE번이 지났을 때 hit 비율이 MEMO_MIN_HIT_RATE보다 낮으면 그 함수의 캐시를 끕니다.
+#    인자가 매번 다른 함수는 키를 만들고 저장하고 버리는 비용만 더해지므로 (call 워크로드: 0.7x) 이후 호출은 원래 handler로 바로 갑니다.
+#    모든 캐시가 꺼지면 테이블에 원래 handler를 되돌려 메모이제이션 없는 실행과 같아집니다. 꺼진 캐시는 stats의 enabled=False로 보고됩니다.
+# handler 테이블 복사본의 호출/반환 handler를 바꾸는 방식이라 메모이제이션 없는 실행에는 비용이 없습니다 (jit.py와 같음).
+# 훅이 붙은 실행(run_table_traced)과 switch 엔진에서는 사용하지 않습니다.
+
+from collections import OrderedDict
+
+from opcodes import (OPNAMES, SUPERINSTRUCTIONS, LOAD_NAME, STORE_NAME, LOAD_GLOBAL, STORE_GLOBAL, PRINT, JUMP,
+                     DEF_FUNC, CALL_FUNCTION, RETURN, HALT, CALL_FUNCTION_CACHED, TAIL_CALL)
+
+MEMO_MAX_SIZE = 4096  # 함수별 캐시 항목 수 기본값
+MEMO_PROBE = 256  # 수익성을 판단하기 전까지의 조회 수
+MEMO_MIN_HIT_RATE = 0.2  # 이보다 hit 비율이 낮으면 캐시를 끔
+
+# 순수 함수 바디에 있으면 안 되는 opcode (superinstruction은 구성 명령어 중 하나라도 있으면)
+IMPURE_OPS = {PRINT, LOAD_NAME, STORE_NAME, LOAD_GLOBAL, STORE_GLOBAL, DEF_FUNC}
+IMPURE_OPS |= {OPNAMES.index(name) for name, parts in SUPERINSTRUCTIONS.items()
+               if any(OPNAMES.index(part) in IMPURE_OPS for part in parts)}
+
+MISSING = object()  # 캐시에 없는 키 (None은 정상적인 반환값)
+
+class MemoCache:
+    def __init__(self, name, max_size=MEMO_MAX_SIZE):
+        self.name = name
+        self.max_size = max_size
+        self.entries = OrderedDict()  # 인자 튜플 -> 반환값 (뒤쪽이 최근에 쓴 항목)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.enabled = True
+
+    def get(self, key):
+        """저장된 반환값, 없으면 MISSING. 수익성이 없다고 판단되면 캐시를 끔 (enabled=False)"""
+        entries = self.entries
+        value = entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            lookups = self.hits + self.misses
+            if lookups >= MEMO_PROBE and self.hits < lookups * MEMO_MIN_HIT_RATE:
+                self.enabled = False
+                entries.clear()
+            return MISSING
+        entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries),
+                "enabled": self.enabled}
+
+class Memoizer:
+    def __init__(self, max_size=MEMO_MAX_SIZE):
+        self.max_size = max_size
+        self.caches = {}  # FunctionInfo -> MemoCache (순수 함수만)
+
+    def attach(self, vm, handlers=None):
+        """
+        handlers(기본값 vm.handlers) 복사본에서 호출/반환 handler를 캐시를 거치는 handler로 바꿔서 돌려줌.
+        load_table 다음에 불러야 함 (vm.code, vm.call_sites, vm.functions, vm.frames를 사용)
+        """
+        code = vm.code
+        self.caches = {code.functions[i]: MemoCache(code.functions[i].name, self.max_size)
+                       for i in sorted(pure_functions(code))}
+        caches = dict(self.caches)  # handler가 찾는 캐시 (꺼진 캐시는 빠짐)
+        call_sites, functions, frames = vm.call_sites, vm.functions, vm.frames
+        pending = {}  # 캐시에 없어서 실제로 호출된 프레임 -> (MemoCache, 키)
+        table = list(handlers if handlers is not None else vm.handlers)
+        tail_call, ret = table[TAIL_CALL], table[RETURN]
+        originals = {op: table[op] for op in (CALL_FUNCTION, CALL_FUNCTION_CACHED, TAIL_CALL, RETURN)}
+
+        def disable(func):
+            """수익성이 없는 캐시를 뺌. 모든 캐시가 꺼지면 테이블(run_table이 쓰는 리스트)에 원래 handler를 되돌림"""
+            caches.pop(func, None)
+            if not caches:
+                pending.clear()  # 꺼진 캐시에는 저장하지 않으므로 버려도 됨
+                for op, handler in originals.items():
+                    table[op] = handler
+
+        def memo_call(call):
+            def handler(frame, arg):
+                name_index, argc, _, _ = call_sites[arg]
+                cache = caches.get(functions[name_index])
+                if cache is None:
+                    call(frame, arg)
+                    return
+                stack = frame.stack
+                key = tuple(stack[-argc:]) if argc else ()
+                value = cache.get(key)
+                if value is not MISSING:
+                    del stack[len(stack) - argc:]
+                    stack.append(value)
+                    return
+                call(frame, arg)
+                if not cache.enabled:
+                    disable(functions[name_index])
+                    return
+                pending[frames[-1]] = (cache, key)
+            return handler
+
+        def memo_tail_call(frame, arg):
+            name_index, argc, _, _ = call_sites[arg]
+            cache = caches.get(functions[name_index])
+            if cache is None:
+                tail_call(frame, arg)
+                return
+            stack = frame.stack
+            key = tuple(stack[-argc:]) if argc else ()
+            value = cache.get(key)
+            if value is not MISSING:
+                # 결과를 알고 있으므로 이 프레임은 그 값으로 바로 RETURN
+                del stack[len(stack) - argc:]
+                stack.append(value)
+                memo_return(frame, 0)
+                return
+            tail_call(frame, arg)
+            if not cache.enabled:
+                disable(functions[name_index])
+                return
+            if frame not in pending:
+                pending[frame] = (cache, key)
+
+        def memo_return(frame, arg):
+            entry = pending.pop(frame, None)
+            if entry is not None:
+                stack = frame.stack
+                entry[0].put(entry[1], stack[-1] if stack else None)
+            ret(frame, arg)
+
+        table[CALL_FUNCTION] = memo_call(table[CALL_FUNCTION])
+        table[CALL_FUNCTION_CACHED] = memo_call(table[CALL_FUNCTION_CACHED])
+        table[TAIL_CALL] = memo_tail_call
+        table[RETURN] = memo_return
+        return table
+
+    def stats(self):
+        caches = [cache.stats() for cache in self.caches.values()]
+        return {
+            "functions": {cache.name: cache.stats() for cache in self.caches.values()},
+            "hits": sum(c["hits"] for c in caches),
+            "misses": sum(c["misses"] for c in caches),
+            "evictions": sum(c["evictions"] for c in caches),
+            "disabled": sum(not c["enabled"] for c in caches),
+        }
+
+def function_body(code, entry):
+    """entry에서 제어 흐름으로 도달하는 PC 집합. 코드 끝(HALT)에 도달하면 None (RETURN 없이 끝나는 바디)"""
+    ops, args = code.ops, code.args
+    seen = set()
+    work = [entry]
+    while work:
+        pc = work.pop()
+        while pc not in seen:
+            seen.add(pc)
+            op = ops[pc]
+            if op == HALT:
+                return None
+            if op == RETURN or op == TAIL_CALL:
+                break
+            if op == JUMP:
+                pc = args[pc]
+                continue
+            target = code.jump_target(pc)
+            if target is not None:
+                work.append(target)
+            pc += 1
+    return seen
+
+def pure_functions(code):
+    """순수 함수의 functions 인덱스 집합"""
+    calls = {}  # 함수 인덱스 -> 호출하는 callee 인덱스 집합
+    for index, func in enumerate(code.functions):
+        body = function_body(code, func.entry)
+        if body is None or any(code.ops[pc] in IMPURE_OPS for pc in body):
+            continue
+        callees = set()
+        for pc in body:
+            if code.ops[pc] in (CALL_FUNCTION, TAIL_CALL):
+                callees.add(code.calls[code.args[pc]][2])  # 링크 때 callee를 정하지 못했으면 -1
+        calls[index] = callees
+    pure = set(calls)
+    changed = True
+    while changed:
+        changed = False
+        for index in list(pure):
+            if not calls[index] <= pure:
+                pure.discard(index)
+                changed = True
+    return pure
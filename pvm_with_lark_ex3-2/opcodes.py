@@ -0,0 +1,129 @@
+# === 정수 opcode 테이블 ===
+# CodeGenerator가 만드는 문자열 opcode를 작은 정수로 매핑합니다.
+# 테이블 기반 디스패치 엔진은 이 번호를 handler 리스트의 인덱스로 사용합니다.
+
+LOAD_CONST = 0
+LOAD_NAME = 1
+STORE_NAME = 2
+LOAD_FAST = 3
+STORE_FAST = 4
+LOAD_GLOBAL = 5
+STORE_GLOBAL = 6
+DUP_TOP = 7
+BINARY_ADD = 8
+BINARY_SUB = 9
+BINARY_MUL = 10
+PRINT = 11
+JUMP_IF_FALSE = 12
+JUMP = 13
+DEF_FUNC = 14
+CALL_FUNCTION = 15
+RETURN = 16
+# superinstructions (superinstructions.py): 아래 SUPERINSTRUCTIONS의 묶음을 한 번에 실행
+LOAD_FAST_LOAD_FAST = 17
+LOAD_GLOBAL_LOAD_GLOBAL = 18
+LOAD_FAST_LOAD_CONST = 19
+LOAD_GLOBAL_LOAD_CONST = 20
+LOAD_FAST_LOAD_FAST_BINARY_ADD = 21
+LOAD_GLOBAL_LOAD_GLOBAL_BINARY_ADD = 22
+LOAD_FAST_LOAD_CONST_BINARY_ADD = 23
+LOAD_FAST_LOAD_CONST_BINARY_SUB = 24
+LOAD_FAST_LOAD_CONST_BINARY_MUL = 25
+LOAD_GLOBAL_LOAD_CONST_BINARY_ADD = 26
+LOAD_GLOBAL_LOAD_CONST_BINARY_SUB = 27
+LOAD_GLOBAL_LOAD_CONST_BINARY_MUL = 28
+LOAD_FAST_LOAD_CONST_BINARY_ADD_STORE_FAST = 29
+LOAD_FAST_LOAD_CONST_BINARY_SUB_STORE_FAST = 30
+LOAD_GLOBAL_LOAD_CONST_BINARY_ADD_STORE_GLOBAL = 31
+LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL = 32
+LOAD_FAST_JUMP_IF_FALSE = 33
+LOAD_GLOBAL_JUMP_IF_FALSE = 34
+# quickening (vm.py): 실행 중에 적응형 명령어가 자기 자리를 바꿔 쓰는 특화 변형. 컴파일러는 만들지 않음
+BINARY_ADD_INT = 35
+BINARY_SUB_INT = 36
+BINARY_MUL_INT = 37
+LOAD_NAME_GLOBAL = 38
+CALL_FUNCTION_CACHED = 39
+HALT = 40          # 코드 끝에 붙는 sentinel (프레임 종료)
+TAIL_CALL = 41     # return f(...): 현재 프레임을 callee 프레임으로 재사용 (CALL_FUNCTION + RETURN)
+
+OPNAMES = [
+    "LOAD_CONST",
+    "LOAD_NAME",
+    "STORE_NAME",
+    "LOAD_FAST",
+    "STORE_FAST",
+    "LOAD_GLOBAL",
+    "STORE_GLOBAL",
+    "DUP_TOP",
+    "BINARY_ADD",
+    "BINARY_SUB",
+    "BINARY_MUL",
+    "PRINT",
+    "JUMP_IF_FALSE",
+    "JUMP",
+    "DEF_FUNC",
+    "CALL_FUNCTION",
+    "RETURN",
+    "LOAD_FAST_LOAD_FAST",
+    "LOAD_GLOBAL_LOAD_GLOBAL",
+    "LOAD_FAST_LOAD_CONST",
+    "LOAD_GLOBAL_LOAD_CONST",
+    "LOAD_FAST_LOAD_FAST_BINARY_ADD",
+    "LOAD_GLOBAL_LOAD_GLOBAL_BINARY_ADD",
+    "LOAD_FAST_LOAD_CONST_BINARY_ADD",
+    "LOAD_FAST_LOAD_CONST_BINARY_SUB",
+    "LOAD_FAST_LOAD_CONST_BINARY_MUL",
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_ADD",
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_SUB",
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_MUL",
+    "LOAD_FAST_LOAD_CONST_BINARY_ADD_STORE_FAST",
+    "LOAD_FAST_LOAD_CONST_BINARY_SUB_STORE_FAST",
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_ADD_STORE_GLOBAL",
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL",
+    "LOAD_FAST_JUMP_IF_FALSE",
+    "LOAD_GLOBAL_JUMP_IF_FALSE",
+    "BINARY_ADD_INT",
+    "BINARY_SUB_INT",
+    "BINARY_MUL_INT",
+    "LOAD_NAME_GLOBAL",
+    "CALL_FUNCTION_CACHED",
+    "HALT",
+    "TAIL_CALL",
+]
+
+OPCODES = {name: num for num, name in enumerate(OPNAMES)}
+
+# === Superinstructions ===
+# 이름 -> 구성 명령어. tracing.OpcodePairProfiler로 benchmark.py 코퍼스를 프로파일해서
+# 가장 자주 연달아 실행되는 쌍/3개/4개 묶음을 골랐습니다 (python benchmark.py superinstructions).
+SUPERINSTRUCTIONS = {
+    "LOAD_FAST_LOAD_FAST": ("LOAD_FAST", "LOAD_FAST"),
+    "LOAD_GLOBAL_LOAD_GLOBAL": ("LOAD_GLOBAL", "LOAD_GLOBAL"),
+    "LOAD_FAST_LOAD_CONST": ("LOAD_FAST", "LOAD_CONST"),
+    "LOAD_GLOBAL_LOAD_CONST": ("LOAD_GLOBAL", "LOAD_CONST"),
+    "LOAD_FAST_LOAD_FAST_BINARY_ADD": ("LOAD_FAST", "LOAD_FAST", "BINARY_ADD"),
+    "LOAD_GLOBAL_LOAD_GLOBAL_BINARY_ADD": ("LOAD_GLOBAL", "LOAD_GLOBAL", "BINARY_ADD"),
+    "LOAD_FAST_LOAD_CONST_BINARY_ADD": ("LOAD_FAST", "LOAD_CONST", "BINARY_ADD"),
+    "LOAD_FAST_LOAD_CONST_BINARY_SUB": ("LOAD_FAST", "LOAD_CONST", "BINARY_SUB"),
+    "LOAD_FAST_LOAD_CONST_BINARY_MUL": ("LOAD_FAST", "LOAD_CONST", "BINARY_MUL"),
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_ADD": ("LOAD_GLOBAL", "LOAD_CONST", "BINARY_ADD"),
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_SUB": ("LOAD_GLOBAL", "LOAD_CONST", "BINARY_SUB"),
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_MUL": ("LOAD_GLOBAL", "LOAD_CONST", "BINARY_MUL"),
+    "LOAD_FAST_LOAD_CONST_BINARY_ADD_STORE_FAST": ("LOAD_FAST", "LOAD_CONST", "BINARY_ADD", "STORE_FAST"),
+    "LOAD_FAST_LOAD_CONST_BINARY_SUB_STORE_FAST": ("LOAD_FAST", "LOAD_CONST", "BINARY_SUB", "STORE_FAST"),
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_ADD_STORE_GLOBAL": ("LOAD_GLOBAL", "LOAD_CONST", "BINARY_ADD", "STORE_GLOBAL"),
+    "LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL": ("LOAD_GLOBAL", "LOAD_CONST", "BINARY_SUB", "STORE_GLOBAL"),
+    "LOAD_FAST_JUMP_IF_FALSE": ("LOAD_FAST", "JUMP_IF_FALSE"),
+    "LOAD_GLOBAL_JUMP_IF_FALSE": ("LOAD_GLOBAL", "JUMP_IF_FALSE"),
+}
+
+# === Quickening ===
+# 특화 변형 -> 원래 명령어 (역최적화, JIT 트레이스 기록 등에서 원래 의미가 필요할 때)
+QUICKENED = {
+    "BINARY_ADD_INT": "BINARY_ADD",
+    "BINARY_SUB_INT": "BINARY_SUB",
+    "BINARY_MUL_INT": "BINARY_MUL",
+    "LOAD_NAME_GLOBAL": "LOAD_NAME",
+    "CALL_FUNCTION_CACHED": "CALL_FUNCTION",
+}
@@ -0,0 +1,215 @@
+# === AST 최적화 패스 (ASTBuilder -> Optimizer -> CodeGenerator) ===
+# 최적화 레벨:
+#   0 : 아무것도 하지 않음
+#   1 : 상수 BinOp 접기, 한 번만 대입되는 상수 변수 전파, 조건이 상수인 if/while 가지 제거
+#   2 : 레벨 1 + 대수적 단순화 (x + 0, 0 + x, x - 0, x * 1, 1 * x -> x / x * 0, 0 * x -> 0)
+#       + while 루프 불변 식 이동과 유도 변수 곱셈 -> 덧셈 (loops.py, 이 Optimizer 다음에 실행)
+#       레벨 2는 피연산자가 정수라고 가정합니다. (예: 함수가 None을 돌려주면 None + 0은
+#       원래 VM Error지만 단순화 후에는 오류 없이 None이 됩니다.)
+#       x * 0은 x를 계산하지 않게 되므로 x에 함수 호출이 없고, x가 읽는 변수가 모두 그 위치에서 반드시 대입된
+#       이름(또는 파라미터)일 때만 적용합니다. (print(d * 0)의 Undefined variable 오류는 그대로 남음)
+#
+# 상수 전파 규칙 (스코프 = 모듈 최상위 문장 리스트 또는 함수 바디):
+#   - 스코프 안에서 정확히 한 번, 그것도 블록(if/while) 밖 최상위에서 상수로 대입되는 이름만 대상입니다.
+#   - 그 대입문 *뒤에 오는* 같은 스코프의 문장에서만 Var를 Number로 바꿉니다. (대입문 자체는 남김)
+#   - 함수 파라미터는 대상이 아니며, 함수 안에서 읽는 전역 변수도 바꾸지 않습니다.
+#     (함수가 언제 호출될지 컴파일 시점에 알 수 없음)
+
+from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
+
+OPT_LEVELS = (0, 1, 2)
+
+FOLD_OPS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+}
+
+class Optimizer:
+    def __init__(self, level=1):
+        if level not in OPT_LEVELS:
+            raise ValueError(f"Unknown optimization level: {level} (expected one of {OPT_LEVELS})")
+        self.level = level
+        self.folded = 0        # 접힌 BinOp 수
+        self.propagated = 0    # 상수로 바뀐 Var 수
+        self.simplified = 0    # 대수적 단순화 수
+        self.pruned = 0        # 제거된 if/while 가지 수
+
+    def optimize_program(self, stmts):
+        if self.level == 0:
+            return stmts
+        return self.optimize_scope(stmts, params=())
+
+    # === 스코프 / 문장 ===
+
+    def optimize_scope(self, stmts, params):
+        """모듈 또는 함수 바디 하나를 최적화"""
+        counts = {}
+        count_assignments(stmts, counts)
+        for p in params:
+            counts[p] = counts.get(p, 0) + 1  # 파라미터도 정의 한 번으로 셈 -> 전파 대상에서 빠짐
+        env = {}
+        defined = set(params)  # 이 위치까지 반드시 대입된 이름 (x * 0 -> 0 조건)
+        result = []
+        for stmt in stmts:
+            new_stmts = self.optimize_stmt(stmt, env, defined)
+            result.extend(new_stmts)
+            for new_stmt in new_stmts:
+                add_definitions(new_stmt, defined)
+            # 최상위에서 한 번만 대입되는 상수는 이후 문장에 전파
+            if (isinstance(stmt, Assign) and counts.get(stmt.name) == 1
+                    and len(new_stmts) == 1 and isinstance(new_stmts[0].expr, Number)):
+                env[stmt.name] = new_stmts[0].expr.value
+        return result
+
+    def optimize_block(self, stmts, env, defined):
+        """defined: 이 위치까지 반드시 대입된 이름 (문장을 지나며 갱신)"""
+        result = []
+        for stmt in stmts:
+            new_stmts = self.optimize_stmt(stmt, env, defined)
+            result.extend(new_stmts)
+            for new_stmt in new_stmts:
+                add_definitions(new_stmt, defined)
+        return result
+
+    def optimize_stmt(self, stmt, env, defined):
+        """문장 하나 -> 최적화된 문장 리스트 (가지 제거 시 0개 이상)"""
+        if isinstance(stmt, Assign):
+            return [Assign(stmt.name, self.optimize_expr(stmt.expr, env, defined))]
+        if isinstance(stmt, Print):
+            return [Print(self.optimize_expr(stmt.expr, env, defined))]
+        if isinstance(stmt, Return):
+            return [Return(self.optimize_expr(stmt.value, env, defined))]
+        if isinstance(stmt, If):
+            cond = self.optimize_expr(stmt.cond, env, defined)
+            if isinstance(cond, Number):
+                self.pruned += 1
+                taken = stmt.then_block if cond.value else (stmt.else_block or [])
+                return self.optimize_block(taken, env, defined)
+            then_block = self.optimize_block(stmt.then_block, env, set(defined))
+            else_block = self.optimize_block(stmt.else_block, env, set(defined)) if stmt.else_block else None
+            return [If(cond, then_block, else_block)]
+        if isinstance(stmt, While):
+            cond = self.optimize_expr(stmt.cond, env, defined)
+            if isinstance(cond, Number) and not cond.value:
+                self.pruned += 1
+                return []
+            return [While(cond, self.optimize_block(stmt.body, env, set(defined)))]
+        if isinstance(stmt, FuncDef):
+            # 함수 바디는 자신의 스코프 (바깥 상수 환경은 보이지 않음)
+            return [FuncDef(stmt.name, stmt.params, self.optimize_scope(stmt.body, stmt.params))]
+        raise NotImplementedError(f"Unknown statement: {stmt}")
+
+    # === 표현식 ===
+
+    def optimize_expr(self, node, env, defined):
+        if isinstance(node, Number):
+            return node
+        if isinstance(node, Var):
+            if node.name in env:
+                self.propagated += 1
+                return Number(env[node.name])
+            return node
+        if isinstance(node, FuncCall):
+            return FuncCall(node.name, [self.optimize_expr(a, env, defined) for a in node.args])
+        if isinstance(node, BinOp):
+            left = self.optimize_expr(node.left, env, defined)
+            right = self.optimize_expr(node.right, env, defined)
+            if isinstance(left, Number) and isinstance(right, Number) and node.op in FOLD_OPS:
+                self.folded += 1
+                return Number(FOLD_OPS[node.op](left.value, right.value))
+            if self.level >= 2:
+                simplified = self.simplify(left, node.op, right, defined)
+                if simplified is not None:
+                    self.simplified += 1
+                    return simplified
+            return BinOp(left, node.op, right)
+        raise NotImplementedError(f"Unknown expr: {node}")
+
+    def simplify(self, left, op, right, defined):
+        """대수적 항등식 적용. 적용할 수 없으면 None (defined: x * 0에서 버려도 되는 변수 읽기)"""
+        def is_const(node, value):
+            return isinstance(node, Number) and node.value == value
+        def removable(node):
+            return not has_call(node) and expr_names(node) <= defined
+        if op == '+':
+            if is_const(right, 0): return left
+            if is_const(left, 0): return right
+        elif op == '-':
+            if is_const(right, 0): return left
+        elif op == '*':
+            if is_const(right, 1): return left
+            if is_const(left, 1): return right
+            if is_const(right, 0) and removable(left): return Number(0)
+            if is_const(left, 0) and removable(right): return Number(0)
+        return None
+
+    def stats(self):
+        return {"folded": self.folded, "propagated": self.propagated,
+                "simplified": self.simplified, "pruned": self.pruned}
+
+def count_assignments(stmts, counts):
+    """스코프 안의 이름별 대입 횟수 (중첩 FuncDef 바디는 제외)"""
+    for s in stmts:
+        if isinstance(s, Assign):
+            counts[s.name] = counts.get(s.name, 0) + 1
+        elif isinstance(s, If):
+            count_assignments(s.then_block, counts)
+            if s.else_block:
+                count_assignments(s.else_block, counts)
+        elif isinstance(s, While):
+            count_assignments(s.body, counts)
+
+def has_call(node):
+    """표현식에 함수 호출이 있으면 True (호출은 출력 등 부작용이 있을 수 있음)"""
+    if isinstance(node, FuncCall):
+        return True
+    if isinstance(node, BinOp):
+        return has_call(node.left) or has_call(node.right)
+    return False
+
+def expr_names(node):
+    """식에서 읽는 변수 이름 집합"""
+    if isinstance(node, Var):
+        return {node.name}
+    if isinstance(node, BinOp):
+        return expr_names(node.left) | expr_names(node.right)
+    if isinstance(node, FuncCall):
+        return set().union(*(expr_names(a) for a in node.args)) if node.args else set()
+    return set()
+
+def add_definitions(stmt, defined):
+    """stmt를 지난 뒤 반드시 대입된 이름을 defined에 추가 (if는 두 가지 모두에서 대입된 이름, while은 안 돌 수 있으므로 없음)"""
+    if isinstance(stmt, Assign):
+        defined.add(stmt.name)
+    elif isinstance(stmt, If) and stmt.else_block:
+        then_defined, else_defined = set(defined), set(defined)
+        for s in stmt.then_block:
+            add_definitions(s, then_defined)
+        for s in stmt.else_block:
+            add_definitions(s, else_defined)
+        defined |= then_defined & else_defined
+
+def collect_names(stmts, names):
+    """프로그램 전체(중첩 함수 포함)에 나오는 변수/함수/파라미터 이름"""
+    for s in stmts:
+        if isinstance(s, Assign):
+            names.add(s.name)
+            names |= expr_names(s.expr)
+        elif isinstance(s, (Print, Return)):
+            names |= expr_names(s.expr if isinstance(s, Print) else s.value)
+        elif isinstance(s, If):
+            names |= expr_names(s.cond)
+            collect_names(s.then_block, names)
+            collect_names(s.else_block or [], names)
+        elif isinstance(s, While):
+            names |= expr_names(s.cond)
+            collect_names(s.body, names)
+        elif isinstance(s, FuncDef):
+            names.add(s.name)
+            names.update(s.params)
+            collect_names(s.body, names)
+
+def optimize(stmts, level=1):
+    """편의 함수: AST 문장 리스트 -> 최적화된 AST 문장 리스트"""
+    return Optimizer(level).optimize_program(stmts)
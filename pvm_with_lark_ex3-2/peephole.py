@@ -0,0 +1,138 @@
+# === 바이트코드 peephole 최적화 (CodeGenerator.code -> 최적화된 code) ===
+# 레이블이 남아 있는 튜플 바이트코드에서 동작하므로 링크 전에 실행합니다.
+#   1. 점프 스레딩: JUMP/JUMP_IF_FALSE의 대상이 곧바로 JUMP M이면 대상을 M으로 바꿈
+#   2. 다음 위치로의 JUMP 제거: JUMP L 과 LABEL L 사이에 레이블만 있으면 JUMP는 필요 없음
+#   3. 도달 불가능한 코드 제거: JUMP/RETURN/TAIL_CALL/HALT 뒤부터 참조되는 다음 LABEL 전까지의 명령어
+#      (아무도 참조하지 않는 레이블도 함께 제거)
+#   4. STORE x; LOAD x -> DUP_TOP; STORE x
+# 1~3은 더 이상 바뀌지 않을 때까지 반복합니다.
+
+UNCONDITIONAL = ("JUMP", "RETURN", "TAIL_CALL", "HALT")
+JUMPS = ("JUMP", "JUMP_IF_FALSE")
+STORE_LOAD_PAIRS = {
+    "STORE_FAST": "LOAD_FAST",
+    "STORE_GLOBAL": "LOAD_GLOBAL",
+    "STORE_NAME": "LOAD_NAME",
+}
+
+class PeepholeOptimizer:
+    def __init__(self):
+        self.removed = 0        # 제거된 명령어 수 (LABEL 제외)
+        self.threaded = 0       # 대상이 바뀐 점프 수
+        self.dup_stores = 0     # DUP_TOP; STORE로 바뀐 STORE/LOAD 쌍 수
+
+    def optimize(self, code):
+        before = count_instructions(code)
+        code = list(code)
+        changed = True
+        while changed:
+            changed = False
+            for rewrite in (self.thread_jumps, self.remove_jumps_to_next, self.remove_unreachable):
+                code, did_change = rewrite(code)
+                changed = changed or did_change
+        code = self.collapse_store_load(code)
+        self.removed += before - count_instructions(code)
+        return code
+
+    def thread_jumps(self, code):
+        positions = label_positions(code)
+        changed = False
+        result = []
+        for instr in code:
+            if instr[0] in JUMPS:
+                target = instr[1]
+                seen = {target}
+                while True:
+                    nxt = first_instruction_at(code, positions[target])
+                    if nxt is None or nxt[0] != "JUMP" or nxt[1] in seen:
+                        break
+                    target = nxt[1]
+                    seen.add(target)
+                if target != instr[1]:
+                    instr = (instr[0], target)
+                    self.threaded += 1
+                    changed = True
+            result.append(instr)
+        return result, changed
+
+    def remove_jumps_to_next(self, code):
+        changed = False
+        result = []
+        for i, instr in enumerate(code):
+            if instr[0] == "JUMP":
+                j = i + 1
+                while j < len(code) and code[j][0] == "LABEL" and code[j][1] != instr[1]:
+                    j += 1
+                if j < len(code) and code[j] == ("LABEL", instr[1]):
+                    changed = True
+                    continue
+            result.append(instr)
+        return result, changed
+
+    def remove_unreachable(self, code):
+        referenced = referenced_labels(code)
+        changed = False
+        reachable = True
+        result = []
+        for instr in code:
+            op = instr[0]
+            if op == "LABEL":
+                if instr[1] not in referenced:
+                    changed = True  # 참조되지 않는 레이블은 도달 가능성에 영향을 주지 않음
+                    continue
+                reachable = True
+                result.append(instr)
+                continue
+            if not reachable:
+                changed = True
+                continue
+            result.append(instr)
+            if op in UNCONDITIONAL:
+                reachable = False
+        return result, changed
+
+    def collapse_store_load(self, code):
+        result = []
+        i = 0
+        while i < len(code):
+            instr = code[i]
+            if (i + 1 < len(code) and instr[0] in STORE_LOAD_PAIRS
+                    and code[i + 1] == (STORE_LOAD_PAIRS[instr[0]], instr[1])):
+                result.append(("DUP_TOP",))
+                result.append(instr)
+                self.dup_stores += 1
+                i += 2
+                continue
+            result.append(instr)
+            i += 1
+        return result
+
+    def stats(self):
+        return {"removed": self.removed, "threaded": self.threaded, "dup_stores": self.dup_stores}
+
+def count_instructions(code):
+    return sum(1 for instr in code if instr[0] != "LABEL")
+
+def label_positions(code):
+    return {instr[1]: i for i, instr in enumerate(code) if instr[0] == "LABEL"}
+
+def first_instruction_at(code, index):
+    """index부터 LABEL을 건너뛴 첫 명령어 (없으면 None)"""
+    while index < len(code):
+        if code[index][0] != "LABEL":
+            return code[index]
+        index += 1
+    return None
+
+def referenced_labels(code):
+    labels = set()
+    for instr in code:
+        if instr[0] in JUMPS:
+            labels.add(instr[1])
+        elif instr[0] == "DEF_FUNC":
+            labels.add(instr[1][2])
+    return labels
+
+def optimize(code):
+    """편의 함수: 튜플 바이트코드 -> peephole 최적화된 튜플 바이트코드"""
+    return PeepholeOptimizer().optimize(code)
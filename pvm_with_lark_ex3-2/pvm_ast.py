@@ -60,6 +60,11 @@ class Return:
         return f"Return({self.value})"
 
 # === ASTBuilder 구현 ===
+# Lark LALR 파서의 inline transformer로 사용합니다:
+#     Lark(grammar, parser="lalr", transformer=ASTBuilder())
+# 규칙이 reduce될 때마다 콜백이 호출되고 자식들은 이미 AST 노드(또는 리스트)이므로,
+# parser.parse()가 Parse Tree를 만들지 않고 바로 AST 문장 리스트를 돌려줍니다.
+# 일반 Transformer처럼 ASTBuilder().transform(tree)로 써도 같은 결과가 나옵니다.
 
 class ASTBuilder(Transformer):
     def number(self, n): return Number(int(n[0]))
@@ -76,15 +81,13 @@ class ASTBuilder(Transformer):
 
     def func_def(self, args):
         name = str(args[0])
-        param_arg = args[1]
-        body = args[2]
-        # print(f"[DEBUG] func_def args: {args}")  # debug print
-        # param_arg는 None(파라미터 없음) 또는 [Token('NAME', ...), ...]
-        if param_arg is None:
-            params = []
+        body = args[-1]
+        # param_list?는 생략되면 자식이 없으므로 args는 [NAME, stmt_block]
+        # param_list는 [Token('NAME', ...), ...]
+        if len(args) == 3 and args[1] is not None:
+            params = [str(p) for p in args[1]]
         else:
-            params = [str(p) for p in param_arg]
-        # print(f"[DEBUG] FuncDef name: {name}, params: {params}, body: {body}")  # debug print
+            params = []
         return FuncDef(name, params, body)
 
     def func_call(self, args):
@@ -102,44 +105,17 @@ class ASTBuilder(Transformer):
         return args
 
     def stmt_block(self, s):
-        if len(s) == 1:
-            items = s[0]
-        elif len(s) == 3:
-            items = s[1]
-        else:
-            items = []
-        return self.flatten_and_transform(items)
+        # "{", "}"는 익명 토큰이라 걸러지므로 자식은 stmt_list 결과 하나
+        return self.flatten(s)
 
     def stmt_list(self, args):
-        return self.flatten_and_transform(args)
+        return self.flatten(args)
 
     def stmt(self, args):
         return args[0]
 
     def start(self, args):
-        return self.flatten_and_transform(args)
-
-    def expr(self, args):
-        if len(args) == 1:
-            return args[0]
-        current = args[0]
-        for i in range(1, len(args), 2):
-            op = args[i]
-            op_str = op.value if hasattr(op, 'value') else str(op)
-            right = args[i+1]
-            current = BinOp(current, op_str, right)
-        return current
-
-    def term(self, args):
-        if len(args) == 1:
-            return args[0]
-        current = args[0]
-        for i in range(1, len(args), 2):
-            op = args[i]
-            op_str = op.value if hasattr(op, 'value') else str(op)
-            right = args[i+1]
-            current = BinOp(current, op_str, right)
-        return current
+        return self.flatten(args)
 
     def add(self, items):
         left, right = items
@@ -166,21 +142,12 @@ class ASTBuilder(Transformer):
         # 여기서는 아무것도 반환하지 않음 (None)
         return None
 
-    def flatten_and_transform(self, items):
-        from lark.tree import Tree
+    def flatten(self, items):
+        """중첩 리스트를 펼치고 None(무시된 문장)을 제거"""
         result = []
         for a in items:
-            if isinstance(a, Tree):
-                v = self.transform(a)
-                if v is None:
-                    continue
-                if isinstance(v, list):
-                    result.extend(v)
-                else:
-                    result.append(v)
-            elif isinstance(a, list):
-                result.extend(self.flatten_and_transform(a))
-            else:
-                if a is not None:
-                    result.append(a)
+            if isinstance(a, list):
+                result.extend(self.flatten(a))
+            elif a is not None:
+                result.append(a)
         return result
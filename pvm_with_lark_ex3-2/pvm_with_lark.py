@@ -1,12 +1,63 @@
-from lark import Lark
-from pvm_ast import *
-from code_gen import CodeGenerator
-from vm import VirtualMachine
+import argparse
+import hashlib
+import os
+
+import bytecode_cache
+from linker import link
+from vm import VirtualMachine, ENGINES
+from tracing import DebugTracer
+
+# VirtualMachine 엔진 + AST를 직접 클로저로 컴파일하는 엔진 (closure_engine.py)
+# 트랜스파일러는 바이트코드를 Python 소스로 바꿔 exec로 실행 (transpiler.py)
+ALL_ENGINES = ENGINES + ("closure", "transpile", "register")
+
+# Lark, pvm_ast, code_gen은 실제로 컴파일이 필요할 때만 import 합니다.
+# (바이트코드 캐시가 유효하면 파서를 만들지 않고 바로 실행)
 
 # === 문법 불러오기 ===
-with open("grammar.lark", "r", encoding="utf-8") as f:
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar.lark")
+with open(GRAMMAR_PATH, "r", encoding="utf-8") as f:
     grammar = f.read()
-parser = Lark(grammar, parser="lalr", start="start")
+GRAMMAR_HASH = hashlib.sha256(grammar.encode("utf-8")).digest()
+
+# === 파서 테이블 캐시 ===
+# LALR 테이블 생성 비용을 매번 지불하지 않도록 Lark의 cache 옵션으로 분석된 파서를 저장합니다.
+# 캐시 파일에는 문법/옵션/Lark 버전의 해시가 들어 있어 grammar.lark가 바뀌면 자동으로 다시 만들어집니다.
+PARSER_CACHE_PATH = os.path.join(os.path.dirname(GRAMMAR_PATH), bytecode_cache.CACHE_DIR_NAME,
+                                 "grammar.lark.parser")
+
+_parser = None
+_tree_parser = None
+
+def build_parser(use_cache=True, transformer=None):
+    """
+    Lark LALR 파서 생성. use_cache면 PARSER_CACHE_PATH의 저장된 테이블을 불러오거나 새로 저장.
+    transformer를 주면 inline transformer로 붙여 parse()가 Tree 대신 변환 결과를 돌려줍니다.
+    """
+    from lark import Lark
+    options = dict(parser="lalr", start="start", transformer=transformer)
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(PARSER_CACHE_PATH), exist_ok=True)
+            options["cache"] = PARSER_CACHE_PATH
+        except OSError:
+            pass
+    return Lark(grammar, **options)
+
+def get_parser():
+    """처음 호출될 때 (캐시된) AST 파서를 생성. parse()는 AST 문장 리스트를 돌려줌"""
+    global _parser
+    if _parser is None:
+        from pvm_ast import ASTBuilder
+        _parser = build_parser(transformer=ASTBuilder())
+    return _parser
+
+def get_tree_parser():
+    """Parse Tree를 만드는 파서 (샘플 출력과 비교용)"""
+    global _tree_parser
+    if _tree_parser is None:
+        _tree_parser = build_parser()
+    return _tree_parser
 
 # === 샘플 코드 ===
 sample_code = """
@@ -40,46 +91,406 @@ c = add(a, b)
 print(c)
 """
 
-# === 파싱
-tree = parser.parse(sample_code)
-print("=== Parse Tree ===")
-print(tree.pretty())
-
-# === AST 생성
-ast_builder = ASTBuilder()
-ast = ast_builder.transform(tree)
-
-# Tree 또는 중첩 리스트 제거
-def flatten_and_transform_all(ast, ast_builder):
-    from lark.tree import Tree
-    while isinstance(ast, Tree):
-        ast = ast_builder.transform(ast)
-    if isinstance(ast, list):
-        result = []
-        for item in ast:
-            if isinstance(item, (Tree, list)):
-                result.extend(flatten_and_transform_all(item, ast_builder))
-            else:
-                result.append(item)
-        return result
-    else:
-        return [ast]
+def parse_to_ast(source):
+    """소스 코드 -> AST 문장 리스트 (파싱 중에 AST를 만드는 단일 패스, Parse Tree 없음)"""
+    return get_parser().parse(source)
+
+def build_ast(tree):
+    """Parse Tree -> AST 문장 리스트 (Tree를 따로 만든 경우)"""
+    from pvm_ast import ASTBuilder
+    return ASTBuilder().transform(tree)
+
+def optimize_ast(ast, opt_level, report=None, loops=True, inline=True):
+    """
+    작은 함수 인라이닝 (inliner.py) 후 AST 최적화 패스 (optimizer.py), 레벨 2 이상이면 while 루프 최적화 (loops.py)도 적용.
+    레벨 0이면 그대로 반환. loops=False / inline=False면 그 패스를 건너뜁니다.
+    """
+    if not opt_level:
+        return ast
+    if inline:
+        from inliner import Inliner
+        inliner = Inliner()
+        ast = inliner.optimize_program(ast)
+        if report is not None:
+            report["inline"] = inliner.stats()
+    from optimizer import Optimizer
+    optimizer = Optimizer(opt_level)
+    ast = optimizer.optimize_program(ast)
+    if report is not None:
+        report["ast"] = optimizer.stats()
+    if opt_level >= 2 and loops:
+        from loops import LoopOptimizer
+        loop_optimizer = LoopOptimizer()
+        ast = loop_optimizer.optimize_program(ast)
+        if report is not None:
+            report["loops"] = loop_optimizer.stats()
+    return ast
+
+def optimize_code(code, opt_level, report=None, superinstructions=True, cfg=True):
+    """
+    CFG 패스 (cfg.py: 도달 불가능한 블록/죽은 저장 제거, 블록 배치), 바이트코드 peephole 최적화 (peephole.py)
+    후 superinstruction 합치기 (superinstructions.py).
+    레벨 0이면 그대로 반환. superinstructions=False / cfg=False면 그 단계를 건너뜁니다.
+    """
+    if not opt_level:
+        return code
+    if cfg:
+        from cfg import CFGOptimizer
+        cfg_optimizer = CFGOptimizer()
+        code = cfg_optimizer.optimize(code)
+        if report is not None:
+            report["cfg"] = cfg_optimizer.stats()
+    from peephole import PeepholeOptimizer
+    peephole = PeepholeOptimizer()
+    code = peephole.optimize(code)
+    if report is not None:
+        report["peephole"] = peephole.stats()
+    if superinstructions:
+        from superinstructions import SuperinstructionFuser
+        fuser = SuperinstructionFuser()
+        code = fuser.fuse(code)
+        if report is not None:
+            report["superinstructions"] = fuser.stats()
+    return code
+
+def generate_code(source, opt_level=0, report=None):
+    """소스 코드 -> AST 최적화까지 적용한 CodeGenerator 출력 (바이트코드 최적화 전)"""
+    from code_gen import CodeGenerator
+    codegen = CodeGenerator()
+    codegen.compile_program(optimize_ast(parse_to_ast(source), opt_level, report))
+    return codegen.code
+
+def compile_source(source, opt_level=0, report=None, superinstructions=True):
+    """
+    소스 코드 -> (레이블 포함) 바이트코드 리스트.
+    report에 dict를 넘기면 최적화 패스별 통계가 채워집니다.
+    """
+    return optimize_code(generate_code(source, opt_level, report), opt_level, report, superinstructions)
+
+def compile_file(path, use_cache=True, cache_dir=None, opt_level=0):
+    """
+    소스 파일 -> 링크된 CodeObject.
+    use_cache면 __pvmcache__의 .pvmc 캐시를 먼저 확인합니다. 반환값: (CodeObject, 캐시 적중 여부)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    compile_linked = lambda text: link(compile_source(text, opt_level))
+    if not use_cache:
+        return compile_linked(source), False
+    return bytecode_cache.load_or_compile(bytecode_cache.cache_path(path, cache_dir, opt_level), source,
+                                          GRAMMAR_HASH, compile_linked)
+
+def run_file(options):
+    """스크립트 파일 실행 (캐시 사용, 중간 단계 출력 없음)"""
+    if options.spawn:
+        run_green_threads(options)
+        return
+    if options.engine == "closure":
+        # 클로저 엔진은 AST에서 바로 컴파일하므로 바이트코드 캐시를 쓰지 않음
+        from closure_engine import ClosureEngine
+        with open(options.script, "r", encoding="utf-8") as f:
+            source = f.read()
+        ClosureEngine().run(optimize_ast(parse_to_ast(source), options.opt_level))
+        return
+    if options.engine == "register":
+        # 레지스터 VM도 AST에서 바로 자신의 명령어로 컴파일 (바이트코드 캐시 없음)
+        import register_vm
+        with open(options.script, "r", encoding="utf-8") as f:
+            source = f.read()
+        register_vm.run(optimize_ast(parse_to_ast(source), options.opt_level))
+        return
+    if options.engine == "transpile":
+        # 트랜스파일러는 CodeGenerator 출력 패턴을 구조화하므로 바이트코드 최적화 전 코드를 사용
+        import transpiler
+        with open(options.script, "r", encoding="utf-8") as f:
+            source = f.read()
+        transpiled = transpiler.run(generate_code(source, options.opt_level))
+        if options.trace:
+            print(f"[DEBUG] {'transpiled' if transpiled else 'fallback to table engine'}: {options.script}")
+        return
+    code, hit = compile_file(options.script, use_cache=not options.no_cache, cache_dir=options.cache_dir,
+                             opt_level=options.opt_level)
+    if options.trace:
+        print(f"[DEBUG] bytecode cache {'hit' if hit else 'miss'}: {options.script}")
+    if options.batch:
+        run_batch(options, code)
+        return
+    hooks = [DebugTracer()] if options.trace else []
+    jit = make_jit(options)
+    memo = make_memo(options)
+    vm = VirtualMachine(engine=options.engine, hooks=hooks, jit=jit, quicken=options.quicken, memo=memo)
+    vm.run(code)
+    report_jit(options, jit)
+    report_quickening(options, vm)
+    report_memo(options, memo)
+
+def run_green_threads(options):
+    """--spawn: 스크립트와 --spawn 스크립트들을 green thread로 번갈아 실행 (출력은 "[스크립트] ..." 접두사)"""
+    from scheduler import Scheduler
+    scheduler = Scheduler(quantum=options.quantum, policy=options.schedule, echo=True)
+    scripts = [options.script] + options.spawn
+    for priority, script in enumerate(scripts):
+        code, _ = compile_file(script, use_cache=not options.no_cache, cache_dir=options.cache_dir,
+                               opt_level=options.opt_level)
+        # priority 정책에서는 앞에 적은 스크립트가 높은 priority
+        scheduler.spawn(code, name=script, priority=len(scripts) - priority,
+                        vm=VirtualMachine(quicken=options.quicken, memo=make_memo(options)))
+    scheduler.run()
+    if options.schedule_stats:
+        stats = scheduler.stats()
+        print(f"[SCHED] tasks={stats['tasks']} switches={stats['switches']} instructions={stats['instructions']}")
+        for task in scheduler.tasks:
+            print(f"[SCHED] {task.name}: slices={task.slices} instructions={task.instructions}")
 
-ast = flatten_and_transform_all(ast, ast_builder)
+def run_corpus(options):
+    """--corpus: 스크립트 여러 개를 worker 프로세스들로 나눠 실행하고 스크립트별 출력과 요약을 출력"""
+    from corpus_runner import CorpusRunner, collect_scripts, scaling
+    scripts = collect_scripts(options.corpus)
+    runner_options = dict(opt_level=options.opt_level, use_cache=not options.no_cache, cache_dir=options.cache_dir)
+    if options.max_instructions is not None:
+        runner_options["max_instructions"] = options.max_instructions
+    if options.scaling:
+        for workers, elapsed, throughput, speedup in scaling(scripts, options.workers, **runner_options):
+            print(f"[SCALING] workers={workers} scripts={len(scripts)} elapsed={elapsed:.3f}s "
+                  f"throughput={throughput:.1f} scripts/s speedup={speedup:.2f}x")
+        return
+    runner = CorpusRunner(workers=options.workers, **runner_options)
+    for result in runner.run(scripts, ordered=not options.unordered):
+        for line in result.lines():
+            print(f"[{result.path}] {line}")
+        if result.error:
+            print(f"[{result.path}] {result.status.upper()}: {result.error.splitlines()[0]}")
+    stats = runner.stats()
+    print(f"[CORPUS] scripts={stats['scripts']} ok={stats['ok']} vm_error={stats['vm_error']} limit={stats['limit']} "
+          f"error={stats['error']} crashed={stats['crashed']} workers={stats['workers']} "
+          f"elapsed={stats['elapsed']:.3f}s throughput={stats['throughput']:.1f} scripts/s")
 
-print("\n=== AST ===")
-from pprint import pprint
-pprint(ast)
+def run_batch(options, code):
+    """--batch CSV: 헤더의 이름을 전역 변수 입력으로, 행마다 lane 하나로 batch 실행하고 lane별 출력"""
+    import csv
+    from batch_vm import BatchVM
+    with open(options.batch, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    header, rows = rows[0], [row for row in rows[1:] if row]
+    inputs = {name.strip(): [int(row[i]) for row in rows] for i, name in enumerate(header)}
+    batch = BatchVM()
+    result = batch.run(code, inputs, lanes=len(rows))
+    for lane, lines in enumerate(result.outputs()):
+        for line in lines:
+            print(f"[LANE {lane}] {line}")
+    if options.batch_stats:
+        stats = batch.stats()
+        print(f"[BATCH] lanes={len(rows)} steps={stats['steps']} divergent_steps={stats['divergent_steps']} "
+              f"diverged={stats['diverged']} scalar_lanes={stats['scalar_lanes']}"
+              + (f" fallback={stats['fallback']}" if stats["fallback"] else ""))
 
-# === 바이트코드 생성
-codegen = CodeGenerator()
-codegen.compile_program(ast)
+def make_jit(options):
+    """--jit이면 트레이싱 JIT (table 엔진 전용)"""
+    if not options.jit:
+        return None
+    from jit import TraceJIT
+    return TraceJIT(threshold=options.jit_threshold)
+
+def report_jit(options, jit):
+    if jit is not None and options.jit_stats:
+        stats = jit.stats()
+        print(f"[JIT] traces={stats['traces']} aborted={stats['aborted']} entries={stats['entries']} "
+              f"hits={stats['hits']} misses={stats['misses']} loop_exits={stats['loop_exits']}")
+        for trace in jit.traces.values():
+            print(f"[JIT] loop at PC={trace.head}: hits={trace.iterations} misses={trace.guard_misses}")
+
+def make_memo(options):
+    """--memoize이면 순수 함수 메모이제이션 (table 엔진 전용)"""
+    if not options.memoize:
+        return None
+    from memoize import Memoizer
+    return Memoizer(max_size=options.memo_size)
+
+def report_memo(options, memo):
+    if memo is not None and options.memo_stats:
+        stats = memo.stats()
+        print(f"[MEMO] hits={stats['hits']} misses={stats['misses']} evictions={stats['evictions']} "
+              f"disabled={stats['disabled']}")
+        for name, counts in stats["functions"].items():
+            state = "" if counts["enabled"] else " (disabled: low hit rate)"
+            print(f"[MEMO] {name}: hits={counts['hits']} misses={counts['misses']} "
+                  f"evictions={counts['evictions']} size={counts['size']}{state}")
+
+def report_quickening(options, vm):
+    if options.quicken and options.quicken_stats:
+        stats = vm.quickening_stats()
+        sites = " ".join(f"{name}={n}" for name, n in stats["sites"].items())
+        print(f"[QUICKEN] specialized={stats['specialized']} deoptimized={stats['deoptimized']} sites: {sites or '-'}")
+
+def main():
+    argparser = argparse.ArgumentParser(description="Python VM with Lark")
+    argparser.add_argument("--engine", choices=ALL_ENGINES, default="table",
+                           help="실행 엔진 (switch: if/elif 루프, table: 테이블 디스패치, "
+                                "closure: AST를 Python 클로저로 컴파일, transpile: 바이트코드를 Python 소스로 변환, "
+                                "register: 3-주소 명령어를 실행하는 레지스터 VM)")
+    argparser.add_argument("--trace", action="store_true",
+                           help="컴파일/실행 과정의 [DEBUG] 트레이스 출력")
+    argparser.add_argument("script", nargs="?",
+                           help="실행할 스크립트 파일 (생략하면 샘플 코드의 각 단계를 출력)")
+    argparser.add_argument("--no-cache", action="store_true",
+                           help="바이트코드 캐시(__pvmcache__/*.pvmc)를 사용하지 않음")
+    argparser.add_argument("--cache-dir", default=None,
+                           help="캐시 디렉터리 (기본값: 스크립트 옆의 __pvmcache__)")
+    argparser.add_argument("-O", dest="opt_level", type=int, nargs="?", const=1, default=0, choices=(0, 1, 2),
+                           help="최적화 레벨 (-O = 1: 작은 함수 인라이닝, 상수 접기/전파/가지 제거, CFG, peephole, superinstructions, "
+                                "-O 2: 대수적 단순화, while 루프 불변 식 이동/유도 변수 곱셈 -> 덧셈 추가)")
+    argparser.add_argument("--jit", action="store_true",
+                           help="hot while 루프를 트레이싱 JIT으로 컴파일 (table 엔진, --trace 없이)")
+    argparser.add_argument("--jit-threshold", type=int, default=50,
+                           help="트레이스를 기록하기 전 루프 반복 횟수 (기본값 50)")
+    argparser.add_argument("--jit-stats", action="store_true",
+                           help="실행 후 JIT hit/miss 카운터 출력 (--jit과 함께)")
+    argparser.add_argument("--quicken", action="store_true",
+                           help="실행 중에 명령어를 int/호출 지점에 특화된 변형으로 바꿈 (table 엔진, --trace 없이). "
+                                "속도 향상은 없으며 특화 과정을 보기 위한 옵션")
+    argparser.add_argument("--quicken-stats", action="store_true",
+                           help="실행 후 특화/역최적화 횟수와 특화된 명령어 출력 (--quicken과 함께)")
+    argparser.add_argument("--memoize", action="store_true",
+                           help="순수 함수의 결과를 인자별로 캐시 (table 엔진, --trace 없이)")
+    argparser.add_argument("--memo-size", type=int, default=4096,
+                           help="함수별 캐시 항목 수 (넘치면 LRU로 버림, 기본값 4096)")
+    argparser.add_argument("--memo-stats", action="store_true",
+                           help="실행 후 함수별 캐시 hit/miss/eviction과 꺼진 캐시 출력 (--memoize와 함께)")
+    argparser.add_argument("--batch", metavar="CSV", default=None,
+                           help="CSV 헤더의 이름을 전역 변수 입력으로, 행마다 lane 하나로 스크립트를 NumPy 벡터 연산으로 한꺼번에 실행 "
+                                "(함수가 있는 스크립트는 lane마다 table 엔진으로 실행)")
+    argparser.add_argument("--batch-stats", action="store_true",
+                           help="실행 후 batch 단계 수/분기 갈림/스칼라로 실행한 lane 수 출력 (--batch와 함께)")
+    argparser.add_argument("--spawn", metavar="SCRIPT", action="append", default=[],
+                           help="스크립트와 함께 green thread로 번갈아 실행할 스크립트 (여러 번 사용 가능, table 엔진)")
+    argparser.add_argument("--quantum", type=int, default=1000,
+                           help="green thread를 바꾸기 전 실행할 명령어 수 (기본값 1000)")
+    argparser.add_argument("--schedule", choices=("round_robin", "priority"), default="round_robin",
+                           help="green thread 선택 방식 (priority: 앞에 적은 스크립트 우선, 같은 priority는 round robin)")
+    argparser.add_argument("--schedule-stats", action="store_true",
+                           help="실행 후 스크립트별 time slice/명령어 수 출력 (--spawn과 함께)")
+    argparser.add_argument("--corpus", metavar="PATH", nargs="+", default=None,
+                           help="스크립트 파일/디렉터리(*.pvm)들을 worker 프로세스 pool로 병렬 실행 (table 엔진)")
+    argparser.add_argument("--workers", type=int, default=None,
+                           help="--corpus worker 프로세스 수 (기본값: CPU 수, --scaling이면 1..N)")
+    argparser.add_argument("--unordered", action="store_true",
+                           help="--corpus 결과를 입력 순서 대신 끝나는 순서대로 출력")
+    argparser.add_argument("--max-instructions", type=int, default=None,
+                           help="--corpus 스크립트 하나가 실행할 수 있는 최대 명령어 수 (넘으면 limit으로 중단, "
+                                "기본값: corpus_runner.MAX_INSTRUCTIONS, 0이면 제한 없음)")
+    argparser.add_argument("--scaling", action="store_true",
+                           help="--corpus를 worker 1..N개로 실행해 처리량(scripts/s)을 비교")
+    options = argparser.parse_args()
+
+    if options.corpus:
+        run_corpus(options)
+        return
+    if options.script:
+        run_file(options)
+        return
+
+    # === 파싱 (보여주기용 Parse Tree)
+    tree = get_tree_parser().parse(sample_code)
+    print("=== Parse Tree ===")
+    print(tree.pretty())
+
+    # === AST 생성 (inline transformer로 파싱과 동시에)
+    ast = parse_to_ast(sample_code)
+
+    print("\n=== AST ===")
+    from pprint import pprint
+    pprint(ast)
+
+    # === AST 최적화
+    if options.opt_level:
+        report = {}
+        ast = optimize_ast(ast, options.opt_level, report)
+        print(f"\n=== Optimized AST (-O {options.opt_level}) ===")
+        stats = report["inline"]
+        if stats["inlined"]:
+            print(f"(inline: {stats['inlined']} call sites of {', '.join(stats['by_name'])}, +{stats['growth']} nodes)")
+        if "loops" in report:
+            stats = report["loops"]
+            print(f"(loops: {stats['loops']} while loops, {stats['hoisted']} invariant expressions hoisted, "
+                  f"{stats['reduced']} induction multiplications -> additions)")
+        pprint(ast)
+
+    # === 바이트코드 생성
+    from code_gen import CodeGenerator
+    codegen = CodeGenerator(debug=options.trace)
+    codegen.compile_program(ast)
+
+    print("\n=== Bytecode ===")
+    for instr in codegen.code:
+        print(instr)
+
+    # === Peephole 최적화
+    bytecode = codegen.code
+    if options.opt_level:
+        report = {}
+        bytecode = optimize_code(bytecode, options.opt_level, report)
+        stats = report["cfg"]
+        counts = ", ".join(f"{name} {before}->{after}" for name, (before, after) in stats["counts"].items())
+        print(f"\n=== CFG (-O {options.opt_level}): {stats['unreachable_blocks']} unreachable blocks, "
+              f"{stats['dead_stores']} dead stores, {stats['jumps_removed']} jumps removed by layout "
+              f"(instructions: {counts}) ===")
+        stats = report["peephole"]
+        print(f"\n=== Peephole (-O {options.opt_level}): removed {stats['removed']} instructions, "
+              f"threaded {stats['threaded']} jumps, {stats['dup_stores']} store/load pairs -> DUP_TOP, "
+              f"{report['superinstructions']['fused']} superinstructions ===")
+        for instr in bytecode:
+            print(instr)
+
+    # === 링크 (레이블 -> 절대 PC, 상수/이름 풀)
+    code = link(bytecode)
+    print("\n=== Linked Code ===")
+    print(f"consts={code.consts} names={code.names}")
+    for line in code.disassemble():
+        print(line)
+
+    # === 검증 (스택 깊이)
+    from verifier import verify
+    if verify(code):
+        entries = {f.entry: f.name for f in code.functions}
+        depths = ", ".join(f"{entries.get(pc, '<main>')}={depth}" for pc, depth in code.max_stack.items())
+        print(f"\n=== Verified: max stack depth {depths} ===")
+    else:
+        print(f"\n=== Not verified ({code.verify_error}): running with stack checks ===")
 
-print("\n=== Bytecode ===")
-for instr in codegen.code:
-    print(instr)
+    # === VM 실행
+    print("\n=== VM Result ===")
+    if options.engine == "closure":
+        from closure_engine import ClosureEngine
+        ClosureEngine().run(ast)
+        return
+    if options.engine == "register":
+        import register_vm
+        register_code = register_vm.compile_program(ast)
+        if options.trace:
+            for line in register_code.disassemble():
+                print(line)
+        register_vm.RegisterVM().run(register_code)
+        return
+    if options.engine == "transpile":
+        import transpiler
+        try:
+            source, main = transpiler.compile_program(codegen.code)
+        except transpiler.TranslationError as e:
+            print(f"[transpile] fallback to table engine: {e}")
+            VirtualMachine().run(code)
+            return
+        if options.trace:
+            print(source)
+        transpiler.run_compiled(main)
+        return
+    hooks = [DebugTracer()] if options.trace else []
+    jit = make_jit(options)
+    memo = make_memo(options)
+    vm = VirtualMachine(engine=options.engine, hooks=hooks, jit=jit, quicken=options.quicken, memo=memo)
+    vm.run(code)
+    report_jit(options, jit)
+    report_quickening(options, vm)
+    report_memo(options, memo)
 
-# === VM 실행
-print("\n=== VM Result ===")
-vm = VirtualMachine()
-vm.run(codegen.code)
+if __name__ == "__main__":
+    main()
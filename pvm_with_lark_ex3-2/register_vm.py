@@ -0,0 +1,451 @@
+# === 레지스터 기반 VM (Register-based backend) ===
+# 스택 VM은 BinOp마다 피연산자를 Frame.stack에 push/pop 합니다 (a + b: LOAD, LOAD, BINARY_ADD, STORE).
+# 이 백엔드는 pvm_ast를 3-주소 명령어로 컴파일합니다: ADD r3, r1, r2
+#
+# 레지스터 배치 (함수마다 컴파일 시점에 할당):
+#   - 함수 프레임: r0..r(n-1) = 지역 변수 슬롯 (code_gen.function_locals 순서, 파라미터가 앞쪽), 그 뒤는 임시 레지스터
+#   - 메인 코드: 모든 레지스터가 임시 레지스터. 전역 변수는 names 풀 인덱스로 접근 (LOADG/STOREG)
+#   - 임시 레지스터는 문장이 끝나면 모두 반납되므로 레지스터 수는 가장 복잡한 식 하나로 정해집니다.
+#   - 지역 변수 레지스터는 복사 없이 바로 피연산자가 되고, 지역 변수에 대입하는 식은 결과를 그 레지스터에 바로 씁니다.
+#     (함수 안의 i = i - 1은 SUBK r0, r0, 1 명령어 하나)
+#
+# 명령어는 (opcode, a, b, c) 튜플이며, 상수는 풀 인덱스 대신 튜플 안에 값 그대로 들어갑니다 (immediate).
+#   LOADK  dst, value        MOVE   dst, src          CHECKL reg             (대입 전일 수 있는 지역 변수 확인)
+#   LOADG  dst, name         STOREG name, src
+#   ADD/SUB/MUL    dst, x, y        ADDK/SUBK/MULK dst, x, value
+#   PRINT  src               JUMP   target            JUMPF  src, target     (R[src]가 거짓이면 점프)
+#   DEFN   func              CALL   dst, call, base   (인자는 R[base..base+argc), calls[call] = (name, argc))
+#   TAILCALL call, base      (함수 안의 return f(...): 현재 프레임의 레지스터 파일을 callee 것으로 바꿈, 스택 VM의 TAIL_CALL)
+#   RET    src               RETNONE                  HALT
+#
+# 실행 결과는 스택 VM과 같습니다 (스코프 규칙, 오류 메시지, 인자 -> 함수 조회 순서).
+# 중첩 def는 바깥 함수가 DEFN을 실행할 때 등록만 되고 바디는 따로 컴파일됩니다 (code_gen의 DEF_FUNC와 같은 의미).
+
+from code_gen import function_locals
+from pvm_ast import Assign, Print, BinOp, Var, Number, If, While, FuncDef, FuncCall, Return
+from vm import UNBOUND
+
+OPNAMES = ["LOADK", "MOVE", "CHECKL", "LOADG", "STOREG", "ADD", "SUB", "MUL", "ADDK", "SUBK", "MULK",
+           "PRINT", "JUMP", "JUMPF", "DEFN", "CALL", "TAILCALL", "RET", "RETNONE", "HALT"]
+(LOADK, MOVE, CHECKL, LOADG, STOREG, ADD, SUB, MUL, ADDK, SUBK, MULK,
+ PRINT, JUMP, JUMPF, DEFN, CALL, TAILCALL, RET, RETNONE, HALT) = range(len(OPNAMES))
+
+BINOPS = {'+': (ADD, ADDK), '-': (SUB, SUBK), '*': (MUL, MULK)}
+
+class RegFunction:
+    def __init__(self, name, name_index, params, varnames):
+        self.name = name
+        self.name_index = name_index
+        self.params = params
+        self.varnames = varnames  # 지역 변수 레지스터 이름 (오류 메시지용)
+        self.entry = None         # 바디 시작 PC (바디를 컴파일할 때 정해짐)
+        self.padding = ()         # 인자 뒤에 붙일 초기값: 나머지 지역 변수는 UNBOUND, 임시 레지스터는 None
+    def __repr__(self): return f"RegFunction({self.name}, {self.params}, entry={self.entry}, regs={len(self.params) + len(self.padding)})"
+
+class RegisterCode:
+    def __init__(self, code, names, functions, calls, main_registers):
+        self.code = code                      # (opcode, a, b, c) 튜플 리스트
+        self.names = names                    # 전역 변수/함수 이름 풀
+        self.functions = functions            # RegFunction 리스트 (DEFN 피연산자)
+        self.calls = calls                    # (name_index, argc) 리스트 (CALL 피연산자)
+        self.main_registers = main_registers  # 메인 프레임의 레지스터 수
+
+    def __len__(self):
+        return len(self.code)
+
+    def instruction(self, pc):
+        """사람이 읽을 수 있는 명령어 문자열 (오류 메시지/디스어셈블용)"""
+        op, a, b, c = self.code[pc]
+        name = OPNAMES[op]
+        if op == LOADK:
+            fields = [f"r{a}", repr(b)]
+        elif op == MOVE:
+            fields = [f"r{a}", f"r{b}"]
+        elif op in (CHECKL, PRINT, RET):
+            fields = [f"r{a}"]
+        elif op == LOADG:
+            fields = [f"r{a}", self.names[b]]
+        elif op == STOREG:
+            fields = [self.names[a], f"r{b}"]
+        elif op in (ADD, SUB, MUL):
+            fields = [f"r{a}", f"r{b}", f"r{c}"]
+        elif op in (ADDK, SUBK, MULK):
+            fields = [f"r{a}", f"r{b}", repr(c)]
+        elif op == JUMP:
+            fields = [f"@{a}"]
+        elif op == JUMPF:
+            fields = [f"r{a}", f"@{b}"]
+        elif op == DEFN:
+            fields = [self.functions[a].name]
+        elif op == CALL:
+            name_index, argc = self.calls[b]
+            args = ", ".join(f"r{c + i}" for i in range(argc))
+            fields = [f"r{a}", f"{self.names[name_index]}({args})"]
+        elif op == TAILCALL:
+            name_index, argc = self.calls[a]
+            fields = [f"{self.names[name_index]}({', '.join(f'r{b + i}' for i in range(argc))})"]
+        else:
+            fields = []
+        return f"{name} {', '.join(fields)}".rstrip()
+
+    def disassemble(self):
+        entries = {f.entry: f.name for f in self.functions}
+        lines = []
+        for pc in range(len(self.code)):
+            if pc in entries:
+                lines.append(f"{entries[pc]}:")
+            lines.append(f"  {pc:4d} {self.instruction(pc)}")
+        return lines
+
+class RegisterCompiler:
+    def __init__(self):
+        self.code = []
+        self.names, self.name_index = [], {}
+        self.functions = []
+        self.calls, self.call_index = [], {}
+        self.pending = []        # 아직 바디를 컴파일하지 않은 (FuncDef, RegFunction)
+        self.slots = None        # 함수 안이면 {지역 변수 이름: 레지스터}, 메인 코드면 None
+        self.assigned = set()    # 현재 위치에서 반드시 값이 있는 지역 변수 (CHECKL 생략)
+        self.next_reg = 0        # 다음 임시 레지스터
+        self.first_temp = 0      # 임시 레지스터 시작 번호 (= 지역 변수 수)
+        self.max_reg = 0
+
+    def emit(self, op, a=0, b=0, c=0):
+        self.code.append((op, a, b, c))
+        return len(self.code) - 1
+
+    def patch(self, pc, **fields):
+        op, a, b, c = self.code[pc]
+        self.code[pc] = (op, fields.get("a", a), fields.get("b", b), fields.get("c", c))
+
+    def intern_name(self, name):
+        if name not in self.name_index:
+            self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return self.name_index[name]
+
+    def alloc(self):
+        reg = self.next_reg
+        self.next_reg += 1
+        self.max_reg = max(self.max_reg, self.next_reg)
+        return reg
+
+    # === 프로그램/함수 ===
+
+    def compile_program(self, stmts):
+        # 최상위 def는 CodeGenerator처럼 먼저 등록
+        for stmt in stmts:
+            if isinstance(stmt, FuncDef):
+                self.compile_stmt(stmt)
+        self.compile_block([s for s in stmts if not isinstance(s, FuncDef)])
+        self.emit(HALT)
+        main_registers = self.max_reg
+        while self.pending:
+            self.compile_function(*self.pending.pop(0))
+        return RegisterCode(self.code, self.names, self.functions, self.calls, main_registers)
+
+    def compile_function(self, node, func):
+        self.slots = {name: reg for reg, name in enumerate(func.varnames)}
+        self.assigned = set(node.params)
+        self.first_temp = self.next_reg = self.max_reg = len(func.varnames)
+        func.entry = len(self.code)
+        self.compile_block(node.body)
+        self.emit(RETNONE)  # 바디가 return 없이 끝나면 None 반환
+        n_temps = self.max_reg - len(func.varnames)
+        func.padding = (UNBOUND,) * (len(func.varnames) - len(node.params)) + (None,) * n_temps
+
+    # === 문장 ===
+
+    def compile_block(self, stmts):
+        for stmt in stmts:
+            self.compile_stmt(stmt)
+            self.next_reg = self.first_temp  # 문장이 끝나면 임시 레지스터 반납
+
+    def compile_stmt(self, stmt):
+        if isinstance(stmt, Assign):
+            if self.slots is not None:
+                self.compile_expr(stmt.expr, self.slots[stmt.name])
+                self.assigned.add(stmt.name)
+            else:
+                self.emit(STOREG, self.intern_name(stmt.name), self.compile_expr(stmt.expr))
+        elif isinstance(stmt, Print):
+            self.emit(PRINT, self.compile_expr(stmt.expr))
+        elif isinstance(stmt, Return):
+            if self.slots is not None and isinstance(stmt.value, FuncCall):
+                self.emit(TAILCALL, *self.compile_arguments(stmt.value))
+            else:
+                self.emit(RET, self.compile_expr(stmt.value))
+        elif isinstance(stmt, If):
+            jump_else = self.emit(JUMPF, self.compile_expr(stmt.cond))
+            before = set(self.assigned)
+            self.compile_block(stmt.then_block)
+            after_then = self.assigned
+            if stmt.else_block:
+                jump_end = self.emit(JUMP)
+                self.patch(jump_else, b=len(self.code))
+                self.assigned = set(before)
+                self.compile_block(stmt.else_block)
+                self.patch(jump_end, a=len(self.code))
+                self.assigned &= after_then
+            else:
+                self.patch(jump_else, b=len(self.code))
+                self.assigned = before
+        elif isinstance(stmt, While):
+            head = len(self.code)
+            jump_end = self.emit(JUMPF, self.compile_expr(stmt.cond))
+            before = set(self.assigned)
+            self.compile_block(stmt.body)
+            self.emit(JUMP, head)
+            self.patch(jump_end, b=len(self.code))
+            self.assigned = before  # 바디가 한 번도 실행되지 않을 수 있음
+        elif isinstance(stmt, FuncDef):
+            func = RegFunction(stmt.name, self.intern_name(stmt.name), stmt.params, function_locals(stmt))
+            self.functions.append(func)
+            self.pending.append((stmt, func))
+            self.emit(DEFN, len(self.functions) - 1)
+        else:
+            raise NotImplementedError(f"Unknown statement: {stmt}")
+
+    # === 식: 결과가 들어 있는 레지스터를 돌려줌. dst가 있으면 결과를 dst에 씀 ===
+
+    def compile_expr(self, node, dst=None):
+        if isinstance(node, Number):
+            reg = self.alloc() if dst is None else dst
+            self.emit(LOADK, reg, node.value)
+            return reg
+        if isinstance(node, Var):
+            return self.compile_var(node.name, dst)
+        if isinstance(node, BinOp):
+            return self.compile_binop(node, dst)
+        if isinstance(node, FuncCall):
+            return self.compile_call(node, dst)
+        raise NotImplementedError(f"Unknown expr: {node}")
+
+    def compile_var(self, name, dst):
+        if self.slots is not None and name in self.slots:
+            reg = self.slots[name]
+            if name not in self.assigned:
+                self.emit(CHECKL, reg)
+                self.assigned.add(name)  # 확인을 통과했으면 이후로는 값이 있음
+            if dst is not None and dst != reg:
+                self.emit(MOVE, dst, reg)
+                return dst
+            return reg
+        reg = self.alloc() if dst is None else dst
+        self.emit(LOADG, reg, self.intern_name(name))
+        return reg
+
+    def compile_binop(self, node, dst):
+        if node.op not in BINOPS:
+            raise NotImplementedError(f"Unknown operator: {node.op}")
+        op, op_k = BINOPS[node.op]
+        mark = self.next_reg
+        left = self.compile_expr(node.left)
+        if isinstance(node.right, Number):
+            self.next_reg = mark  # 피연산자 임시 레지스터는 결과 레지스터로 재사용 가능
+            reg = self.alloc() if dst is None else dst
+            self.emit(op_k, reg, left, node.right.value)
+            return reg
+        right = self.compile_expr(node.right)
+        self.next_reg = mark
+        reg = self.alloc() if dst is None else dst
+        self.emit(op, reg, left, right)
+        return reg
+
+    def compile_call(self, node, dst):
+        mark = self.next_reg
+        call, base = self.compile_arguments(node)
+        self.next_reg = mark
+        reg = self.alloc() if dst is None else dst  # 인자는 호출할 때 복사되므로 base를 결과로 써도 됨
+        self.emit(CALL, reg, call, base)
+        return reg
+
+    def compile_arguments(self, node):
+        """인자를 연속된 임시 레지스터에 계산. 반환값: (calls 인덱스, 첫 인자 레지스터)"""
+        argc = len(node.args)
+        base = self.next_reg
+        for _ in range(argc):
+            self.alloc()
+        for i, arg in enumerate(node.args):
+            self.compile_expr(arg, base + i)
+            self.next_reg = base + argc  # 인자 계산에 쓴 임시 레지스터 반납
+        key = (self.intern_name(node.name), argc)
+        if key not in self.call_index:
+            self.call_index[key] = len(self.calls)
+            self.calls.append(key)
+        return self.call_index[key], base
+
+class RegFrame:
+    __slots__ = ("regs", "pc", "ret", "varnames")
+
+    def __init__(self, regs, pc, ret, varnames):
+        self.regs = regs          # 레지스터 파일 (지역 변수 + 임시)
+        self.pc = pc
+        self.ret = ret            # 반환값을 받을 caller 레지스터
+        self.varnames = varnames  # 지역 변수 레지스터 이름
+
+class RegisterVM:
+    def __init__(self):
+        self.frames = []
+        self.code = None
+        self.global_slots = []
+        self.functions = []
+        self.handlers = self.build_handler_table()
+
+    def build_handler_table(self):
+        table = [None] * len(OPNAMES)
+        for op, name in enumerate(OPNAMES):
+            table[op] = getattr(self, f"op_{name.lower()}")
+        return table
+
+    def load(self, code):
+        self.code = code
+        self.global_slots = [UNBOUND] * len(code.names)
+        self.functions = [None] * len(code.names)
+        self.frames = [RegFrame([None] * code.main_registers, 0, None, ())]
+
+    def report_error(self, frame, error):
+        pc = frame.pc - 1
+        print(f"VM Error in FRAME={len(self.frames) - 1} PC={pc}, INSTR={self.code.instruction(pc)}: {error}")
+
+    def run(self, code):
+        """RegisterCode 실행"""
+        self.load(code)
+        instructions = code.code
+        handlers = self.handlers
+        frames = self.frames
+        frame = frames[0]
+        try:
+            while frames:
+                frame = frames[-1]
+                pc = frame.pc
+                frame.pc = pc + 1
+                op, a, b, c = instructions[pc]
+                handlers[op](frame, a, b, c)
+        except Exception as e:
+            self.report_error(frame, e)
+
+    def count_instructions(self, code):
+        """run과 같지만 실행된 명령어 수를 돌려줌 (벤치마크용)"""
+        self.load(code)
+        instructions = code.code
+        handlers = self.handlers
+        frames = self.frames
+        frame = frames[0]
+        executed = 0
+        try:
+            while frames:
+                frame = frames[-1]
+                pc = frame.pc
+                frame.pc = pc + 1
+                op, a, b, c = instructions[pc]
+                executed += 1
+                handlers[op](frame, a, b, c)
+        except Exception as e:
+            self.report_error(frame, e)
+        return executed
+
+    def op_loadk(self, frame, dst, value, _):
+        frame.regs[dst] = value
+
+    def op_move(self, frame, dst, src, _):
+        regs = frame.regs
+        regs[dst] = regs[src]
+
+    def op_checkl(self, frame, reg, _, __):
+        if frame.regs[reg] is UNBOUND:
+            raise RuntimeError(f"Undefined variable: {frame.varnames[reg]}")
+
+    def op_loadg(self, frame, dst, index, _):
+        value = self.global_slots[index]
+        if value is UNBOUND:
+            raise RuntimeError(f"Undefined variable: {self.code.names[index]}")
+        frame.regs[dst] = value
+
+    def op_storeg(self, frame, index, src, _):
+        self.global_slots[index] = frame.regs[src]
+
+    def op_add(self, frame, dst, x, y):
+        regs = frame.regs
+        regs[dst] = regs[x] + regs[y]
+
+    def op_sub(self, frame, dst, x, y):
+        regs = frame.regs
+        regs[dst] = regs[x] - regs[y]
+
+    def op_mul(self, frame, dst, x, y):
+        regs = frame.regs
+        regs[dst] = regs[x] * regs[y]
+
+    def op_addk(self, frame, dst, x, value):
+        regs = frame.regs
+        regs[dst] = regs[x] + value
+
+    def op_subk(self, frame, dst, x, value):
+        regs = frame.regs
+        regs[dst] = regs[x] - value
+
+    def op_mulk(self, frame, dst, x, value):
+        regs = frame.regs
+        regs[dst] = regs[x] * value
+
+    def op_print(self, frame, src, _, __):
+        print(f"OUTPUT: {frame.regs[src]}")
+
+    def op_jump(self, frame, target, _, __):
+        frame.pc = target
+
+    def op_jumpf(self, frame, src, target, _):
+        if not frame.regs[src]:
+            frame.pc = target
+
+    def op_defn(self, frame, index, _, __):
+        func = self.code.functions[index]
+        self.functions[func.name_index] = func
+
+    def op_call(self, frame, dst, call, base):
+        func, argc = self.find_function(call)
+        regs = frame.regs[base:base + argc]
+        regs += func.padding
+        self.frames.append(RegFrame(regs, func.entry, dst, func.varnames))
+
+    def op_tailcall(self, frame, call, base, _):
+        # 반환값을 받을 레지스터(frame.ret)는 그대로: callee의 RET이 원래 caller에게 씀
+        func, argc = self.find_function(call)
+        regs = frame.regs[base:base + argc]
+        regs += func.padding
+        frame.regs = regs
+        frame.pc = func.entry
+        frame.varnames = func.varnames
+
+    def find_function(self, call):
+        name_index, argc = self.code.calls[call]
+        func = self.functions[name_index]
+        if func is None:
+            raise RuntimeError(f"Undefined function: {self.code.names[name_index]}")
+        if len(func.params) != argc:
+            raise RuntimeError(f"Argument count mismatch in call to {func.name}. Expected {len(func.params)}, got {argc}")
+        return func, argc
+
+    def op_ret(self, frame, src, _, __):
+        frames = self.frames
+        frames.pop()
+        if frames:
+            frames[-1].regs[frame.ret] = frame.regs[src]
+
+    def op_retnone(self, frame, _, __, ___):
+        frames = self.frames
+        frames.pop()
+        if frames:
+            frames[-1].regs[frame.ret] = None
+
+    def op_halt(self, frame, _, __, ___):
+        self.frames.pop()
+
+def compile_program(stmts):
+    """편의 함수: AST 문장 리스트 -> RegisterCode"""
+    return RegisterCompiler().compile_program(stmts)
+
+def run(stmts):
+    """편의 함수: AST 문장 리스트를 레지스터 VM으로 실행"""
+    RegisterVM().run(compile_program(stmts))
@@ -0,0 +1,137 @@
+# === Green thread 스케줄러 (협력형, 한 프로세스/한 스레드) ===
+# VirtualMachine.run()은 프로그램 하나를 끝까지 실행하므로 긴 스크립트가 다른 스크립트를 모두 막습니다.
+# Scheduler는 프로그램마다 VirtualMachine 하나(자신의 프레임 스택, 전역 슬롯, 함수 테이블)를 Task로 들고,
+# 매번 Task 하나를 골라 명령어를 quantum개까지 실행한 뒤 (vm.run_steps) 다음 Task로 바꿉니다.
+#   - round_robin: 준비된 Task를 deque 순서대로 돌아가며 실행 (quantum을 다 쓴 Task는 맨 뒤로)
+#   - priority:    priority가 가장 큰 Task부터 실행하고, 같은 priority끼리는 round robin.
+#                  더 높은 priority의 Task가 남아 있으면 낮은 Task는 실행되지 않습니다 (strict priority)
+# while 루프도 quantum마다 끊기므로 (preemption) 긴 루프가 있는 스크립트도 다른 Task를 막지 않습니다.
+# Task의 PRINT/오류 출력은 그 Task의 TaskOutput에 모이고, echo=True면 slice가 끝날 때마다 "[이름] " 접두사로 출력됩니다.
+# 전환 비용은 deque/heap 연산과 sys.stdout 교체뿐이며, 같은 CodeObject를 여러 Task가 공유할 수 있습니다.
+# JIT과 훅은 사용할 수 없습니다 (VirtualMachine.start 참고). quickening과 메모이제이션은 Task의 VM에 설정하면 됩니다.
+
+import heapq
+import sys
+from collections import deque
+from itertools import count
+
+from vm import VirtualMachine
+
+POLICIES = ("round_robin", "priority")
+QUANTUM = 1000  # 기본 time slice (명령어 수)
+
+class TaskOutput:
+    """Task 하나의 stdout (print가 쓰는 write/flush만 있는 가벼운 버퍼)"""
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+class Task:
+    __slots__ = ("name", "vm", "priority", "output", "instructions", "slices", "done")
+
+    def __init__(self, name, vm, priority):
+        self.name = name
+        self.vm = vm                # 이 Task의 프로그램 상태 전체 (start()로 로드된 VirtualMachine)
+        self.priority = priority
+        self.output = TaskOutput()  # PRINT 출력과 VM Error 메시지
+        self.instructions = 0       # 실행한 명령어 수
+        self.slices = 0             # 받은 time slice 수
+        self.done = False
+
+    def lines(self):
+        return self.output.getvalue().splitlines()
+
+    def __repr__(self): return f"Task({self.name}, priority={self.priority}, done={self.done})"
+
+class Scheduler:
+    def __init__(self, quantum=QUANTUM, policy="round_robin", echo=False):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy} (expected one of {POLICIES})")
+        if quantum < 1:
+            raise ValueError("quantum must be at least 1 instruction")
+        self.quantum = quantum
+        self.policy = policy
+        self.echo = echo         # slice마다 새 출력을 "[이름] ..."으로 stdout에 출력
+        self.tasks = []          # spawn된 모든 Task (끝난 Task 포함)
+        self.ready = deque()     # round_robin: 실행할 Task 순서
+        self.heap = []           # priority: (-priority, 순번, Task)
+        self.order = count()     # 같은 priority 안에서 먼저 들어온 Task가 먼저
+        self.switches = 0        # 실행한 time slice 수 (context switch)
+
+    def spawn(self, code, name=None, priority=0, inputs=None, vm=None):
+        """
+        code(CodeObject 또는 레이블 포함 튜플 바이트코드)를 새 Task로 등록하고 돌려줌.
+        vm을 넘기면 그 VirtualMachine(예: quicken=True)으로 실행합니다. 링크와 검증은 여기서 한 번 합니다.
+        """
+        vm = vm if vm is not None else VirtualMachine()
+        task = Task(name if name is not None else f"task{len(self.tasks)}", vm, priority)
+        saved = sys.stdout
+        sys.stdout = task.output
+        try:
+            vm.start(code, inputs)
+        finally:
+            sys.stdout = saved
+        self.tasks.append(task)
+        self.push(task)
+        return task
+
+    def push(self, task):
+        if self.policy == "round_robin":
+            self.ready.append(task)
+        else:
+            heapq.heappush(self.heap, (-task.priority, next(self.order), task))
+
+    def pop(self):
+        if self.policy == "round_robin":
+            return self.ready.popleft() if self.ready else None
+        return heapq.heappop(self.heap)[2] if self.heap else None
+
+    def step(self):
+        """Task 하나에 time slice 하나를 줌. 실행한 Task (준비된 Task가 없으면 None)"""
+        task = self.pop()
+        if task is None:
+            return None
+        vm = task.vm
+        output = task.output
+        mark = len(output.parts)
+        saved = sys.stdout
+        sys.stdout = output
+        try:
+            task.instructions += vm.run_steps(self.quantum)
+        finally:
+            sys.stdout = saved
+        task.slices += 1
+        self.switches += 1
+        if vm.frames:
+            self.push(task)
+        else:
+            task.done = True
+        if self.echo and len(output.parts) > mark:
+            for line in "".join(output.parts[mark:]).splitlines():
+                print(f"[{task.name}] {line}")
+        return task
+
+    def run(self):
+        """모든 Task가 끝날 때까지 실행"""
+        while self.step() is not None:
+            pass
+
+    def stats(self):
+        return {"tasks": len(self.tasks), "done": sum(task.done for task in self.tasks), "switches": self.switches,
+                "instructions": sum(task.instructions for task in self.tasks)}
+
+def run_all(codes, quantum=QUANTUM, policy="round_robin"):
+    """편의 함수: 바이트코드 여러 개를 green thread로 번갈아 실행하고 Task별 출력 줄 리스트를 돌려줌"""
+    scheduler = Scheduler(quantum, policy)
+    tasks = [scheduler.spawn(code) for code in codes]
+    scheduler.run()
+    return [task.lines() for task in tasks]
@@ -0,0 +1,77 @@
+# === Superinstructions (peephole 다음, 링크 전) ===
+# 자주 연달아 실행되는 명령어 묶음을 opcodes.SUPERINSTRUCTIONS의 opcode 하나로 합칩니다.
+# 묶음 하나가 디스패치 루프를 한 번만 거치므로 소스 문장당 디스패치 수가 줄어듭니다.
+#   - 레이블이 끼어 있는 묶음은 합치지 않습니다 (묶음 중간으로 점프하는 코드가 생기지 않음).
+#   - 명령어 수(= 디스패치 수)가 가장 적어지는 분할을 동적 계획법으로 고릅니다.
+#     (앞에서부터 탐욕적으로 합치면 a + b * 2에서 LOAD a; LOAD b를 먼저 합쳐 b * 2를 놓침)
+#   - 합쳐진 명령어의 피연산자는 구성 명령어 중 피연산자가 있는 것들의 튜플입니다.
+#     예: LOAD_GLOBAL i; LOAD_CONST 1; BINARY_SUB; STORE_GLOBAL i
+#         -> ("LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL", ("i", 1, "i"))
+
+from opcodes import SUPERINSTRUCTIONS
+
+# 피연산자가 있는 구성 명령어
+OPERAND_OPS = ("LOAD_CONST", "LOAD_NAME", "STORE_NAME", "LOAD_FAST", "STORE_FAST",
+               "LOAD_GLOBAL", "STORE_GLOBAL", "JUMP_IF_FALSE", "JUMP")
+
+# 첫 opcode -> 그 opcode로 시작하는 (이름, 구성 명령어) 목록, 긴 것부터
+PATTERNS = {}
+for _name, _parts in sorted(SUPERINSTRUCTIONS.items(), key=lambda item: -len(item[1])):
+    PATTERNS.setdefault(_parts[0], []).append((_name, _parts))
+
+class SuperinstructionFuser:
+    def __init__(self):
+        self.fused = {}  # superinstruction 이름 -> 만들어진 횟수
+
+    def fuse(self, code):
+        # best[i] = code[i:]를 실행하는 최소 명령어 수, choice[i] = 그때 i에서 고른 superinstruction
+        n = len(code)
+        best = [0] * (n + 1)
+        choice = [None] * n
+        for i in range(n - 1, -1, -1):
+            best[i] = best[i + 1] + 1
+            for name, parts in self.matches_at(code, i):
+                if best[i + len(parts)] + 1 < best[i]:
+                    best[i] = best[i + len(parts)] + 1
+                    choice[i] = (name, parts)
+        result = []
+        i = 0
+        while i < n:
+            if choice[i] is None:
+                result.append(code[i])
+                i += 1
+                continue
+            name, parts = choice[i]
+            window = code[i:i + len(parts)]
+            operands = tuple(instr[1] if len(instr) > 1 else None
+                             for instr in window if instr[0] in OPERAND_OPS)
+            result.append((name, operands))
+            self.fused[name] = self.fused.get(name, 0) + 1
+            i += len(parts)
+        return result
+
+    def matches_at(self, code, i):
+        """code[i]부터 시작하는 superinstruction 후보들 (긴 것부터)"""
+        for name, parts in PATTERNS.get(code[i][0], ()):
+            if i + len(parts) <= len(code) and all(code[i + k][0] == part for k, part in enumerate(parts)):
+                yield name, parts
+
+    def stats(self):
+        return {"fused": sum(self.fused.values()), "by_name": dict(self.fused)}
+
+def expand(code):
+    """합쳐진 명령어를 구성 명령어로 되돌림 (switch 참조 엔진 등 기본 opcode만 아는 도구용)"""
+    result = []
+    for instr in code:
+        parts = SUPERINSTRUCTIONS.get(instr[0])
+        if parts is None:
+            result.append(instr)
+            continue
+        operands = iter(instr[1])
+        for part in parts:
+            result.append((part, next(operands)) if part in OPERAND_OPS else (part,))
+    return result
+
+def fuse(code):
+    """편의 함수: 튜플 바이트코드 -> superinstruction이 적용된 튜플 바이트코드"""
+    return SuperinstructionFuser().fuse(code)
@@ -0,0 +1,92 @@
+# === VM 트레이싱 훅 (Tracing hooks) ===
+# VirtualMachine(hooks=[...]) 또는 vm.add_hook(...)으로 붙입니다.
+# 훅이 하나도 없으면 VM은 트레이싱 코드가 전혀 없는 루프로 실행됩니다 (production mode).
+
+class Tracer:
+    """
+    모든 훅 메서드의 기본 구현 (아무것도 하지 않음).
+    필요한 메서드만 override 해서 사용합니다.
+    """
+    def on_instruction(self, vm, frame_index, pc, instr, frame):
+        """명령어 실행 직전. instr는 레이블이 제거된 (op, arg) 튜플"""
+
+    def on_call(self, vm, func_name, frame):
+        """CALL_FUNCTION이 새 프레임을 push한 직후. frame은 callee 프레임 (TAIL_CALL이면 재사용된 현재 프레임)"""
+
+    def on_return(self, vm, value, frame):
+        """RETURN이 frame을 pop한 직후. value는 caller에게 전달된 반환값"""
+
+    def on_frame_pop(self, vm, frame):
+        """RETURN 없이 코드 끝에 도달한 frame이 pop된 직후"""
+
+
+class DebugTracer(Tracer):
+    """예전 VM이 항상 출력하던 [DEBUG] 라인을 그대로 출력하는 트레이서"""
+    def on_instruction(self, vm, frame_index, pc, instr, frame):
+        op = instr[0]
+        arg = instr[1] if len(instr) > 1 else None
+        stack_top_str = str(frame.stack[-1]) if frame.stack else "EMPTY"
+        print(f"[DEBUG] EXEC: PC={pc} FRAME={frame_index} INSTR=({op}, {arg if arg is not None else ''}) STACK_TOP={stack_top_str}")
+
+    def on_return(self, vm, value, frame):
+        if not vm.frames:
+            print(f"[DEBUG] RETURN: Last frame returned. Value: {value}")
+
+    def on_frame_pop(self, vm, frame):
+        if not vm.frames:
+            print("[DEBUG] VM execution finished: All frames popped.")
+        else:
+            print(f"[DEBUG] FRAME_POP: Popped frame. Current frame is now Frame {len(vm.frames) - 1}.")
+
+
+class InstructionCounter(Tracer):
+    """실행된 명령어 수와 함수 호출 수를 세는 간단한 프로파일러"""
+    def __init__(self):
+        self.instructions = 0
+        self.calls = 0
+        self.by_opcode = {}
+
+    def on_instruction(self, vm, frame_index, pc, instr, frame):
+        self.instructions += 1
+        op = instr[0]
+        self.by_opcode[op] = self.by_opcode.get(op, 0) + 1
+
+    def on_call(self, vm, func_name, frame):
+        self.calls += 1
+
+
+class OpcodePairProfiler(Tracer):
+    """
+    같은 프레임에서 연달아(pc, pc+1) 실행된 opcode 쌍과 3개짜리 묶음의 빈도를 기록합니다.
+    점프나 호출로 끊긴 순서는 세지 않으므로, 결과는 그대로 superinstruction 후보가 됩니다.
+    """
+    def __init__(self):
+        self.pairs = {}
+        self.triples = {}
+        self.last = {}  # frame id -> (prev2_op, prev_op, prev_pc)
+
+    def on_instruction(self, vm, frame_index, pc, instr, frame):
+        op = instr[0]
+        key = id(frame)
+        prev2, prev, prev_pc = self.last.get(key, (None, None, -2))
+        if prev_pc + 1 != pc:
+            prev2 = prev = None
+        if prev is not None:
+            pair = (prev, op)
+            self.pairs[pair] = self.pairs.get(pair, 0) + 1
+            if prev2 is not None:
+                triple = (prev2, prev, op)
+                self.triples[triple] = self.triples.get(triple, 0) + 1
+        self.last[key] = (prev, op, pc)
+
+    def on_return(self, vm, value, frame):
+        self.last.pop(id(frame), None)
+
+    def on_frame_pop(self, vm, frame):
+        self.last.pop(id(frame), None)
+
+    def top_pairs(self, n=10):
+        return sorted(self.pairs.items(), key=lambda item: -item[1])[:n]
+
+    def top_triples(self, n=10):
+        return sorted(self.triples.items(), key=lambda item: -item[1])[:n]
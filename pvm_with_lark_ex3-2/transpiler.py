@@ -0,0 +1,382 @@
+# === 바이트코드 -> CPython 트랜스파일러 ===
+# CodeGenerator가 만든 (레이블 포함) 바이트코드와 DEF_FUNC 테이블을 Python 소스로 바꾼 뒤
+# compile()/exec()로 실행합니다. 사용자 함수는 진짜 Python 함수가 되고 while/if는 Python 제어문이 됩니다.
+#
+# 변환 규칙:
+#   - 스택은 컴파일 시점에 심볼릭하게 흉내 내어 식(expression) 문자열로 바꿉니다.
+#   - 제어 흐름은 CodeGenerator의 패턴만 구조화합니다.
+#       if    : cond; JUMP_IF_FALSE E; then; JUMP X; LABEL E; else; LABEL X
+#       while : LABEL S; cond; JUMP_IF_FALSE E; body; JUMP S; LABEL E
+#       def   : (맨 앞) DEF_FUNC ...; (본문 사이) JUMP end; LABEL f; body; LABEL end
+#   - 이름 앞에 접두사를 붙여 Python 내장 이름/키워드와 겹치지 않게 합니다 (변수 v_, 함수 fn_).
+#     지역/전역 구분은 code_gen.py 규칙과 Python 규칙이 같습니다 (함수 안에서 대입되는 이름은 지역).
+#   - 자기 자신을 부르는 TAIL_CALL은 함수 바디를 감싼 while True 루프에서 파라미터를 다시 대입하고 continue하는
+#     코드가 됩니다 (VM처럼 프레임 하나, 파라미터가 아닌 지역 변수는 다시 대입 전 상태로 되돌림).
+#     다른 함수로의 TAIL_CALL은 return f(...)입니다.
+#   - Python 호출은 재귀 한도(sys.getrecursionlimit)가 있지만 VM의 프레임 스택은 한도가 없습니다.
+#     그래서 위의 꼬리 재귀를 뺀 호출 그래프에 순환(재귀, 상호 재귀)이 있으면 변환하지 않습니다 (TranslationError).
+#   - 호출할 함수는 링크 시점처럼 DEF_FUNC 테이블로 정적으로 정합니다. 없는 함수나 인자 수가 틀린 호출은
+#     인자를 계산한 뒤 VM과 같은 메시지의 RuntimeError를 내는 코드가 됩니다.
+#   - 오류는 "VM Error: <메시지>"로 출력합니다 (closure_engine.py와 같음, PC 정보는 없음).
+#
+# 위 패턴에 맞지 않는 코드(중첩 def, peephole로 모양이 바뀐 점프, LOAD_NAME, 재귀 등)는 TranslationError를 내고
+# run()은 그 프로그램을 VirtualMachine으로 실행합니다 (fallback).
+
+import re
+
+from superinstructions import expand
+from vm import VirtualMachine
+
+class TranslationError(Exception):
+    """구조화할 수 없는 바이트코드 (인터프리터로 fallback)"""
+
+BINARY_OPS = {"BINARY_ADD": "+", "BINARY_SUB": "-", "BINARY_MUL": "*"}
+UNBOUND_LOCAL = re.compile(r"local variable '(\w+)'")
+
+def var_name(name): return f"v_{name}"
+def func_name(name): return f"fn_{name}"
+
+def _call_error(message, *args):
+    """인자를 모두 계산한 뒤 호출 오류 (VM의 CALL_FUNCTION과 같은 순서)"""
+    raise RuntimeError(message)
+
+class Transpiler:
+    def __init__(self):
+        self.lines = []
+        self.functions = {}  # 이름 -> (params, label, local_names)
+        self.current = None  # 변환 중인 함수 이름 (메인 코드면 None)
+
+    def translate(self, code_with_labels):
+        """레이블 포함 튜플 바이트코드 -> Python 소스 문자열"""
+        code = expand(code_with_labels)
+        self.code = code
+        self.labels = {}
+        for i, instr in enumerate(code):
+            if instr[0] == "LABEL":
+                self.labels[instr[1]] = i
+        # 1. 맨 앞의 DEF_FUNC 테이블 (compile_program이 최상위 def를 먼저 등록)
+        start = 0
+        while start < len(code) and code[start][0] == "DEF_FUNC":
+            name, params, label, local_names = code[start][1]
+            if name in self.functions:
+                raise TranslationError(f"function {name} defined twice")
+            self.functions[name] = (params, label, local_names)
+            start += 1
+        # 2. 함수 바디 영역 찾기: JUMP end; LABEL f; ...; LABEL end
+        bodies = {}
+        for name, (params, label, local_names) in self.functions.items():
+            pos = self.label_pos(label)
+            skip = code[pos - 1] if pos > 0 else None
+            if skip is None or skip[0] != "JUMP" or self.label_pos(skip[1]) <= pos:
+                raise TranslationError(f"unexpected layout of function {name}")
+            bodies[pos - 1] = (name, self.label_pos(skip[1]))
+        # 3. 함수 정의 (재귀가 있으면 변환하지 않음)
+        self_tail_calls = self.check_recursion()
+        for name, (params, label, local_names) in self.functions.items():
+            body_start = self.label_pos(label) + 1
+            body_end = self.label_pos(code[body_start - 2][1])
+            args = ", ".join(var_name(p) for p in params)
+            self.lines.append(f"def {func_name(name)}({args}):")
+            self.current = name
+            if name in self_tail_calls:
+                # 꼬리 재귀: 바디를 while True로 감싸고 TAIL_CALL은 파라미터 재대입 + continue
+                self.lines.append("    while True:")
+                self.block(body_start, body_end, 2, local_names, loops=())
+                self.lines.append("        return None")
+            else:
+                self.block(body_start, body_end, 1, local_names, loops=())
+        self.current = None
+        # 4. 메인 코드 (전역 대입이 있으므로 함수로 감싸고 global 선언)
+        stored = sorted({instr[1] for instr in code if instr[0] == "STORE_GLOBAL"})
+        self.lines.append("def __main__():")
+        if stored:
+            self.lines.append("    global " + ", ".join(var_name(n) for n in stored))
+        i = start
+        main_start = len(self.lines)
+        while i < len(code):
+            if i in bodies:
+                i = bodies[i][1] + 1
+                continue
+            end = min([p for p in bodies if p > i], default=len(code))
+            self.block(i, end, 1, None, loops=())
+            i = end
+        if len(self.lines) == main_start:
+            self.lines.append("    pass")
+        return "\n".join(self.lines) + "\n"
+
+    def body_range(self, name):
+        label = self.functions[name][1]
+        body_start = self.label_pos(label) + 1
+        return body_start, self.label_pos(self.code[body_start - 2][1])
+
+    def is_self_tail_call(self, name, instr):
+        return (instr[0] == "TAIL_CALL" and instr[1][0] == name
+                and instr[1][1] == len(self.functions[name][0]))
+
+    def check_recursion(self):
+        """
+        함수 사이의 호출 그래프(루프로 바뀌는 자기 꼬리 호출 제외)에 순환이 있으면 TranslationError.
+        반환값: 자기 꼬리 호출이 있는 함수 이름 집합
+        """
+        calls = {}
+        self_tail_calls = set()
+        for name in self.functions:
+            start, end = self.body_range(name)
+            callees = set()
+            for instr in self.code[start:end]:
+                if self.is_self_tail_call(name, instr):
+                    self_tail_calls.add(name)
+                elif instr[0] in ("CALL_FUNCTION", "TAIL_CALL") and instr[1][0] in self.functions:
+                    callees.add(instr[1][0])
+            calls[name] = callees
+        done, active = set(), []
+        def visit(name):
+            if name in active:
+                cycle = " -> ".join(active[active.index(name):] + [name])
+                raise TranslationError(f"recursive call {cycle} may exceed Python's recursion limit")
+            if name in done:
+                return
+            active.append(name)
+            for callee in sorted(calls[name]):
+                visit(callee)
+            active.pop()
+            done.add(name)
+        for name in self.functions:
+            visit(name)
+        return self_tail_calls
+
+    def label_pos(self, label):
+        if label not in self.labels:
+            raise TranslationError(f"undefined label {label}")
+        return self.labels[label]
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def block(self, start, end, depth, local_names, loops):
+        """code[start:end]를 depth 들여쓰기의 문장들로 변환"""
+        code = self.code
+        first = len(self.lines)
+        stack = []
+        i = start
+        while i < end:
+            instr = code[i]
+            op = instr[0]
+            arg = instr[1] if len(instr) > 1 else None
+            if op == "LABEL":
+                loop_end = self.loop_end(i, end)
+                if loop_end is not None:
+                    self.require_empty(stack, op)
+                    i = self.while_loop(i, loop_end, depth, local_names, loops)
+                i += 1
+                continue
+            if op == "LOAD_CONST":
+                stack.append(repr(arg))
+            elif op == "LOAD_FAST":
+                stack.append(var_name(local_names[arg]))
+            elif op == "LOAD_GLOBAL":
+                stack.append(var_name(arg))
+            elif op in BINARY_OPS:
+                if len(stack) < 2:
+                    raise TranslationError(f"stack underflow at {i}")
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(f"({a} {BINARY_OPS[op]} {b})")
+            elif op == "CALL_FUNCTION":
+                name, argc = arg
+                if len(stack) < argc:
+                    raise TranslationError(f"stack underflow at {i}")
+                args = stack[len(stack) - argc:]
+                del stack[len(stack) - argc:]
+                stack.append(self.call_expr(name, argc, args))
+            elif op in ("STORE_FAST", "STORE_GLOBAL"):
+                target = var_name(local_names[arg] if op == "STORE_FAST" else arg)
+                value = self.pop_statement_value(stack, op)
+                self.emit(depth, f"{target} = {value}")
+            elif op == "DUP_TOP":
+                # peephole의 DUP_TOP; STORE x 만 지원: 대입 후 x를 다시 읽는 것과 같음
+                nxt = code[i + 1] if i + 1 < end else ("",)
+                if nxt[0] not in ("STORE_FAST", "STORE_GLOBAL") or not stack:
+                    raise TranslationError(f"unsupported DUP_TOP at {i}")
+                target = var_name(local_names[nxt[1]] if nxt[0] == "STORE_FAST" else nxt[1])
+                value = self.pop_statement_value(stack, op)
+                self.emit(depth, f"{target} = {value}")
+                stack.append(target)
+                i += 1
+            elif op == "PRINT":
+                value = self.pop_statement_value(stack, op)
+                self.emit(depth, f"print(\"OUTPUT:\", {value})")
+            elif op == "TAIL_CALL":
+                name, argc = arg
+                if len(stack) != argc or local_names is None:
+                    raise TranslationError(f"unexpected TAIL_CALL at {i}")
+                if self.is_self_tail_call(self.current, instr):
+                    if loops:
+                        raise TranslationError(f"tail call inside a while loop at {i}")
+                    self.tail_call(list(stack), depth, local_names)
+                else:
+                    self.emit(depth, f"return {self.call_expr(name, argc, list(stack))}")
+                stack.clear()
+            elif op == "RETURN":
+                value = stack.pop() if stack else "None"
+                self.require_empty(stack, op)
+                # 메인 코드의 RETURN은 프로그램 종료 (반환값은 버림)
+                self.emit(depth, f"return {value}" if local_names is not None else "return")
+            elif op == "JUMP_IF_FALSE":
+                cond = self.pop_statement_value(stack, op)
+                i = self.if_stmt(i, end, cond, depth, local_names, loops)
+            elif op == "JUMP" and loops and arg == loops[-1][0]:
+                self.require_empty(stack, op)
+                self.emit(depth, "continue")
+            elif op == "JUMP" and loops and arg == loops[-1][1]:
+                self.require_empty(stack, op)
+                self.emit(depth, "break")
+            else:
+                raise TranslationError(f"cannot translate {instr} at {i}")
+            i += 1
+        self.require_empty(stack, "end of block")
+        if len(self.lines) == first:
+            self.emit(depth, "pass")
+
+    def tail_call(self, args, depth, local_names):
+        """자기 꼬리 호출: 인자를 모두 계산한 뒤 파라미터에 대입하고 나머지 지역 변수는 대입 전 상태로"""
+        params = self.functions[self.current][0]
+        targets = ", ".join(var_name(p) for p in params)
+        if targets:
+            self.emit(depth, f"{targets}{',' if len(params) == 1 else ''} = {', '.join(args)}{',' if len(params) == 1 else ''}")
+        for name in local_names[len(params):]:
+            self.emit(depth, "try:")
+            self.emit(depth + 1, f"del {var_name(name)}")
+            self.emit(depth, "except NameError:")
+            self.emit(depth + 1, "pass")
+        self.emit(depth, "continue")
+
+    def pop_statement_value(self, stack, op):
+        """문장을 만드는 명령어: 스택에 값이 정확히 하나 있어야 평가 순서가 바뀌지 않음"""
+        if len(stack) != 1:
+            raise TranslationError(f"{op} with {len(stack)} values on the stack")
+        return stack.pop()
+
+    def require_empty(self, stack, where):
+        if stack:
+            raise TranslationError(f"values left on the stack at {where}")
+
+    def call_expr(self, name, argc, args):
+        if name not in self.functions:
+            return f"_call_error({f'Undefined function: {name}'!r}{''.join(', ' + a for a in args)})"
+        params = self.functions[name][0]
+        if len(params) != argc:
+            message = f"Argument count mismatch in call to {name}. Expected {len(params)}, got {argc}"
+            return f"_call_error({message!r}{''.join(', ' + a for a in args)})"
+        return f"{func_name(name)}({', '.join(args)})"
+
+    def loop_end(self, i, end):
+        """code[i]의 LABEL S가 while 머리면 JUMP S의 위치 (LABEL E 바로 앞), 아니면 None"""
+        label = self.code[i][1]
+        for j in range(i + 1, end):
+            if self.code[j] == ("JUMP", label):
+                return j
+        return None
+
+    def while_loop(self, i, jump_back, depth, local_names, loops):
+        """LABEL S; cond; JUMP_IF_FALSE E; body; JUMP S; LABEL E -> while. 반환값: LABEL E 위치"""
+        code = self.code
+        start_label = code[i][1]
+        j = i + 1
+        while j < jump_back and code[j][0] != "JUMP_IF_FALSE":
+            j += 1
+        if j == jump_back:
+            raise TranslationError(f"loop without condition at {i}")
+        end_label = code[j][1]
+        if code[jump_back + 1:jump_back + 2] != [("LABEL", end_label)]:
+            raise TranslationError(f"unexpected loop layout at {i}")
+        cond = self.expression(i + 1, j, local_names)
+        self.emit(depth, f"while {cond}:")
+        self.block(j + 1, jump_back, depth + 1, local_names, loops + ((start_label, end_label),))
+        return jump_back + 1
+
+    def if_stmt(self, i, end, cond, depth, local_names, loops):
+        """JUMP_IF_FALSE E; then; JUMP X; LABEL E; else; LABEL X -> if/else. 반환값: 마지막으로 처리한 위치"""
+        code = self.code
+        else_pos = self.label_pos(code[i][1])
+        if not i < else_pos <= end:
+            raise TranslationError(f"unexpected if layout at {i}")
+        self.emit(depth, f"if {cond}:")
+        before_else = code[else_pos - 1]
+        if (before_else[0] == "JUMP" and before_else[1] in self.labels
+                and else_pos < self.labels[before_else[1]] <= end
+                and not (loops and before_else[1] in loops[-1])):
+            end_pos = self.labels[before_else[1]]
+            self.block(i + 1, else_pos - 1, depth + 1, local_names, loops)
+            if any(instr[0] != "LABEL" for instr in code[else_pos + 1:end_pos]):
+                self.emit(depth, "else:")
+                self.block(else_pos + 1, end_pos, depth + 1, local_names, loops)
+            return end_pos
+        self.block(i + 1, else_pos, depth + 1, local_names, loops)
+        return else_pos
+
+    def expression(self, start, end, local_names):
+        """code[start:end]가 값 하나를 만드는 식이면 그 문자열"""
+        saved = len(self.lines)
+        stack = []
+        for instr in self.code[start:end]:
+            op = instr[0]
+            arg = instr[1] if len(instr) > 1 else None
+            if op == "LOAD_CONST":
+                stack.append(repr(arg))
+            elif op == "LOAD_FAST":
+                stack.append(var_name(local_names[arg]))
+            elif op == "LOAD_GLOBAL":
+                stack.append(var_name(arg))
+            elif op in BINARY_OPS and len(stack) >= 2:
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(f"({a} {BINARY_OPS[op]} {b})")
+            elif op == "CALL_FUNCTION" and len(stack) >= arg[1]:
+                args = stack[len(stack) - arg[1]:]
+                del stack[len(stack) - arg[1]:]
+                stack.append(self.call_expr(arg[0], arg[1], args))
+            else:
+                raise TranslationError(f"cannot translate {instr} in a condition")
+        if len(stack) != 1 or len(self.lines) != saved:
+            raise TranslationError("condition is not a single expression")
+        return stack[0]
+
+def compile_program(code_with_labels):
+    """바이트코드 -> (Python 소스, 실행할 main 함수). 변환할 수 없으면 TranslationError"""
+    source = Transpiler().translate(code_with_labels)
+    namespace = {"_call_error": _call_error}
+    exec(compile(source, "<pvm-transpiled>", "exec"), namespace)
+    return source, namespace["__main__"]
+
+def run_compiled(main):
+    """
+    compile_program()의 main 실행. 오류 메시지는 VM과 같은 형식으로 바꿈.
+    RecursionError는 VM에서는 생기지 않는 오류이므로 VM Error로 바꾸지 않고 그대로 전달합니다.
+    """
+    try:
+        main()
+    except RecursionError:
+        raise
+    except NameError as e:
+        # NameError('v_x') / UnboundLocalError("... local variable 'v_x' ...")
+        name = getattr(e, "name", None)
+        if name is None:
+            match = UNBOUND_LOCAL.search(str(e))
+            name = match.group(1) if match else ""
+        print(f"VM Error: Undefined variable: {name[2:] if name.startswith('v_') else name}")
+    except Exception as e:
+        print(f"VM Error: {e}")
+
+def run(code_with_labels, engine="table"):
+    """
+    트랜스파일해서 실행. 변환할 수 없으면 VirtualMachine(engine)으로 실행합니다.
+    반환값: 트랜스파일된 코드로 실행했으면 True
+    """
+    try:
+        _, main = compile_program(code_with_labels)
+    except TranslationError:
+        VirtualMachine(engine=engine).run(code_with_labels)
+        return False
+    run_compiled(main)
+    return True
@@ -0,0 +1,146 @@
+# === 스택 깊이 검증기 (Bytecode verifier) ===
+# 링크된 CodeObject를 실행 전에 한 번 훑어서, 모든 실행 경로에서 피연산자 스택이 부족해지지 않는지 확인합니다.
+# 메인 코드(PC 0)와 각 함수 바디(FunctionInfo.entry)에서 깊이 0으로 시작해 제어 흐름(worklist)을 따라가며
+#   - 명령어마다 필요한 피연산자 수보다 스택이 얕으면 거부 (stack underflow)
+#   - 두 경로가 만나는 PC에서 스택 깊이가 다르면 거부
+#   - 점프 대상이 코드 밖이거나, 함수 바디가 RETURN/TAIL_CALL 없이 코드 끝(HALT)에 도달하면 거부
+#   - LOAD_FAST/STORE_FAST 슬롯이 그 함수의 지역 슬롯 수를 넘거나, 한 PC가 여러 함수(또는 메인)에서 도달되면 거부
+# 통과한 코드는 code.verified = True, code.max_stack = {진입 PC: 최대 스택 깊이}가 기록되고
+# VM은 스택 길이 확인이 없는 handler 테이블로 실행합니다 (vm.py). 거부된 코드는 기존 확인 경로로 실행되어
+# 실행 중 오류 메시지가 예전과 같습니다.
+
+from opcodes import (OPNAMES, SUPERINSTRUCTIONS, QUICKENED, LOAD_CONST, LOAD_NAME, STORE_NAME, LOAD_FAST,
+                     STORE_FAST, LOAD_GLOBAL, STORE_GLOBAL, DUP_TOP, BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT,
+                     JUMP_IF_FALSE, JUMP, DEF_FUNC, CALL_FUNCTION, RETURN, HALT, TAIL_CALL)
+from linker import FUSED_OPERANDS
+
+# opcode -> (필요한 피연산자 수, 실행 후 스택 깊이 변화). CALL_FUNCTION/TAIL_CALL은 인자 수에 따라 따로 계산
+STACK_EFFECT = {
+    LOAD_CONST: (0, 1), LOAD_NAME: (0, 1), STORE_NAME: (1, -1),
+    LOAD_FAST: (0, 1), STORE_FAST: (1, -1), LOAD_GLOBAL: (0, 1), STORE_GLOBAL: (1, -1),
+    DUP_TOP: (1, 1), BINARY_ADD: (2, -1), BINARY_SUB: (2, -1), BINARY_MUL: (2, -1),
+    PRINT: (1, -1), JUMP_IF_FALSE: (1, -1), JUMP: (0, 0), DEF_FUNC: (0, 0),
+    RETURN: (0, 0),  # 값이 없으면 None 반환 (op_return)
+    HALT: (0, 0),
+}
+
+def compose(parts):
+    """구성 명령어들의 (필요한 피연산자 수, 깊이 변화)"""
+    need = depth = 0
+    for part in parts:
+        part_need, delta = STACK_EFFECT[part]
+        need = max(need, part_need - depth)
+        depth += delta
+    return need, depth
+
+for _name, _parts in SUPERINSTRUCTIONS.items():
+    STACK_EFFECT[OPNAMES.index(_name)] = compose([OPNAMES.index(part) for part in _parts])
+for _name, _base in QUICKENED.items():
+    if _base != "CALL_FUNCTION":
+        STACK_EFFECT[OPNAMES.index(_name)] = STACK_EFFECT[OPNAMES.index(_base)]
+
+# 지역 슬롯을 쓰는 opcode, 조건 분기로 끝나는 opcode (점프하지 않으면 다음 PC로 진행)
+SLOT_USERS = {LOAD_FAST, STORE_FAST} | {op for op, parts in FUSED_OPERANDS.items()
+                                        if LOAD_FAST in parts or STORE_FAST in parts}
+BRANCHES = {JUMP_IF_FALSE} | {op for op, parts in FUSED_OPERANDS.items() if parts[-1] == JUMP_IF_FALSE}
+
+class VerifyError(Exception):
+    """검증에 실패한 바이트코드"""
+
+class StackVerifier:
+    def __init__(self, code):
+        self.code = code
+        self.depth = {}  # pc -> 그 명령어 실행 직전의 스택 깊이
+        self.owner = {}  # pc -> 그 명령어에 도달한 진입 PC (메인은 0)
+
+    def verify(self):
+        """검증에 성공하면 {진입 PC: 최대 스택 깊이}, 실패하면 VerifyError"""
+        code = self.code
+        max_stack = {0: self.walk(0, 0)}
+        for func in code.functions:
+            if func.entry not in max_stack:
+                max_stack[func.entry] = self.walk(func.entry, len(func.varnames), func.name)
+        return max_stack
+
+    def walk(self, entry, n_locals, func_name=None):
+        """entry에서 시작하는 모든 경로를 따라가며 최대 스택 깊이를 구함"""
+        code = self.code
+        ops, args = code.ops, code.args
+        seen_depth, owner = self.depth, self.owner
+        where = f"function {func_name}" if func_name else "main code"
+        deepest = 0
+        worklist = [(entry, 0)]
+        while worklist:
+            pc, depth = worklist.pop()
+            # 직선 코드는 worklist를 거치지 않고 이어서 따라감
+            while True:
+                if not 0 <= pc < len(ops):
+                    raise VerifyError(f"jump to PC={pc} outside the code in {where}")
+                if pc in seen_depth:
+                    if owner[pc] != entry:
+                        raise VerifyError(f"PC={pc} is reached from both {where} and entry PC={owner[pc]}")
+                    if seen_depth[pc] != depth:
+                        raise VerifyError(f"inconsistent stack depth at PC={pc} in {where}: {seen_depth[pc]} vs {depth}")
+                    break
+                seen_depth[pc] = depth
+                owner[pc] = entry
+                op = ops[pc]
+                if op == CALL_FUNCTION:
+                    argc = code.calls[args[pc]][1]
+                    need, delta = argc, 1 - argc
+                elif op == TAIL_CALL:
+                    argc = code.calls[args[pc]][1]
+                    need, delta = argc, -argc
+                elif op in STACK_EFFECT:
+                    need, delta = STACK_EFFECT[op]
+                else:
+                    raise VerifyError(f"unknown opcode {op} at PC={pc} in {where}")
+                if depth < need:
+                    raise VerifyError(f"stack underflow at PC={pc} {code.instruction(pc)} in {where}: "
+                                      f"needs {need}, has {depth}")
+                if op in SLOT_USERS:
+                    self.check_slots(pc, op, n_locals, where)
+                depth += delta
+                if depth > deepest:
+                    deepest = depth
+                if op == RETURN or op == TAIL_CALL:
+                    break
+                if op == HALT:
+                    if func_name:
+                        raise VerifyError(f"{where} runs past the end of the code without RETURN")
+                    break
+                if op == JUMP:
+                    pc = args[pc]
+                    continue
+                if op in BRANCHES:
+                    worklist.append((code.jump_target(pc), depth))
+                pc += 1
+        return deepest
+
+    def check_slots(self, pc, op, n_locals, where):
+        """지역 슬롯 번호가 그 프레임의 슬롯 수 안에 있는지"""
+        if op in (LOAD_FAST, STORE_FAST):
+            slots = (self.code.args[pc],)
+        elif op in FUSED_OPERANDS:
+            slots = tuple(field for part, field in zip(FUSED_OPERANDS[op], self.code.fused[self.code.args[pc]])
+                          if part in (LOAD_FAST, STORE_FAST))
+        else:
+            return
+        for slot in slots:
+            if not 0 <= slot < n_locals:
+                raise VerifyError(f"local slot {slot} out of range at PC={pc} in {where} ({n_locals} slots)")
+
+def verify(code):
+    """
+    편의 함수: code를 검증하고 결과를 code에 기록 (code.verified, code.max_stack, code.verify_error).
+    검증을 통과했으면 True
+    """
+    try:
+        code.max_stack = StackVerifier(code).verify()
+        code.verified = True
+        code.verify_error = None
+    except VerifyError as e:
+        code.max_stack = {}
+        code.verified = False
+        code.verify_error = str(e)
+    return code.verified
@@ -11,20 +11,141 @@
 #      모든 프레임 생성 시 이 코드를 사용합니다.
 # 4. 오류 보고용 PC 저장 (PC storage for error reporting):
 #    - 명령어 실행 전의 PC 값을 별도로 저장하여 오류 메시지 출력 시 정확한 위치를 표시합니다.
+# 5. 테이블 기반 디스패치 엔진 (Table-driven dispatch engine):
+#    - engine="table"이면 opcode를 작은 정수로 바꾸고 handler 리스트로 바로 디스패치합니다.
+#    - try/except는 명령어 루프 바깥에 한 번만 둡니다.
+#    - engine="switch"는 기존 if/elif 루프를 그대로 사용하는 참조 구현입니다.
+# 6. 트레이싱 훅 (Tracing hooks, tracing.py):
+#    - 기본 상태(production mode)에서는 [DEBUG] 출력이 없습니다.
+#    - 훅이 붙어 있을 때만 table 엔진이 별도의 traced 루프/handler 테이블을 사용하므로
+#      훅이 없는 루프는 트레이싱 비용을 전혀 지불하지 않습니다.
+# 7. 슬롯 기반 지역 변수 (Slot-indexed locals):
+#    - 함수 프레임은 고정 크기 리스트(Frame.locals)에 지역 변수를 저장하고 LOAD_FAST/STORE_FAST로 접근합니다.
+#    - 전역 변수는 self.globals 딕셔너리 하나에서 LOAD_GLOBAL/STORE_GLOBAL로 O(1) 접근합니다.
+#    - LOAD_NAME은 더 이상 caller 프레임을 거슬러 올라가지 않고, 현재 프레임 env -> 전역 순으로만 찾습니다.
+#      (스코프 규칙은 code_gen.py 참고)
+# 8. 링크된 코드 객체 실행 (Linked CodeObject, linker.py):
+#    - table 엔진은 레이블이 해석된 CodeObject(opcode array('B') + 정수 피연산자 array('i'))를 직접 실행합니다.
+#    - 상수/이름/함수/호출 지점은 모두 정수 인덱스로 접근하므로 루프 안에 문자열 비교나 레이블 조회가 없습니다.
+#    - 전역 변수는 names 풀 인덱스로 접근하는 리스트(self.global_slots)에 저장됩니다.
+#    - switch 엔진은 튜플 바이트코드를 실행하는 참조 구현으로 남습니다 (CodeObject는 to_tuples()로 변환).
+# 9. Superinstructions (superinstructions.py, -O 1 이상):
+#    - LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL처럼 자주 연달아 실행되는 묶음을 handler 하나로 실행합니다.
+#    - 피연산자는 CodeObject.fused 테이블의 정수 튜플입니다 (linker.py).
+#    - switch 엔진은 실행 전에 superinstruction을 구성 명령어로 되돌립니다 (superinstructions.expand).
+# 10. 트레이싱 JIT (jit.py, VirtualMachine(jit=TraceJIT())):
+#    - table 엔진에서 backward JUMP를 세어 hot while 루프의 한 바퀴를 기록하고 int로 특화된 Python 함수로 컴파일합니다.
+#    - 가드가 실패하면 PC와 피연산자 스택을 되돌려 놓고 인터프리터가 이어서 실행합니다.
+# 11. Quickening (VirtualMachine(quicken=True), CPython 3.11의 adaptive interpreter와 같은 방식):
+#    - table 엔진은 실행할 때마다 CodeObject.ops를 복사한 배열(self.ops)을 실행하고, 명령어가 그 배열의 자기 자리를 바꿔 씁니다.
+#      (CodeObject와 .pvmc 캐시는 바뀌지 않음)
+#    - BINARY_ADD/SUB/MUL은 int 피연산자를 QUICKEN_AFTER번 관찰하면 BINARY_*_INT로 바뀝니다.
+#      int가 아닌 값이 오면 원래 명령어로 되돌리고(deoptimize) 다시 특화하기까지 더 오래 기다립니다 (exponential backoff).
+#    - CALL_FUNCTION은 찾은 FunctionInfo를 호출 지점 캐시에 두는 CALL_FUNCTION_CACHED로 바뀝니다.
+#      같은 이름의 함수가 다시 정의되면 (DEF_FUNC) 캐시 확인에 실패하고 원래 명령어로 돌아갑니다.
+#    - LOAD_NAME은 메인 프레임(env가 None)에서 실행되면 전역 슬롯을 바로 읽는 LOAD_NAME_GLOBAL로 바뀝니다.
+#    - 적응형 명령어와 deoptimize된 명령어는 기본 handler 테이블(검증된 코드면 확인 없는 handler)로 실행합니다.
+#      검증된 코드의 BINARY_*는 특화하지 않습니다: 확인 없는 handler에 타입 확인만 더하게 되기 때문입니다.
+#    - Python으로 만든 VM에서는 int 특화가 덜어 내는 일이 없어 측정되는 속도 향상이 없습니다 (benchmark.py quicken).
+#      그래서 quicken은 기본값이 False인 실험용 옵션이고 최적화 레벨(-O)이나 다른 모드에서 켜지 않습니다.
+# 12. 함수 호출 경로 (table 엔진):
+#    - 링커가 호출 지점마다 callee를 미리 정해 둡니다 (linker.resolve_calls). 실행 중 정의된 함수가 그 callee이면
+#      인자 수 확인과 지역 슬롯 계산 없이 바로 호출합니다 (미리 만든 UNBOUND 튜플을 붙임).
+#    - 인자는 caller 스택에서 슬라이스 한 번으로 callee의 지역 슬롯 리스트가 됩니다.
+#    - RETURN으로 끝난 프레임은 free-list(self.free_frames)에 돌려놓고 다음 CALL_FUNCTION이 재사용합니다.
+#    - Frame은 __slots__ 객체입니다.
+# 13. 검증된 코드의 빠른 경로 (verifier.py):
+#    - load_table이 CodeObject를 한 번 검증합니다 (모든 경로의 스택 깊이, 점프 대상, 지역 슬롯 범위).
+#    - 검증된 코드는 스택 길이 확인(Stack underflow ...)이 없는 handler 테이블로 실행합니다.
+#    - 검증에 실패한 코드(직접 만든 바이트코드 등)는 지금까지처럼 확인하는 handler로 실행되어 같은 오류를 냅니다.
+# 14. 꼬리 호출 (TAIL_CALL, code_gen.py가 함수 안의 return f(...)에 대해 만듦):
+#    - CALL_FUNCTION과 같은 순서로 함수를 찾고 인자 수를 확인한 뒤, 새 프레임을 push하는 대신 현재 프레임의
+#      지역 슬롯/PC/스택을 callee 것으로 바꿉니다. callee의 RETURN은 원래 caller에게 바로 돌아갑니다.
+#    - 꼬리 재귀 함수는 재귀 깊이와 상관없이 프레임 하나로 실행됩니다 (self.frames가 자라지 않음).
+#    - 훅이 있으면 on_call이 재사용된 프레임으로 불리고, 대신 on_return은 마지막 RETURN에서 한 번만 불립니다.
+# 15. 순수 함수 메모이제이션 (memoize.py, VirtualMachine(memo=Memoizer())):
+#    - table 엔진에서 순수 함수(출력/전역 접근/DEF_FUNC 없이 순수 함수만 호출)의 호출을 함수별 LRU 캐시로 바꿉니다.
+#    - JIT처럼 handler 테이블 복사본의 호출/반환 handler만 바꾸므로 memo가 없으면 비용이 없습니다.
+# 16. 나눠서 실행하기 (start/run_steps, scheduler.py):
+#    - start()는 run_table과 같은 준비(링크, 검증, handler 테이블)만 하고, run_steps(n)은 명령어를 최대 n개 실행하고 돌아옵니다.
+#    - 프로그램의 상태(프레임 스택, 전역 슬롯, 함수 테이블)는 모두 VM 인스턴스에 있으므로 VM 하나가 green thread 하나입니다.
+#    - run_table의 루프는 그대로 두어 한 번에 끝까지 실행하는 경로에는 명령어 수를 세는 비용이 없습니다.
+
+from array import array
+
+from linker import CodeObject, link
+from opcodes import (OPNAMES, LOAD_CONST, LOAD_NAME, STORE_NAME, LOAD_FAST, STORE_FAST,
+                     LOAD_GLOBAL, STORE_GLOBAL, DUP_TOP, BINARY_ADD, BINARY_SUB, BINARY_MUL, PRINT,
+                     JUMP_IF_FALSE, JUMP, DEF_FUNC, CALL_FUNCTION, RETURN, HALT,
+                     LOAD_FAST_LOAD_FAST, LOAD_GLOBAL_LOAD_GLOBAL, LOAD_FAST_LOAD_CONST, LOAD_GLOBAL_LOAD_CONST,
+                     LOAD_FAST_LOAD_FAST_BINARY_ADD, LOAD_GLOBAL_LOAD_GLOBAL_BINARY_ADD,
+                     LOAD_FAST_LOAD_CONST_BINARY_ADD, LOAD_FAST_LOAD_CONST_BINARY_SUB, LOAD_FAST_LOAD_CONST_BINARY_MUL,
+                     LOAD_GLOBAL_LOAD_CONST_BINARY_ADD, LOAD_GLOBAL_LOAD_CONST_BINARY_SUB,
+                     LOAD_GLOBAL_LOAD_CONST_BINARY_MUL,
+                     LOAD_FAST_LOAD_CONST_BINARY_ADD_STORE_FAST, LOAD_FAST_LOAD_CONST_BINARY_SUB_STORE_FAST,
+                     LOAD_GLOBAL_LOAD_CONST_BINARY_ADD_STORE_GLOBAL, LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL,
+                     LOAD_FAST_JUMP_IF_FALSE, LOAD_GLOBAL_JUMP_IF_FALSE,
+                     BINARY_ADD_INT, BINARY_SUB_INT, BINARY_MUL_INT, LOAD_NAME_GLOBAL, CALL_FUNCTION_CACHED,
+                     TAIL_CALL)
+from superinstructions import expand
+from verifier import verify
+
+ENGINES = ("switch", "table")
+
+NOT_RESOLVED = object()  # 링크 때 callee를 정하지 못한 호출 지점 (실행 중 어떤 함수와도 같지 않음)
+
+QUICKEN_AFTER = 8  # 같은 명령어가 특화 가능한 상태로 이만큼 실행되면 특화 변형으로 바꿈
+QUICKENED_OPS = (BINARY_ADD_INT, BINARY_SUB_INT, BINARY_MUL_INT, LOAD_NAME_GLOBAL, CALL_FUNCTION_CACHED)
+MAX_BACKOFF = 6    # deoptimize될 때마다 다음 특화까지의 대기 횟수를 2배로 (최대 QUICKEN_AFTER * 2**MAX_BACKOFF)
+
+class _Unbound:
+    """아직 값이 대입되지 않은 지역 슬롯 표시 (None은 정상적인 값이므로 따로 둠)"""
+    def __repr__(self): return "UNBOUND"
+
+UNBOUND = _Unbound()
 
 class Frame:
-    def __init__(self, code, env, pc=0):
+    __slots__ = ("code", "env", "stack", "pc", "locals", "varnames")
+
+    def __init__(self, code, env, pc=0, fast_locals=None, varnames=()):
         self.code = code  # Should be the globally resolved bytecode array
-        self.env = env    # Local environment for this frame
+        self.env = env    # Name environment for this frame (the globals dict for the main frame)
         self.stack = []   # Operand stack for this frame
         self.pc = pc      # Program Counter for this frame
+        self.locals = fast_locals if fast_locals is not None else []  # Slot-indexed locals
+        self.varnames = varnames  # Slot index -> local name (for error messages)
 
 class VirtualMachine:
-    def __init__(self):
+    def __init__(self, engine="table", hooks=None, jit=None, quicken=False, memo=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine} (expected one of {ENGINES})")
+        self.engine = engine
+        self.hooks = list(hooks) if hooks else []  # Tracer instances (see tracing.py)
+        self.jit = jit                # jit.TraceJIT (table engine without hooks only)
+        self.quicken = quicken        # Adaptive quickening (table engine without hooks only)
+        self.memo = memo              # memoize.Memoizer (table engine without hooks only)
         self.frames = []              # Frame stack
         self.labels = {}              # Resolved labels (name -> pc_index in global_bytecode)
-        self.functions = {}           # Registered functions (name -> (param_names, body_label_name))
+        self.functions = {}           # Registered functions (switch: name -> (param_names, body_label_name, local_names),
+                                      #                       table: name index -> FunctionInfo)
+        self.globals = {}             # Global variables of the switch engine (also the main frame's env)
+        self.global_slots = []        # Global variables of the table engine (name index -> value)
         self.global_bytecode = []     # Stores the bytecode array after resolving labels (Global Bytecode Usage)
+        self.code = None              # Linked CodeObject executed by the table engine
+        self.handlers = self.build_handler_table()  # opcode number -> handler(frame, arg)
+        self.verified_handlers = self.build_verified_handler_table()  # Same, without underflow checks
+        self.ops = None               # Opcodes being executed (a private copy of code.ops when quickening)
+        self.warmup = []              # pc -> quickening counter (negative while backing off)
+        self.backoff = []             # pc -> number of deoptimizations
+        self.call_cache = []          # calls index -> (FunctionInfo, name_index, argc, unbound padding)
+        self.generic = self.handlers  # Handlers quickened instructions fall back to (base of build_quickening_table)
+        self.call_sites = []          # calls index -> (name_index, argc, link-time callee or NOT_RESOLVED, unbound padding)
+        self.free_frames = []         # Frames released by RETURN, reused by CALL_FUNCTION
+        self.frames_allocated = 0     # Frame objects created for calls (the rest were reused)
+        self.error = None             # Exception reported by the last table-engine run (None if it finished normally)
+        self.specialized = 0          # Quickening counters (see quickening_stats)
+        self.deoptimized = 0
+        self.prepared = None          # (ops, args, handlers) of the program loaded by start()
 
     def resolve_labels(self, code_with_labels):
         """
@@ -40,17 +161,42 @@ class VirtualMachine:
                 new_code.append(instr)
         return new_code, labels
 
-    def run(self, code_input):
+    def add_hook(self, hook):
+        """Attaches a Tracer. Takes effect on the next run()."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def run(self, code_input, inputs=None):
         """
-        Runs the provided bytecode.
-        'code_input' is expected to be a list of instruction tuples, potentially with labels.
+        Runs the provided bytecode with the engine selected at construction time.
+        'code_input' is a list of instruction tuples (potentially with labels) or a linked CodeObject.
+        'inputs' ({name: value}) pre-binds global variables before the first instruction (one parameter set).
         """
+        if self.engine == "table":
+            if self.hooks:
+                return self.run_table_traced(code_input, inputs)
+            return self.run_table(code_input, inputs)
+        if isinstance(code_input, CodeObject):
+            code_input = code_input.to_tuples()
+        return self.run_switch(code_input, inputs)
+
+    def run_switch(self, code_input, inputs=None):
+        """
+        Reference engine: decodes every instruction through an if/elif chain of string compares.
+        Hooks are checked with a single truthiness test per instruction.
+        """
+        hooks = self.hooks
+        # Superinstructions are executed as their component instructions
+        code_input = expand(code_input)
         # Resolve labels and store the processed bytecode globally for all frames (Global Bytecode Usage)
         self.global_bytecode, self.labels = self.resolve_labels(code_input)
         self.functions = {}  # Reset functions if run is called multiple times
+        self.globals = dict(inputs) if inputs else {}
 
         # Create the main frame using the global bytecode
-        main_frame = Frame(self.global_bytecode, {}, pc=0)
+        main_frame = Frame(self.global_bytecode, self.globals, pc=0)
         self.frames.append(main_frame)
 
         while self.frames:
@@ -60,10 +206,11 @@ class VirtualMachine:
             # Check if current frame's PC is out of bounds (end of its code segment or program)
             if current_frame.pc >= len(current_frame.code): # current_frame.code is self.global_bytecode
                 self.frames.pop() # Pop the completed frame
+                if hooks:
+                    for hook in hooks:
+                        hook.on_frame_pop(self, current_frame)
                 if not self.frames: # If all frames are processed
-                    print("[DEBUG] VM execution finished: All frames popped.")
                     break # Exit the VM loop
-                print(f"[DEBUG] FRAME_POP: Popped frame. Current frame is now Frame {len(self.frames) -1}.")
                 continue # Continue with the next frame (caller or next task)
 
             # PC storage for error reporting & fetching current instruction
@@ -77,23 +224,47 @@ class VirtualMachine:
             op = instr[0]
             arg = instr[1] if len(instr) > 1 else None
 
-            # Debug print for bytecode flow
-            stack_top_str = str(current_frame.stack[-1]) if current_frame.stack else "EMPTY"
-            print(f"[DEBUG] EXEC: PC={instr_pc_for_error} FRAME={frame_index} INSTR=({op}, {arg if arg is not None else ''}) STACK_TOP={stack_top_str}")
+            # Bytecode flow tracing (e.g. tracing.DebugTracer)
+            if hooks:
+                for hook in hooks:
+                    hook.on_instruction(self, frame_index, instr_pc_for_error, instr, current_frame)
 
             try:
                 if op == "LOAD_CONST":
                     current_frame.stack.append(arg)
+                elif op == "LOAD_FAST":
+                    value = current_frame.locals[arg]
+                    if value is UNBOUND:
+                        raise RuntimeError(f"Undefined variable: {current_frame.varnames[arg]}")
+                    current_frame.stack.append(value)
+
+                elif op == "STORE_FAST":
+                    if not current_frame.stack:
+                        raise RuntimeError("Stack underflow on STORE_FAST")
+                    current_frame.locals[arg] = current_frame.stack.pop()
+
+                elif op == "LOAD_GLOBAL":
+                    if arg not in self.globals:
+                        raise RuntimeError(f"Undefined variable: {arg}")
+                    current_frame.stack.append(self.globals[arg])
+
+                elif op == "STORE_GLOBAL":
+                    if not current_frame.stack:
+                        raise RuntimeError("Stack underflow on STORE_GLOBAL")
+                    self.globals[arg] = current_frame.stack.pop()
+
+                elif op == "DUP_TOP":
+                    if not current_frame.stack:
+                        raise RuntimeError("Stack underflow for DUP_TOP")
+                    current_frame.stack.append(current_frame.stack[-1])
+
                 elif op == "LOAD_NAME":
-                    value_found = False
-                    # Search for the variable in the environment of frames from innermost to outermost
-                    for f_search_idx, f_search in enumerate(reversed(self.frames)):
-                        if arg in f_search.env:
-                            current_frame.stack.append(f_search.env[arg]) # Push to current frame's stack
-                            value_found = True
-                            # print(f"[DEBUG] LOAD_NAME: Found '{arg}' = {f_search.env[arg]} in Frame {-f_search_idx-1} env.")
-                            break
-                    if not value_found:
+                    # Current frame's environment first, then globals (never the caller frames)
+                    if arg in current_frame.env:
+                        current_frame.stack.append(current_frame.env[arg])
+                    elif arg in self.globals:
+                        current_frame.stack.append(self.globals[arg])
+                    else:
                         raise RuntimeError(f"Undefined variable: {arg}")
 
                 elif op == "STORE_NAME":
@@ -146,8 +317,8 @@ class VirtualMachine:
                     # No 'continue' needed
 
                 elif op == "DEF_FUNC":
-                    name, params, label_name = arg
-                    self.functions[name] = (params, label_name)
+                    name, params, label_name, local_names = arg
+                    self.functions[name] = (params, label_name, local_names)
                     # print(f"[DEBUG] DEF_FUNC: Defined function '{name}' with params {params} at label '{label_name}'.")
                 
                 elif op == "CALL_FUNCTION": # Jumps and Context Switching
@@ -155,8 +326,8 @@ class VirtualMachine:
                     if func_name not in self.functions:
                         raise RuntimeError(f"Undefined function: {func_name}")
                     
-                    param_names, label_name = self.functions[func_name]
-                    
+                    param_names, label_name, local_names = self.functions[func_name]
+
                     if len(param_names) != argc:
                         raise RuntimeError(f"Argument count mismatch in call to {func_name}. Expected {len(param_names)}, got {argc}")
 
@@ -164,17 +335,46 @@ class VirtualMachine:
                         raise RuntimeError(f"Stack underflow: not enough arguments on stack for function call {func_name}. Expected {argc}, got {len(current_frame.stack)}")
                     
                     args_values = [current_frame.stack.pop() for _ in range(argc)][::-1] # Pop in reverse order of appearance
-                    new_env = dict(zip(param_names, args_values))
-                    
+                    # Parameters occupy the first slots; the remaining locals start unbound
+                    fast_locals = args_values + [UNBOUND] * (len(local_names) - argc)
+
                     # print(f"[DEBUG] CALL_FUNCTION: Calling '{func_name}' with args {args_values}. Caller PC was {instr_pc_for_error}, next is {current_frame.pc}.")
 
                     function_start_pc = self.labels[label_name]
-                    new_function_frame = Frame(self.global_bytecode, new_env, pc=function_start_pc)
+                    new_function_frame = Frame(self.global_bytecode, {}, pc=function_start_pc,
+                                               fast_locals=fast_locals, varnames=local_names)
                     self.frames.append(new_function_frame)
+                    if hooks:
+                        for hook in hooks:
+                            hook.on_call(self, func_name, new_function_frame)
                     # print(f"[DEBUG] FRAME_PUSH: Pushed new frame for '{func_name}'. Total frames: {len(self.frames)}.")
                     
                     continue # Must 'continue' to switch execution to the new_function_frame.
-                
+
+                elif op == "TAIL_CALL": # return f(...): the current frame becomes the callee's frame
+                    func_name, argc = arg
+                    if func_name not in self.functions:
+                        raise RuntimeError(f"Undefined function: {func_name}")
+
+                    param_names, label_name, local_names = self.functions[func_name]
+
+                    if len(param_names) != argc:
+                        raise RuntimeError(f"Argument count mismatch in call to {func_name}. Expected {len(param_names)}, got {argc}")
+
+                    if len(current_frame.stack) < argc:
+                        raise RuntimeError(f"Stack underflow: not enough arguments on stack for function call {func_name}. Expected {argc}, got {len(current_frame.stack)}")
+
+                    args_values = [current_frame.stack.pop() for _ in range(argc)][::-1]
+                    current_frame.stack.clear()
+                    current_frame.env = {}
+                    current_frame.locals = args_values + [UNBOUND] * (len(local_names) - argc)
+                    current_frame.varnames = local_names
+                    current_frame.pc = self.labels[label_name]
+                    if hooks:
+                        for hook in hooks:
+                            hook.on_call(self, func_name, current_frame)
+                    continue
+
                 elif op == "RETURN": # Jumps and Context Switching
                     return_value = current_frame.stack.pop() if current_frame.stack else None
                     
@@ -186,13 +386,19 @@ class VirtualMachine:
                         caller_frame = self.frames[-1]
                         caller_frame.stack.append(return_value) # Push return value onto caller's stack
                         # print(f"[DEBUG] RETURN: Pushed return value to Frame {len(self.frames)-1}'s stack.")
-                    
+
+                    if hooks:
+                        for hook in hooks:
+                            hook.on_return(self, return_value, current_frame)
+
                     if not self.frames: # If that was the last frame (e.g., return from main script)
-                        print(f"[DEBUG] RETURN: Last frame returned. Value: {return_value}")
                         break # Exit VM loop
                     
                     continue # Must 'continue' to switch execution back to the caller_frame.
-                
+
+                elif op == "HALT": # End of the main code (cfg.py puts function bodies after it)
+                    current_frame.pc = len(current_frame.code)
+
                 else:
                     raise RuntimeError(f"Unknown opcode: {op}")
             
@@ -202,3 +408,726 @@ class VirtualMachine:
             except Exception as e:
                 print(f"VM Error in FRAME={frame_index} PC={instr_pc_for_error}, INSTR={instr}: {e}")
                 break # Exit VM loop on error
+
+    # === 테이블 기반 디스패치 엔진 (Table-driven dispatch engine) ===
+
+    def build_handler_table(self):
+        """Builds the untraced handler list indexed by integer opcode (see opcodes.py)."""
+        table = [None] * len(OPNAMES)
+        table[LOAD_CONST] = self.op_load_const
+        table[LOAD_NAME] = self.op_load_name
+        table[STORE_NAME] = self.op_store_name
+        table[LOAD_FAST] = self.op_load_fast
+        table[STORE_FAST] = self.op_store_fast
+        table[LOAD_GLOBAL] = self.op_load_global
+        table[STORE_GLOBAL] = self.op_store_global
+        table[DUP_TOP] = self.op_dup_top
+        table[BINARY_ADD] = self.op_binary_add
+        table[BINARY_SUB] = self.op_binary_sub
+        table[BINARY_MUL] = self.op_binary_mul
+        table[PRINT] = self.op_print
+        table[JUMP_IF_FALSE] = self.op_jump_if_false
+        table[JUMP] = self.op_jump
+        table[DEF_FUNC] = self.op_def_func
+        table[CALL_FUNCTION] = self.op_call_function
+        table[RETURN] = self.op_return
+        table[HALT] = self.op_halt
+        table[TAIL_CALL] = self.op_tail_call
+        table[LOAD_FAST_LOAD_FAST] = self.op_load_fast_load_fast
+        table[LOAD_GLOBAL_LOAD_GLOBAL] = self.op_load_global_load_global
+        table[LOAD_FAST_LOAD_CONST] = self.op_load_fast_load_const
+        table[LOAD_GLOBAL_LOAD_CONST] = self.op_load_global_load_const
+        table[LOAD_FAST_LOAD_FAST_BINARY_ADD] = self.op_load_fast_load_fast_binary_add
+        table[LOAD_GLOBAL_LOAD_GLOBAL_BINARY_ADD] = self.op_load_global_load_global_binary_add
+        table[LOAD_FAST_LOAD_CONST_BINARY_ADD] = self.op_load_fast_load_const_binary_add
+        table[LOAD_FAST_LOAD_CONST_BINARY_SUB] = self.op_load_fast_load_const_binary_sub
+        table[LOAD_FAST_LOAD_CONST_BINARY_MUL] = self.op_load_fast_load_const_binary_mul
+        table[LOAD_GLOBAL_LOAD_CONST_BINARY_ADD] = self.op_load_global_load_const_binary_add
+        table[LOAD_GLOBAL_LOAD_CONST_BINARY_SUB] = self.op_load_global_load_const_binary_sub
+        table[LOAD_GLOBAL_LOAD_CONST_BINARY_MUL] = self.op_load_global_load_const_binary_mul
+        table[LOAD_FAST_LOAD_CONST_BINARY_ADD_STORE_FAST] = self.op_load_fast_load_const_binary_add_store_fast
+        table[LOAD_FAST_LOAD_CONST_BINARY_SUB_STORE_FAST] = self.op_load_fast_load_const_binary_sub_store_fast
+        table[LOAD_GLOBAL_LOAD_CONST_BINARY_ADD_STORE_GLOBAL] = self.op_load_global_load_const_binary_add_store_global
+        table[LOAD_GLOBAL_LOAD_CONST_BINARY_SUB_STORE_GLOBAL] = self.op_load_global_load_const_binary_sub_store_global
+        table[LOAD_FAST_JUMP_IF_FALSE] = self.op_load_fast_jump_if_false
+        table[LOAD_GLOBAL_JUMP_IF_FALSE] = self.op_load_global_jump_if_false
+        table[BINARY_ADD_INT] = self.op_binary_add_int
+        table[BINARY_SUB_INT] = self.op_binary_sub_int
+        table[BINARY_MUL_INT] = self.op_binary_mul_int
+        table[LOAD_NAME_GLOBAL] = self.op_load_name_global
+        table[CALL_FUNCTION_CACHED] = self.op_call_function_cached
+        return table
+
+    def build_verified_handler_table(self):
+        """
+        Copy of the handler table for code that passed verifier.verify():
+        the stack depth is known to be sufficient, so the handlers skip the underflow checks.
+        """
+        table = list(self.handlers)
+        table[STORE_NAME] = self.op_store_name_unchecked
+        table[STORE_FAST] = self.op_store_fast_unchecked
+        table[STORE_GLOBAL] = self.op_store_global_unchecked
+        table[DUP_TOP] = self.op_dup_top_unchecked
+        table[BINARY_ADD] = self.op_binary_add_unchecked
+        table[BINARY_SUB] = self.op_binary_sub_unchecked
+        table[BINARY_MUL] = self.op_binary_mul_unchecked
+        table[PRINT] = self.op_print_unchecked
+        table[JUMP_IF_FALSE] = self.op_jump_if_false_unchecked
+        return table
+
+    def build_quickening_table(self, base, verified=False):
+        """
+        Copy of the base handler table where the quickenable instructions are their adaptive versions.
+        Adaptive and deoptimized instructions run the base table's handlers (the unchecked ones for verified code).
+        Verified code keeps its unchecked BINARY_* handlers: an int variant would only add type tests to them.
+        """
+        self.generic = base
+        table = list(base)
+        if not verified:
+            table[BINARY_ADD] = self.op_binary_add_adaptive
+            table[BINARY_SUB] = self.op_binary_sub_adaptive
+            table[BINARY_MUL] = self.op_binary_mul_adaptive
+        table[LOAD_NAME] = self.op_load_name_adaptive
+        table[CALL_FUNCTION] = self.op_call_function_adaptive
+        return table
+
+    def build_traced_handler_table(self):
+        """
+        Copy of the handler table where CALL_FUNCTION, TAIL_CALL, RETURN and HALT also fire hooks.
+        Only used by run_table_traced, so the untraced table stays hook-free.
+        """
+        table = list(self.handlers)
+        hooks = self.hooks
+        call, tail_call, ret, halt = table[CALL_FUNCTION], table[TAIL_CALL], table[RETURN], table[HALT]
+
+        def traced_call(frame, arg):
+            call(frame, arg)
+            callee = self.frames[-1]
+            name = self.code.names[self.code.calls[arg][0]]
+            for hook in hooks:
+                hook.on_call(self, name, callee)
+
+        def traced_tail_call(frame, arg):
+            tail_call(frame, arg)
+            name = self.code.names[self.code.calls[arg][0]]
+            for hook in hooks:
+                hook.on_call(self, name, frame)
+
+        def traced_return(frame, arg):
+            value = frame.stack[-1] if frame.stack else None
+            ret(frame, arg)
+            for hook in hooks:
+                hook.on_return(self, value, frame)
+
+        def traced_halt(frame, arg):
+            halt(frame, arg)
+            for hook in hooks:
+                hook.on_frame_pop(self, frame)
+
+        table[CALL_FUNCTION] = traced_call
+        table[TAIL_CALL] = traced_tail_call
+        table[RETURN] = traced_return
+        table[HALT] = traced_halt
+        return table
+
+    def load_table(self, code_input, inputs=None):
+        """
+        Links the code if needed and pushes the main frame. Returns the CodeObject.
+        The table engine keeps globals in a list indexed by the code's name pool (self.global_slots);
+        the main frame's env is None, meaning "use the global slots".
+        Inputs whose name the code never mentions are ignored.
+        """
+        code = code_input if isinstance(code_input, CodeObject) else link(code_input)
+        self.code = code
+        self.functions = [None] * len(code.names)  # name index -> FunctionInfo, set by DEF_FUNC
+        self.global_slots = [UNBOUND] * len(code.names)
+        if inputs:
+            for index, name in enumerate(code.names):
+                if name in inputs:
+                    self.global_slots[index] = inputs[name]
+        self.frames = [Frame(code, None, pc=0)]
+        self.ops = code.ops
+        self.call_sites = []
+        for name_index, argc, callee in code.calls:
+            if callee < 0:
+                self.call_sites.append((name_index, argc, NOT_RESOLVED, ()))
+            else:
+                func = code.functions[callee]
+                self.call_sites.append((name_index, argc, func, (UNBOUND,) * (len(func.varnames) - argc)))
+        self.free_frames = []
+        self.frames_allocated = 0
+        self.error = None
+        if code.verified is None:
+            verify(code)
+        return code
+
+    def quicken_code(self, code):
+        """Gives this run a private, rewritable copy of the opcodes and fresh quickening state."""
+        self.ops = array('B', code.ops)
+        self.warmup = [0] * len(code.ops)
+        self.backoff = [0] * len(code.ops)
+        self.call_cache = [None] * len(code.calls)
+        self.specialized = 0
+        self.deoptimized = 0
+        return self.ops
+
+    def quickening_stats(self):
+        """Quickening counters of the last run, plus the instructions that are specialized at the end."""
+        ops = self.ops
+        sites = {}
+        if self.quicken and ops is not None:
+            for op in ops:
+                if op in QUICKENED_OPS:
+                    sites[OPNAMES[op]] = sites.get(OPNAMES[op], 0) + 1
+        return {"specialized": self.specialized, "deoptimized": self.deoptimized, "sites": sites}
+
+    def report_error(self, frame, error):
+        self.error = error
+        pc = frame.pc - 1
+        kind = " (IndexError)" if isinstance(error, IndexError) else ""
+        print(f"VM Error{kind} in FRAME={len(self.frames) - 1} PC={pc}, INSTR={self.code.instruction(pc)}: {error}")
+
+    def run_table(self, code_input, inputs=None):
+        """
+        Fast engine: dispatches through self.handlers by integer opcode.
+        Executes the linked CodeObject directly: opcodes and operands are read from two arrays.
+        The try/except wraps the whole loop, so the per-instruction path has no exception setup.
+        Verified code runs on the handler table without stack underflow checks.
+        With quickening, instructions rewrite a private copy of the opcodes as they run.
+        With a memoizer, calls to pure functions go through its result caches (see memoize.py).
+        With a JIT attached, the JIT's copy of the handler table is used (see jit.py).
+        """
+        ops, args, handlers = self.prepare_table(code_input, inputs)
+        frames = self.frames
+        frame = frames[0]
+        try:
+            while frames:
+                frame = frames[-1]
+                pc = frame.pc
+                frame.pc = pc + 1
+                handlers[ops[pc]](frame, args[pc])
+        except Exception as e:
+            self.report_error(frame, e)
+
+    def prepare_table(self, code_input, inputs=None):
+        """load_table, then picks the opcode array and handler table run_table executes: (ops, args, handlers)"""
+        code = self.load_table(code_input, inputs)
+        handlers = self.verified_handlers if code.verified else self.handlers
+        if self.quicken:
+            ops = self.quicken_code(code)
+            handlers = self.build_quickening_table(handlers, bool(code.verified))
+        else:
+            ops = code.ops
+        if self.memo:
+            handlers = self.memo.attach(self, handlers)
+        if self.jit:
+            handlers = self.jit.attach(self, handlers)
+        return ops, code.args, handlers
+
+    def start(self, code_input, inputs=None):
+        """
+        Loads the code like run_table but executes nothing; run_steps then runs it a slice at a time.
+        Used by scheduler.py, which interleaves many VMs in one thread. Hooks and the JIT are not supported
+        (a compiled trace would run a whole loop inside one instruction and defeat preemption).
+        """
+        if self.engine != "table" or self.hooks or self.jit:
+            raise ValueError("start/run_steps need the table engine without hooks or JIT")
+        self.prepared = self.prepare_table(code_input, inputs)
+
+    def run_steps(self, budget):
+        """
+        Executes up to 'budget' instructions of the program loaded by start() and returns how many ran.
+        The program is finished when self.frames is empty (HALT or a reported error).
+        """
+        ops, args, handlers = self.prepared
+        frames = self.frames
+        frame = None
+        remaining = budget
+        try:
+            while remaining and frames:
+                remaining -= 1
+                frame = frames[-1]
+                pc = frame.pc
+                frame.pc = pc + 1
+                handlers[ops[pc]](frame, args[pc])
+        except Exception as e:
+            self.report_error(frame, e)
+            frames.clear()
+        return budget - remaining
+
+    def run_table_traced(self, code_input, inputs=None):
+        """Same as run_table, but fires on_instruction and uses the traced handler table."""
+        code = self.load_table(code_input, inputs)
+        ops = code.ops
+        args = code.args
+        handlers = self.build_traced_handler_table()
+        hooks = self.hooks
+        frames = self.frames
+        frame = frames[0]
+        try:
+            while frames:
+                frame = frames[-1]
+                pc = frame.pc
+                op = ops[pc]
+                if op != HALT:
+                    instr = code.instruction(pc)
+                    for hook in hooks:
+                        hook.on_instruction(self, len(frames) - 1, pc, instr, frame)
+                frame.pc = pc + 1
+                handlers[op](frame, args[pc])
+        except Exception as e:
+            self.report_error(frame, e)
+
+    def op_load_const(self, frame, arg):
+        frame.stack.append(self.code.consts[arg])
+
+    def op_load_name(self, frame, arg):
+        # Current frame's environment first, then globals (never the caller frames)
+        env = frame.env
+        if env is not None and arg in env:
+            frame.stack.append(env[arg])
+        else:
+            self.op_load_global(frame, arg)
+
+    def op_store_name(self, frame, arg):
+        if frame.env is None:
+            self.op_store_global(frame, arg)
+            return
+        if not frame.stack:
+            raise RuntimeError("Stack underflow on STORE_NAME")
+        frame.env[arg] = frame.stack.pop()
+
+    def op_load_fast(self, frame, arg):
+        value = frame.locals[arg]
+        if value is UNBOUND:
+            raise RuntimeError(f"Undefined variable: {frame.varnames[arg]}")
+        frame.stack.append(value)
+
+    def op_store_fast(self, frame, arg):
+        if not frame.stack:
+            raise RuntimeError("Stack underflow on STORE_FAST")
+        frame.locals[arg] = frame.stack.pop()
+
+    def op_load_global(self, frame, arg):
+        value = self.global_slots[arg]
+        if value is UNBOUND:
+            raise RuntimeError(f"Undefined variable: {self.code.names[arg]}")
+        frame.stack.append(value)
+
+    def op_store_global(self, frame, arg):
+        if not frame.stack:
+            raise RuntimeError("Stack underflow on STORE_GLOBAL")
+        self.global_slots[arg] = frame.stack.pop()
+
+    def op_dup_top(self, frame, arg):
+        stack = frame.stack
+        if not stack:
+            raise RuntimeError("Stack underflow for DUP_TOP")
+        stack.append(stack[-1])
+
+    def op_binary_add(self, frame, arg):
+        stack = frame.stack
+        if len(stack) < 2:
+            raise RuntimeError("Stack underflow for BINARY_ADD")
+        b = stack.pop()
+        stack[-1] = stack[-1] + b
+
+    def op_binary_sub(self, frame, arg):
+        stack = frame.stack
+        if len(stack) < 2:
+            raise RuntimeError("Stack underflow for BINARY_SUB")
+        b = stack.pop()
+        stack[-1] = stack[-1] - b
+
+    def op_binary_mul(self, frame, arg):
+        stack = frame.stack
+        if len(stack) < 2:
+            raise RuntimeError("Stack underflow for BINARY_MUL")
+        b = stack.pop()
+        stack[-1] = stack[-1] * b
+
+    def op_print(self, frame, arg):
+        if not frame.stack:
+            raise RuntimeError("Stack underflow for PRINT")
+        print(f"OUTPUT: {frame.stack.pop()}")
+
+    def op_jump_if_false(self, frame, arg):
+        if not frame.stack:
+            raise RuntimeError("Stack underflow for JUMP_IF_FALSE condition")
+        if not frame.stack.pop():
+            frame.pc = arg
+
+    def op_jump(self, frame, arg):
+        frame.pc = arg
+
+    def op_def_func(self, frame, arg):
+        func = self.code.functions[arg]
+        self.functions[func.name_index] = func
+
+    def op_call_function(self, frame, arg):
+        name_index, argc, callee, unbound = self.call_sites[arg]
+        func = self.functions[name_index]
+        if func is not callee:
+            # 링크 때 정한 callee가 아님 (아직 정의 전, 같은 이름이 여러 번 정의됨, 인자 수 불일치)
+            unbound = self.check_call(func, name_index, argc)
+        self.enter_function(frame, func, argc, unbound)
+
+    def check_call(self, func, name_index, argc):
+        """링크 때 확인하지 못한 호출의 검사. 통과하면 callee의 나머지 지역 슬롯을 채울 UNBOUND 튜플"""
+        if func is None:
+            raise RuntimeError(f"Undefined function: {self.code.names[name_index]}")
+        if len(func.params) != argc:
+            raise RuntimeError(f"Argument count mismatch in call to {func.name}. Expected {len(func.params)}, got {argc}")
+        return (UNBOUND,) * (len(func.varnames) - argc)
+
+    def enter_function(self, frame, func, argc, unbound):
+        """caller 스택의 인자 argc개를 callee의 앞쪽 지역 슬롯으로 옮기고 (free-list의) 프레임을 push"""
+        stack = frame.stack
+        if len(stack) < argc:
+            raise RuntimeError(f"Stack underflow: not enough arguments on stack for function call {func.name}. Expected {argc}, got {len(stack)}")
+        # Parameters occupy the first slots; the remaining locals start unbound
+        if argc:
+            fast_locals = stack[-argc:]
+            del stack[-argc:]
+            fast_locals += unbound
+        else:
+            fast_locals = list(unbound)
+        free = self.free_frames
+        if free:
+            callee = free.pop()
+            callee.pc = func.entry
+            callee.locals = fast_locals
+            callee.varnames = func.varnames
+        else:
+            callee = Frame(frame.code, {}, func.entry, fast_locals, func.varnames)
+            self.frames_allocated += 1
+        self.frames.append(callee)
+
+    def op_tail_call(self, frame, arg):
+        """return f(...): 인자를 callee의 지역 슬롯으로 옮기고 현재 프레임에서 callee 바디를 실행"""
+        name_index, argc, callee, unbound = self.call_sites[arg]
+        func = self.functions[name_index]
+        if func is not callee:
+            unbound = self.check_call(func, name_index, argc)
+        stack = frame.stack
+        if len(stack) < argc:
+            raise RuntimeError(f"Stack underflow: not enough arguments on stack for function call {func.name}. Expected {argc}, got {len(stack)}")
+        if argc:
+            fast_locals = stack[-argc:]
+            fast_locals += unbound
+        else:
+            fast_locals = list(unbound)
+        if stack:
+            stack.clear()
+        if frame.env:
+            frame.env.clear()
+        elif frame.env is None:
+            frame.env = {}  # 메인 프레임에서의 꼬리 호출: 이후 이 프레임은 함수 프레임 (RETURN하면 프로그램 종료)
+        frame.locals = fast_locals
+        frame.varnames = func.varnames
+        frame.pc = func.entry
+
+    def op_return(self, frame, arg):
+        stack = frame.stack
+        return_value = stack.pop() if stack else None
+        frames = self.frames
+        frames.pop()
+        if frames:
+            frames[-1].stack.append(return_value)
+            # 함수 프레임은 비워서 free-list로 (메인 프레임은 마지막에 pop되므로 여기 오지 않음)
+            if stack:
+                stack.clear()
+            if frame.env:
+                frame.env.clear()
+            self.free_frames.append(frame)
+
+    def op_halt(self, frame, arg):
+        # 코드 끝에 도달한 프레임은 값 없이 제거 (switch 엔진의 범위 초과 처리와 동일)
+        self.frames.pop()
+
+    # === 검증된 코드용 handler: verifier가 스택 깊이를 보장하므로 길이 확인이 없음 ===
+
+    def op_store_name_unchecked(self, frame, arg):
+        if frame.env is None:
+            self.global_slots[arg] = frame.stack.pop()
+        else:
+            frame.env[arg] = frame.stack.pop()
+
+    def op_store_fast_unchecked(self, frame, arg):
+        frame.locals[arg] = frame.stack.pop()
+
+    def op_store_global_unchecked(self, frame, arg):
+        self.global_slots[arg] = frame.stack.pop()
+
+    def op_dup_top_unchecked(self, frame, arg):
+        stack = frame.stack
+        stack.append(stack[-1])
+
+    def op_binary_add_unchecked(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        stack[-1] = stack[-1] + b
+
+    def op_binary_sub_unchecked(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        stack[-1] = stack[-1] - b
+
+    def op_binary_mul_unchecked(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        stack[-1] = stack[-1] * b
+
+    def op_print_unchecked(self, frame, arg):
+        print(f"OUTPUT: {frame.stack.pop()}")
+
+    def op_jump_if_false_unchecked(self, frame, arg):
+        if not frame.stack.pop():
+            frame.pc = arg
+
+    # === Superinstructions: 피연산자는 self.code.fused[arg] 튜플 ===
+    # 값 확인은 인라인으로 하고, 오류 메시지(LOAD_FAST/LOAD_GLOBAL과 동일)만 helper로 만듭니다.
+
+    def unbound_local(self, frame, slot):
+        return RuntimeError(f"Undefined variable: {frame.varnames[slot]}")
+
+    def unbound_global(self, index):
+        return RuntimeError(f"Undefined variable: {self.code.names[index]}")
+
+    def op_load_fast_load_fast(self, frame, arg):
+        i, j = self.code.fused[arg]
+        a, b = frame.locals[i], frame.locals[j]
+        if a is UNBOUND or b is UNBOUND:
+            raise self.unbound_local(frame, i if a is UNBOUND else j)
+        frame.stack += (a, b)
+
+    def op_load_global_load_global(self, frame, arg):
+        i, j = self.code.fused[arg]
+        slots = self.global_slots
+        a, b = slots[i], slots[j]
+        if a is UNBOUND or b is UNBOUND:
+            raise self.unbound_global(i if a is UNBOUND else j)
+        frame.stack += (a, b)
+
+    def op_load_fast_load_const(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.stack += (a, self.code.consts[c])
+
+    def op_load_global_load_const(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        frame.stack += (a, self.code.consts[c])
+
+    def op_load_fast_load_fast_binary_add(self, frame, arg):
+        i, j = self.code.fused[arg]
+        a, b = frame.locals[i], frame.locals[j]
+        if a is UNBOUND or b is UNBOUND:
+            raise self.unbound_local(frame, i if a is UNBOUND else j)
+        frame.stack.append(a + b)
+
+    def op_load_global_load_global_binary_add(self, frame, arg):
+        i, j = self.code.fused[arg]
+        slots = self.global_slots
+        a, b = slots[i], slots[j]
+        if a is UNBOUND or b is UNBOUND:
+            raise self.unbound_global(i if a is UNBOUND else j)
+        frame.stack.append(a + b)
+
+    def op_load_fast_load_const_binary_add(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.stack.append(a + self.code.consts[c])
+
+    def op_load_fast_load_const_binary_sub(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.stack.append(a - self.code.consts[c])
+
+    def op_load_fast_load_const_binary_mul(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.stack.append(a * self.code.consts[c])
+
+    def op_load_global_load_const_binary_add(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        frame.stack.append(a + self.code.consts[c])
+
+    def op_load_global_load_const_binary_sub(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        frame.stack.append(a - self.code.consts[c])
+
+    def op_load_global_load_const_binary_mul(self, frame, arg):
+        i, c = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        frame.stack.append(a * self.code.consts[c])
+
+    def op_load_fast_load_const_binary_add_store_fast(self, frame, arg):
+        i, c, dst = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.locals[dst] = a + self.code.consts[c]
+
+    def op_load_fast_load_const_binary_sub_store_fast(self, frame, arg):
+        i, c, dst = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        frame.locals[dst] = a - self.code.consts[c]
+
+    def op_load_global_load_const_binary_add_store_global(self, frame, arg):
+        i, c, dst = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        self.global_slots[dst] = a + self.code.consts[c]
+
+    def op_load_global_load_const_binary_sub_store_global(self, frame, arg):
+        i, c, dst = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        self.global_slots[dst] = a - self.code.consts[c]
+
+    def op_load_fast_jump_if_false(self, frame, arg):
+        i, target = self.code.fused[arg]
+        a = frame.locals[i]
+        if a is UNBOUND:
+            raise self.unbound_local(frame, i)
+        if not a:
+            frame.pc = target
+
+    def op_load_global_jump_if_false(self, frame, arg):
+        i, target = self.code.fused[arg]
+        a = self.global_slots[i]
+        if a is UNBOUND:
+            raise self.unbound_global(i)
+        if not a:
+            frame.pc = target
+
+    # === Quickening: 적응형 명령어와 특화 변형 (self.ops의 자기 자리를 바꿔 씀) ===
+    # 적응형 명령어는 특화할 수 있는 상황일 때만 warm_up을 부르므로 특화된 뒤에는 비용이 없습니다.
+    # 특화 변형은 가정(int 피연산자, 캐시된 함수, 메인 프레임)을 확인하고, 깨지면 deoptimize 후 원래 handler로 실행합니다.
+
+    def warm_up(self, pc, specialized):
+        """pc의 명령어가 특화 가능한 상태로 한 번 더 실행됨. 충분히 실행됐으면 specialized로 바꾸고 True"""
+        count = self.warmup[pc] + 1
+        if count < QUICKEN_AFTER:
+            self.warmup[pc] = count
+            return False
+        self.warmup[pc] = 0
+        self.ops[pc] = specialized
+        self.specialized += 1
+        return True
+
+    def deoptimize(self, pc, generic):
+        """특화가 틀렸음: 원래(적응형) 명령어로 되돌리고, 다시 특화하기까지 더 오래 기다림"""
+        self.ops[pc] = generic
+        self.deoptimized += 1
+        backoff = min(self.backoff[pc] + 1, MAX_BACKOFF)
+        self.backoff[pc] = backoff
+        self.warmup[pc] = QUICKEN_AFTER - (QUICKEN_AFTER << backoff)
+
+    def op_binary_add_adaptive(self, frame, arg):
+        stack = frame.stack
+        if len(stack) >= 2 and type(stack[-1]) is int and type(stack[-2]) is int:
+            self.warm_up(frame.pc - 1, BINARY_ADD_INT)
+        self.generic[BINARY_ADD](frame, arg)
+
+    def op_binary_sub_adaptive(self, frame, arg):
+        stack = frame.stack
+        if len(stack) >= 2 and type(stack[-1]) is int and type(stack[-2]) is int:
+            self.warm_up(frame.pc - 1, BINARY_SUB_INT)
+        self.generic[BINARY_SUB](frame, arg)
+
+    def op_binary_mul_adaptive(self, frame, arg):
+        stack = frame.stack
+        if len(stack) >= 2 and type(stack[-1]) is int and type(stack[-2]) is int:
+            self.warm_up(frame.pc - 1, BINARY_MUL_INT)
+        self.generic[BINARY_MUL](frame, arg)
+
+    # int 변형은 스택 길이를 확인하지 않습니다: 특화된 자리는 피연산자 두 개로 실행된 적이 있고,
+    # CodeGenerator 출력에서 명령어 자리의 스택 깊이는 항상 같기 때문입니다 (잘못 만든 바이트코드는 IndexError로 보고됨).
+    # 타입이 틀리면 deoptimize한 뒤 같은 자리에서 원래 handler와 같은 연산을 하므로
+    # int가 아닌 값의 결과와 오류 메시지는 그대로입니다 (꺼낸 값을 되돌려 놓았다가 다시 꺼내지 않음).
+
+    def op_binary_add_int(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        a = stack[-1]
+        if type(a) is int is type(b):
+            stack[-1] = a + b
+            return
+        self.deoptimize(frame.pc - 1, BINARY_ADD)
+        stack[-1] = a + b
+
+    def op_binary_sub_int(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        a = stack[-1]
+        if type(a) is int is type(b):
+            stack[-1] = a - b
+            return
+        self.deoptimize(frame.pc - 1, BINARY_SUB)
+        stack[-1] = a - b
+
+    def op_binary_mul_int(self, frame, arg):
+        stack = frame.stack
+        b = stack.pop()
+        a = stack[-1]
+        if type(a) is int is type(b):
+            stack[-1] = a * b
+            return
+        self.deoptimize(frame.pc - 1, BINARY_MUL)
+        stack[-1] = a * b
+
+    def op_load_name_adaptive(self, frame, arg):
+        if frame.env is None:
+            self.warm_up(frame.pc - 1, LOAD_NAME_GLOBAL)
+        self.generic[LOAD_NAME](frame, arg)
+
+    def op_load_name_global(self, frame, arg):
+        # 캐시된 스코프: 메인 프레임이면 이름은 항상 전역 슬롯
+        if frame.env is not None:
+            self.deoptimize(frame.pc - 1, LOAD_NAME)
+            self.generic[LOAD_NAME](frame, arg)
+            return
+        value = self.global_slots[arg]
+        if value is UNBOUND:
+            raise self.unbound_global(arg)
+        frame.stack.append(value)
+
+    def op_call_function_adaptive(self, frame, arg):
+        self.generic[CALL_FUNCTION](frame, arg)  # 오류가 나면 특화하지 않음
+        if self.warm_up(frame.pc - 1, CALL_FUNCTION_CACHED):
+            name_index, argc, _ = self.code.calls[arg]
+            func = self.functions[name_index]
+            self.call_cache[arg] = (func, name_index, argc, (UNBOUND,) * (len(func.varnames) - argc))
+
+    def op_call_function_cached(self, frame, arg):
+        func, name_index, argc, unbound = self.call_cache[arg]
+        if self.functions[name_index] is not func:
+            # DEF_FUNC가 같은 이름을 다시 정의함 (인자 수 확인도 다시 필요)
+            self.deoptimize(frame.pc - 1, CALL_FUNCTION)
+            self.generic[CALL_FUNCTION](frame, arg)
+            return
+        self.enter_function(frame, func, argc, unbound)